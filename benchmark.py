@@ -0,0 +1,215 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import subprocess
+import contextlib
+
+# No window and no display are needed, this has to be set before pygame is initialized
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+from src.script.log import *
+
+# Keep the standard output clean for the results
+with contextlib.redirect_stdout(sys.stderr):
+    from src.script.loader import STGS
+
+def currentCommit() -> str | None:
+    """Return the hash of the checked out commit, or None if it is not known."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output = True, text = True, check = True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def scriptInput(game, tick: int) -> None:
+    """
+    Play the player: run back and forth, jump and keep mining the ground diagonally in front of its feet.
+
+    Args:
+        game (Main): The game being benchmarked.
+        tick (int): The number of the tick about to run.
+    """
+    goingRight: bool = tick // 90 % 2 == 0
+    game.player.movementInput["right"] = goingRight
+    game.player.movementInput["left"] = not goingRight
+    if tick and not tick % 120:
+        game.player.jump()
+
+    # The row right below the hitbox is the ground the player stands on
+    hitBox = game.player.rect()
+    game.clicking["left"] = True
+    game.tilePosAtMouse = (
+        hitBox.centerx // STGS["tileSize"] + (1 if goingRight else -1),
+        hitBox.bottom // STGS["tileSize"])
+
+def runBenchmark(mapName: str, ticks: int, seed: int) -> dict:
+    """
+    Run the game's own tick without rendering for a number of ticks, timing each subsystem with the profiler.
+
+    The map is copied first, so the mining done by the scripted player is not saved to it.
+
+    Args:
+        mapName (str): The name of the map folder in 'src/map/' to play on.
+        ticks (int): The number of ticks to run.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        dict: The results of the benchmark.
+    """
+    from main import Main
+    from src.script.profiler import PROFILER
+
+    random.seed(seed)
+    copyName: str = f"_benchmark_{mapName}"
+    shutil.copytree(f"src/map/{mapName}", f"src/map/{copyName}", dirs_exist_ok = True)
+
+    try:
+        game: Main = Main(mapName = copyName)
+        game.setState("mainGame")
+        game.mousePos = (0, 0)
+        # Counts the tiles the scripted player breaks, a run that breaks none did not measure mining
+        tilesBroken: int = 0
+        def countBroken(changes: list) -> None:
+            nonlocal tilesBroken
+            tilesBroken += sum(change.new is None for change in changes)
+        game.tilemap.events.subscribe(onTiles = countBroken, immediate = True)
+
+        # The game times every subsystem in profiler scopes, no frame is ended so they add up over the run
+        if not PROFILER.enabled:
+            PROFILER.toggle()
+        PROFILER.times = {}
+        PROFILER.counters = {}
+        startTime: float = time.perf_counter()
+        for tick in range(ticks):
+            scriptInput(game, tick)
+            game.handleUpdates()
+        totalTime: float = time.perf_counter() - startTime
+
+        results: dict = {
+            "commit": currentCommit(),
+            "map": mapName,
+            "ticks": ticks,
+            "seed": seed,
+            "seconds": totalTime,
+            "ticksPerSecond": ticks / totalTime,
+            "subsystems": {
+                name: {
+                    "seconds": seconds,
+                    "microsecondsPerTick": seconds / ticks * 1_000_000,
+                    "share": seconds / totalTime
+                } for name, seconds in PROFILER.times.items()
+            },
+            "counters": dict(PROFILER.counters),
+            "tilesBroken": tilesBroken,
+            "entities": {
+                "particles": len(game.particles),
+                "floatingItems": len(game.floatingItems),
+                "loadedChunks": len(game.tilemap.chunks)
+            }
+        }
+
+        game.chunkStreamer.close()
+        game.mapSaver.close()
+        game.tilemap.region.close()
+        return results
+
+    finally:
+        shutil.rmtree(f"src/map/{copyName}", ignore_errors = True)
+
+def timeBlits(image, count: int) -> float:
+    """
+    Time blitting an image onto a surface in the display format.
+
+    Args:
+        image (pygame.Surface): The image to blit.
+        count (int): The number of blits.
+
+    Returns:
+        float: The microseconds a single blit took on average.
+    """
+    import pygame
+
+    target: pygame.Surface = pygame.display.get_surface().copy()
+    sequence: list = [(image, (i * 37 % target.get_width(), i * 53 % target.get_height())) for i in range(count)]
+    # The first blits encode RLE images, that is done once at load time in the game
+    target.blits(sequence[:1], doreturn = False)
+    startTime: float = time.perf_counter()
+    target.blits(sequence, doreturn = False)
+    return (time.perf_counter() - startTime) / count * 1_000_000
+
+def runBlitBenchmark(count: int) -> dict:
+    """
+    Compare the blit cost of every image group as loaded from disk and as finalized for the display.
+
+    Args:
+        count (int): The number of blits per image.
+
+    Returns:
+        dict: The results of the benchmark.
+    """
+    import pygame
+    from src.script.loader import finalizeImage, TRANSPARENT_COLOR
+
+    pygame.display.set_mode([STGS["windowWidth"], STGS["windowHeight"]])
+    groups: dict[str, dict[str, float]] = {}
+    for group in sorted(os.listdir("src/img")):
+        raw: float = 0
+        finalized: float = 0
+        images: int = 0
+        for directory, _, fileNames in os.walk(f"src/img/{group}"):
+            for fileName in fileNames:
+                if not fileName.endswith(".png"):
+                    continue
+                image: pygame.Surface = pygame.image.load(f"{directory}/{fileName}")
+                image.set_colorkey(TRANSPARENT_COLOR)
+                raw += timeBlits(image, count)
+                finalized += timeBlits(finalizeImage(image), count)
+                images += 1
+        if images:
+            groups[group] = {
+                "images": images,
+                "rawMicrosecondsPerBlit": raw / images,
+                "finalizedMicrosecondsPerBlit": finalized / images,
+                "speedup": raw / finalized
+            }
+
+    return {
+        "commit": currentCommit(),
+        "blitsPerImage": count,
+        "groups": groups
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Measure how many game ticks run per second without rendering")
+    parser.add_argument("alias", nargs = "?", default = "map1", help = "the name of the map folder in 'src/map/'")
+    parser.add_argument("--ticks", type = int, default = 3000, help = "the number of ticks to run")
+    parser.add_argument("--seed", type = int, default = 0, help = "the seed of the random generator")
+    parser.add_argument("--output", help = "write the results to this file instead of the standard output")
+    parser.add_argument("--blits", type = int, default = 0, help = "instead of ticks, measure the cost of this many blits of every image before and after it is converted to the display format")
+    arguments = parser.parse_args()
+
+    with contextlib.redirect_stdout(sys.stderr):
+        if arguments.blits:
+            results: dict = runBlitBenchmark(arguments.blits)
+            logSuccess(f"Measured the blits of {sum(group['images'] for group in results['groups'].values())} images")
+        else:
+            results: dict = runBenchmark(arguments.alias, arguments.ticks, arguments.seed)
+            if not results["tilesBroken"]:
+                logError("The scripted player did not break any tile, the run is not comparable")
+                flushLogs()
+                sys.exit(1)
+            logSuccess(f"Ran {results['ticks']} ticks at {round(results['ticksPerSecond'])} ticks per second, breaking {results['tilesBroken']} tiles")
+        flushLogs()
+
+    if arguments.output:
+        with open(arguments.output, mode = "w") as file:
+            json.dump(results, file, indent = 4)
+    else:
+        print(json.dumps(results, indent = 4))
+
+else:
+    logError("Did not do anything")
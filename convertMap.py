@@ -0,0 +1,31 @@
+import sys
+import argparse
+
+from src.script.log import *
+from src.script.tilemap import Tilemap
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Convert a map between 'tilemap.json' and 'tilemap.bin'")
+    parser.add_argument("alias", help = "the name of the map folder in 'src/map/'")
+    parser.add_argument("--export", action = "store_true", help = "write 'tilemap.json' from 'tilemap.bin' for debugging")
+    arguments = parser.parse_args()
+
+    tilemap: Tilemap = Tilemap(assets = {})
+    tilemap.mapName = arguments.alias
+
+    if arguments.export:
+        tilemap.loadMap(alias = arguments.alias)
+        if tilemap.region is None:
+            logError(f"\'{arguments.alias}\' has no \'tilemap.bin\' to export")
+            sys.exit(1)
+        tilemap.exportJson(alias = arguments.alias)
+
+    else:
+        tilemap.loadJson(alias = arguments.alias)
+        if not tilemap.chunks:
+            logError(f"\'{arguments.alias}\' has no tiles to convert")
+            sys.exit(1)
+        tilemap.saveMap(alias = arguments.alias)
+
+else:
+    logError("Did not do anything")
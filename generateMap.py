@@ -1,142 +1,376 @@
-import json
+import os
 import math
 import random
+import numpy
+
+from array import array
 
 from src.script.log import *
+from src.script.chunk import Chunk, CHUNK_SIZE, CHUNK_AREA, blockId
+from src.script.region import RegionFile
+
+# Strokes started per cell of their layer, stone strokes in the dirt layer and dirt strokes in the stone layer
+STROKE_DENSITIES: list[float] = [0.003, 0.004]
+# The layers are painted in this order, later strokes cover earlier ones
+STROKE_BLOCKS: list[str] = ["stone", "dirt"]
+# Patches are at most this many tiles from their center on each axis
+MAX_PATCH_RADIUS: int = 5
+# The most patches in a stroke, one more than the longest chain of shifts
+MAX_STROKE_PATCHES: int = 33
+
+# The ores in pairs of the same rarity, a world gets one ore of each pair
+ORES: list[str] = [
+    "copper", "tin",
+    "iron", "lead",
+    "silver", "tungsten",
+    "gold", "platinum"
+]
+# The depth, as a share of the map height, where the ores of each pair start, the first pair at the top of the stone layer
+ORE_DEPTHS: list[float] = [0.5, 0.6, 0.7, 0.85]
+# The width and height in tiles of the noise cells of the veins, wider than high so the veins lie flat
+ORE_VEIN_CELL: tuple[int] = (8, 5)
+# The smoothed share of the next lattice point for every tile of a noise cell, along x and along y
+ORE_VEIN_WEIGHTS: tuple[numpy.ndarray] = tuple(
+    numpy.array([(step / size) ** 2 * (3 - 2 * step / size) for step in range(size)], dtype = numpy.float32) for size in ORE_VEIN_CELL
+)
+# Veins of each pair are where the noise is above its threshold, lower for the deeper pairs so their veins are denser
+ORE_THRESHOLDS: list[float] = [0.86, 0.84, 0.815, 0.785]
 
-def saveMap(tilemap: dict[str, dict[str, str | int]], alias: str) -> None:
-    with open(f"src/map/{alias}/tilemap.json", mode = "w") as file:
-        json.dump(tilemap, file, indent = 4)
+# Every job paints a square of this many chunks per side
+JOB_CHUNKS: int = 16
 
-def roundUp(num: float) -> int:
-    if num == int(num):
-        return num
-    return int(num) + 1
+# Offsets of every cell a patch may cover from its center, row by row
+PATCH_SIDE: numpy.ndarray = numpy.arange(-MAX_PATCH_RADIUS, MAX_PATCH_RADIUS + 1, dtype = numpy.int32)
+PATCH_OFFSET_X: numpy.ndarray = numpy.tile(PATCH_SIDE, len(PATCH_SIDE))
+PATCH_OFFSET_Y: numpy.ndarray = numpy.repeat(PATCH_SIDE, len(PATCH_SIDE))
+# Which offsets a patch covers, by its radius in whole tiles and its squared radius limit, which is at most the largest first radius squared
+PATCH_SHAPES: numpy.ndarray = (
+    (numpy.maximum.outer(numpy.abs(PATCH_SIDE), numpy.abs(PATCH_SIDE)).reshape(-1) <= numpy.arange(MAX_PATCH_RADIUS + 1).reshape(-1, 1, 1))
+    & (numpy.add.outer(PATCH_SIDE ** 2, PATCH_SIDE ** 2).reshape(-1) <= numpy.arange(math.ceil((50 / 9) ** 2) + 1).reshape(-1, 1))
+)
+# The cells of the patches reaching into a job are at most this far outside of it
+PATCH_MARGIN: int = 2 * MAX_PATCH_RADIUS
 
-def diff25(num: float) -> float:
-    return abs(num * (1 + math.sin(random.random() * 2 * math.pi) / 4))
+def saveMap(chunks: dict[tuple[int], Chunk], alias: str) -> None:
+    os.makedirs(f"src/map/{alias}", exist_ok = True)
+    RegionFile.write(f"src/map/{alias}/tilemap.bin", list(chunks.values()))
 
-def myMathFunc1(num: float) -> float:
+def randomArray(source: random.Random, shape: int | tuple[int]) -> numpy.ndarray:
+    """Draw floats between 0 and 1 from the generator of the map, as an array of the given shape."""
+    count: int = math.prod(shape) if isinstance(shape, tuple) else shape
+    return (numpy.frombuffer(source.randbytes(4 * count), dtype = numpy.uint32) * 2.0 ** -32).reshape(shape)
+
+def diff25(num: numpy.ndarray, noise: numpy.ndarray) -> numpy.ndarray:
+    # The cosine of a uniform half turn is spread like the sine of a full turn
+    return numpy.abs(num * (1 + numpy.cos(noise * math.pi) / 4))
+
+def myMathFunc1(num: numpy.ndarray) -> numpy.ndarray:
     return (2 ** (5 * (2 * num - 1)))
 
-def myMathFunc2(num: float) -> float:
+def myMathFunc2(num: numpy.ndarray) -> numpy.ndarray:
     return (8 * ((1 - num) ** 3))
 
-def randomSign(num: float) -> float:
-    return (((random.randint(0, 1) * 2) - 1) * num)
+def planStrokes(bounds: tuple[int], tilDirtY: int, source: random.Random) -> numpy.ndarray:
+    """
+    Plan every stroke of the map, chains of circular patches wandering from a point.
+
+    Stone strokes start in the dirt layer and dirt strokes in the stone layer. The patches of
+    all the strokes are laid out in one row, so every step is a single array operation.
+
+    Args:
+        bounds (tuple[int]): The xLeft, xRight, yTop and yBottom of the map.
+        tilDirtY (int): The first row of the stone layer.
+        source (random.Random): The generator of the map.
+
+    Returns:
+        numpy.ndarray: A row of order, x, y, radius in whole tiles and squared radius limit per patch, in painting
+            order, order being the index of the block in STROKE_BLOCKS.
+    """
+    xLeft, xRight, yTop, yBottom = bounds
+    # The top and height of the layer each kind of stroke starts in
+    layers: list[tuple[int]] = [(yTop, tilDirtY - yTop), (tilDirtY, yBottom - tilDirtY)]
+    # Only two numbers, so they are drawn without NumPy. The fraction of a stroke left over is started with that probability
+    counts: list[int] = [
+        int(abs((xRight - xLeft) * height * density * (1 + math.sin(source.random() * 2 * math.pi) / 4)) + source.random())
+        for (_, height), density in zip(layers, STROKE_DENSITIES)
+    ]
+    if xRight <= xLeft or not sum(counts):
+        return numpy.zeros((0, 5), dtype = numpy.int32)
+
+    # Where along the map and how deep into its layer each stroke starts, then what its length and first radius are drawn from
+    strokes: numpy.ndarray = randomArray(source, (5, sum(counts)))
+    lengths: numpy.ndarray = numpy.empty(sum(counts))
+    lengths[:counts[0]] = myMathFunc1(strokes[1, :counts[0]])
+    lengths[counts[0]:] = myMathFunc2(strokes[1, counts[0]:])
+    # Capped between 0 and 32, strokes of length 0 are dropped
+    lengths = numpy.minimum(diff25(lengths, strokes[2]), MAX_STROKE_PATCHES - 1).astype(numpy.int64)
+    kept: numpy.ndarray = lengths.nonzero()[0]
+    if not len(kept):
+        return numpy.zeros((0, 5), dtype = numpy.int32)
+    strokes[0] *= xRight - xLeft
+    strokes[0] += xLeft
+    for (layerTop, height), layer in zip(layers, (slice(None, counts[0]), slice(counts[0], None))):
+        strokes[1, layer] *= height
+        strokes[1, layer] += layerTop
+    strokes = strokes[:, kept]
+
+    # The patches of all the strokes in one row, stroke by stroke
+    sizes: numpy.ndarray = lengths[kept] + 1
+    ends: numpy.ndarray = sizes.cumsum()
+    firsts: numpy.ndarray = ends - sizes
+    strokeOf: numpy.ndarray = numpy.arange(len(sizes)).repeat(sizes)
+    strokeFirsts: numpy.ndarray = firsts[strokeOf]
+
+    def sumUntil(values: numpy.ndarray) -> numpy.ndarray:
+        """Sum the values of the patches of the same stroke up to every patch, along the last axis."""
+        sums: numpy.ndarray = values.cumsum(axis = -1)
+        return sums - (sums - values)[..., strokeFirsts]
+
+    # Two cosines of uniform half turns per patch, like diff25 uses. The first changes
+    # the radius of the patch by up to 25 %, the second is the horizontal part of the direction it is shifted in
+    steps: numpy.ndarray = numpy.cos(randomArray(source, (2, int(ends[-1]))) * math.pi)
+    # The radius wanders freely from the first one and is capped where it is used
+    growth: numpy.ndarray = steps[0] / 4 + 1
+    firstRadius: numpy.ndarray = (strokes[3:] * ((42, ), (4, ))).astype(numpy.int64) + 9
+    growth[firsts] = firstRadius[0] / firstRadius[1]
+    radius: numpy.ndarray = numpy.exp(sumUntil(numpy.log(growth)))
+
+    # The rows of the plan: order, x, y, radius and squared radius limit
+    plan: numpy.ndarray = numpy.empty((5, len(growth)))
+    stoneStrokes: int = numpy.count_nonzero(lengths[:counts[0]])
+    stonePatches: int = int(ends[stoneStrokes - 1]) if stoneStrokes else 0
+    plan[0, :stonePatches] = 0
+    plan[0, stonePatches:] = 1
+    plan[3] = numpy.minimum(numpy.maximum(radius, 1), 5) # Capped between 1 and 5 after the first patch
+    plan[3, firsts] = radius[firsts]
+    # Each patch is shifted from the previous one by half its radius, always upwards. Flipping the horizontal
+    # part with the vertical one keeps going left and right equally likely
+    plan[1] = steps[1]
+    numpy.sqrt(1 - steps[1] * steps[1], out = plan[2])
+    plan[1:3] *= plan[3] / -2
+    plan[1:3] = sumUntil(plan[1:3]) - plan[1:3] + strokes[:2, strokeOf]
+
+    # A cell is inside the patch if its squared distance is at most the squared radius rounded up
+    numpy.ceil(plan[3] * plan[3], out = plan[4])
+    return plan.astype(numpy.int32).T
+
+def veinNoise(lattice: numpy.ndarray, origin: tuple[int], area: tuple[int]) -> numpy.ndarray:
+    """
+    Smoothly interpolate the values of the vein lattice over an area of tiles.
+
+    Args:
+        lattice (numpy.ndarray): The values of the lattice points by row and column, covering the area.
+        origin (tuple[int]): The column and row of the first lattice point, in lattice cells.
+        area (tuple[int]): The left, top, width and height of the area in tiles.
+
+    Returns:
+        numpy.ndarray: The noise of every tile of the area, by row and column.
+    """
+    left, top, width, height = area
+    # Only the lattice points around the area are interpolated
+    firstX: int = left // ORE_VEIN_CELL[0]
+    firstY: int = top // ORE_VEIN_CELL[1]
+    values: numpy.ndarray = lattice[
+        firstY - origin[1]:(top + height - 1) // ORE_VEIN_CELL[1] + 2 - origin[1],
+        firstX - origin[0]:(left + width - 1) // ORE_VEIN_CELL[0] + 2 - origin[0]
+    ]
+
+    # Interpolate along the rows of the lattice first, then between them, every cell at once
+    rows: numpy.ndarray = (values[:, 1:] - values[:, :-1])[:, :, None] * ORE_VEIN_WEIGHTS[0]
+    rows += values[:, :-1, None]
+    rows = rows.reshape(len(values), -1)[:, left - firstX * ORE_VEIN_CELL[0]:left - firstX * ORE_VEIN_CELL[0] + width]
+    noise: numpy.ndarray = (rows[1:] - rows[:-1])[:, None] * ORE_VEIN_WEIGHTS[1].reshape(-1, 1)
+    noise += rows[:-1, None]
+    return noise.reshape(-1, width)[top - firstY * ORE_VEIN_CELL[1]:top - firstY * ORE_VEIN_CELL[1] + height]
+
+def paintRegion(job: tuple) -> tuple[list[tuple[int]], numpy.ndarray, list[int]]:
+    """
+    Paint a square of chunks: fill the layers, stamp the patches and grow the ore veins.
+
+    Args:
+        job (tuple): The leftmost and topmost chunk and the number of chunk columns and rows, the map
+            bounds, the first row of the stone layer, the block ids by name, the ores of the world,
+            the patches reaching into the square and the origin and values of the vein lattice around it.
 
-def generateMap(xLeft: int = 0, xRight: int = 100, yTop: int = 0, yBottom: int = 100) -> dict[str, dict[str, str | int]]:
-    tilemap: dict[str, dict[str, str | int]] = {}
-    # Top half is filles with dirt
-    # Bottom half with stone
+    Returns:
+        tuple[list[tuple[int]], numpy.ndarray, list[int]]: The positions, block ids and tile counts of the chunks that are not empty.
+    """
+    (chunkX, chunkY, columns, rows), bounds, tilDirtY, ids, ores, patches, (latticeOrigin, lattice) = job
+    xLeft, xRight, yTop, yBottom = bounds
+    originX: int = chunkX * CHUNK_SIZE
+    originY: int = chunkY * CHUNK_SIZE
+    # The part of the map inside the square, relative to its corner
+    left: int = max(xLeft, originX) - originX
+    right: int = min(xRight, originX + columns * CHUNK_SIZE) - originX
+    top: int = max(yTop, originY) - originY
+    bottom: int = min(yBottom, originY + rows * CHUNK_SIZE) - originY
+    stoneTop: int = min(max(tilDirtY - originY, top), bottom)
 
+    # The margin catches the parts of the patches outside of the square, so they need no clipping
+    canvas: numpy.ndarray = numpy.zeros((rows * CHUNK_SIZE + 2 * PATCH_MARGIN, columns * CHUNK_SIZE + 2 * PATCH_MARGIN), dtype = numpy.uint16)
+    blocks: numpy.ndarray = canvas[PATCH_MARGIN:-PATCH_MARGIN, PATCH_MARGIN:-PATCH_MARGIN]
+    blocks[top:stoneTop, left:right] = ids["dirt"]
+    blocks[stoneTop:bottom, left:right] = ids["stone"]
+
+    # Every patch is stamped with the same square of offsets, masked to its circle
+    width: int = canvas.shape[1]
+    centers: numpy.ndarray = patches[:, 2] * width + patches[:, 1] + ((PATCH_MARGIN - originY) * width + PATCH_MARGIN - originX)
+    offsets: numpy.ndarray = PATCH_OFFSET_Y * width + PATCH_OFFSET_X
+    inside: numpy.ndarray = PATCH_SHAPES[patches[:, 3], patches[:, 4]]
+    flat: numpy.ndarray = canvas.reshape(-1)
+    # The patches of a layer all have the same block, so only the order of the layers matters
+    dirtStart: int = len(patches) - numpy.count_nonzero(patches[:, 0])
+    flat[(centers[:dirtStart, None] + offsets)[inside[:dirtStart]]] = ids["stone"]
+
+    # Veins grow in the stone layer, which is only stone before the dirt strokes are stamped.
+    # Each pair gets its own layer, from its depth down to the next pair's
+    height: int = yBottom - yTop
+    layerTops: list[int] = [min(max(yTop + math.ceil(depth * height) - originY, stoneTop), bottom) for depth in ORE_DEPTHS[:len(ores)]] + [bottom]
+    if layerTops[0] < bottom and left < right:
+        noise: numpy.ndarray = veinNoise(lattice, latticeOrigin, (originX + left, originY + layerTops[0], right - left, bottom - layerTops[0]))
+        for ore, layerTop, next, threshold in zip(ores, layerTops, layerTops[1:], ORE_THRESHOLDS):
+            numpy.copyto(blocks[layerTop:next, left:right], ids[ore], where = noise[layerTop - layerTops[0]:next - layerTops[0]] > threshold)
+
+    flat[(centers[dirtStart:, None] + offsets)[inside[dirtStart:]]] = ids["dirt"]
+    # Whatever was painted outside of the map is cleared again
+    blocks[:top] = 0
+    blocks[bottom:] = 0
+    blocks[:, :left] = 0
+    blocks[:, right:] = 0
+
+    # Every tile of the map is filled, so the chunks hold as many tiles as they share with it
+    pieces: numpy.ndarray = numpy.ascontiguousarray(blocks.reshape(rows, CHUNK_SIZE, columns, CHUNK_SIZE).swapaxes(1, 2).reshape(rows * columns, -1))
+    positions: list[tuple[int]] = [(chunkX + column, chunkY + row) for row in range(rows) for column in range(columns)]
+    heights: list[int] = [min(bottom, (row + 1) * CHUNK_SIZE) - max(top, row * CHUNK_SIZE) for row in range(rows)]
+    widths: list[int] = [min(right, (column + 1) * CHUNK_SIZE) - max(left, column * CHUNK_SIZE) for column in range(columns)]
+    counts: list[int] = [rowHeight * columnWidth for rowHeight in heights for columnWidth in widths]
+    return positions, pieces, counts
+
+def generateMap(
+    xLeft: int = 0, xRight: int = 100, yTop: int = 0, yBottom: int = 100, seed: int | None = None, workers: int | None = None
+    ) -> dict[tuple[int], Chunk]:
+    """
+    Generate a map of dirt above stone, with strokes of each painted into the other and veins of ores in the stone.
+
+    The layers are integer block id arrays built with NumPy. The strokes of the whole map are
+    planned up front, then the map is cut into squares of chunks painted independently, on a pool
+    of processes if there is more than one. The ore veins come from noise interpolated between random
+    values drawn for the whole map, so the map only depends on the seed, not on the number of workers.
+
+    Args:
+        xLeft (int, optional): The leftmost column of the map. Defaults to 0.
+        xRight (int, optional): The column right after the map. Defaults to 100.
+        yTop (int, optional): The topmost row of the map. Defaults to 0.
+        yBottom (int, optional): The row right below the map. Defaults to 100.
+        seed (int | None, optional): The seed of the map. Defaults to a random one.
+        workers (int | None, optional): The number of processes, 1 generates in this process. Defaults to the number of cores.
+
+    Returns:
+        dict[tuple[int], Chunk]: The chunks of the map by chunk position.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    print(f"Seed: {seed}")
+
+    bounds: tuple[int] = (xLeft, xRight, yTop, yBottom)
     tilDirtY: int = int((yTop + yBottom) / 2)
     print(f"Dirt is generated until: y = {tilDirtY}")
-    for x in range(xLeft, xRight):
-        # Dirt
-        for y in range(yTop, tilDirtY):
-            tilemap[f"{x};{y}"] = {
-                "block": "dirt",
-                "variant": 0}
-            
-        # Stone
-        for y in range(tilDirtY, yBottom):
-            tilemap[f"{x};{y}"] = {
-                "block": "stone",
-                "variant": 0}
-
-    # Draw strokes of dirt/stone
-    def drawPatchStroke(
-        point: tuple[int],
-        block: str,
-        count: int = 0,
-        radius: float = int(random.randint(9, 50) / random.randint(9, 12)),
-        patchesInStroke: int = 1
-        ):
-        if count == 0:
-            if block == "stone":
-                patchesInStroke: int = int(diff25(myMathFunc1((point[1] - yTop) / (tilDirtY - yTop))))
-            elif block == "dirt":
-                patchesInStroke: int = int(diff25(myMathFunc2((point[1] - tilDirtY) / (yBottom - tilDirtY))))
-            patchesInStroke = min(max(patchesInStroke, 0), 32) # Capped between 0 and 32
-        
-        if patchesInStroke != 0:
-            # Go thru the circle and draw it
-            for x in range(int(point[0] - radius), int(point[0] + radius) + 1):
-                for y in range(int(point[1] - radius), int(point[1] + radius) + 1):
-                    # If not inside grid, go to next point
-                    if not (xLeft <= x < xRight and yTop <= y < yBottom):
-                        continue
-                    
-                    # Place the block if inside the circle
-                    if (x - point[0]) ** 2 + (y - point[1]) ** 2 <= roundUp(radius ** 2):
-                        tilemap[f"{x};{y}"] = {
-                            "block": block,
-                            "variant": 0}
-
-        if count < patchesInStroke:
-            shiftDirection: float = math.pi * (1 + random.random())
-            nextPoint: tuple[int] = (
-                int(point[0] + randomSign(radius / 2 * math.cos(shiftDirection))),
-                int(point[1] + radius / 2 * math.sin(shiftDirection))
-            )
-            # Change previous radious with a max of 25 %
-            nextRadius: float = min(max(diff25(radius), 1), 5) # Capped between 1 and 5
-
-            drawPatchStroke(nextPoint, block, count = count + 1, radius = nextRadius, patchesInStroke = patchesInStroke)
-    
-    # Stone patches in dirt
-    numOfPatches: int = int(diff25((xRight - xLeft) * (tilDirtY - yTop) * 0.003))
-    print(f"Stone strokes in dirt: {numOfPatches}")
-    for _ in range(numOfPatches):
-        point: tuple[int] = (xLeft + int(random.random() * (xRight - xLeft)), yTop + int(random.random() * (tilDirtY - yTop)))
-        drawPatchStroke(point, "stone")
-
-    # Dirt patches in stone
-    numOfPatches: int = int(diff25((xRight - xLeft) * (yBottom - tilDirtY) * 0.004))
-    print(f"Dirt strokes in stone: {numOfPatches}")
-    for _ in range(numOfPatches):
-        point: tuple[int] = (xLeft + int(random.random() * (xRight - xLeft)), tilDirtY + int(random.random() * (yBottom - tilDirtY)))
-        drawPatchStroke(point, "dirt")
-
-    ores: list[str] = [
-        "copper", "tin",
-        "iron", "lead",
-        "silver", "tungsten",
-        "gold", "platinum"
-    ]
 
+    worldRandom: random.Random = random.Random(seed)
     worldOres: list[str] = [
-        random.choice(ores[(2 * _):((_ + 1) * 2)]) for _ in range(int(len(ores) / 2))
+        worldRandom.choice(ORES[(2 * _):((_ + 1) * 2)]) for _ in range(int(len(ORES) / 2))
     ]
-
     print(f"This world contains the ores: {', '.join(worldOres)}")
 
-    return tilemap
+    patches: numpy.ndarray = planStrokes(bounds, tilDirtY, worldRandom)
+    print(f"Patches in strokes: {len(patches)}")
+
+    # The noise of the veins is interpolated between the points of a lattice covering the map
+    latticeX: int = xLeft // ORE_VEIN_CELL[0]
+    latticeY: int = yTop // ORE_VEIN_CELL[1]
+    lattice: numpy.ndarray = randomArray(
+        worldRandom, ((yBottom - 1) // ORE_VEIN_CELL[1] + 2 - latticeY, (xRight - 1) // ORE_VEIN_CELL[0] + 2 - latticeX)
+    ).astype(numpy.float32)
+
+    # The ids are handed to the workers, so the block registry of this process stays the only one
+    ids: dict[str, int] = {block: blockId(block) for block in ("dirt", "stone", *worldOres)}
+
+    firstX: int = xLeft // CHUNK_SIZE
+    firstY: int = yTop // CHUNK_SIZE
+    lastX: int = (xRight - 1) // CHUNK_SIZE
+    lastY: int = (yBottom - 1) // CHUNK_SIZE
+    squares: list[tuple[int]] = [
+        (chunkX, chunkY, min(JOB_CHUNKS, lastX + 1 - chunkX), min(JOB_CHUNKS, lastY + 1 - chunkY))
+        for chunkX in range(firstX, lastX + 1, JOB_CHUNKS) for chunkY in range(firstY, lastY + 1, JOB_CHUNKS)
+    ]
+    jobs: list[tuple] = []
+    for square in squares:
+        # The patches reaching into the square, a single square gets them all
+        reaching: numpy.ndarray = patches if len(squares) == 1 else patches[
+            (patches[:, 1] + MAX_PATCH_RADIUS >= square[0] * CHUNK_SIZE) & (patches[:, 1] - MAX_PATCH_RADIUS < (square[0] + square[2]) * CHUNK_SIZE)
+            & (patches[:, 2] + MAX_PATCH_RADIUS >= square[1] * CHUNK_SIZE) & (patches[:, 2] - MAX_PATCH_RADIUS < (square[1] + square[3]) * CHUNK_SIZE)
+        ]
+        # The lattice points around the part of the map inside the square
+        columns: tuple[int] = (max(xLeft, square[0] * CHUNK_SIZE) // ORE_VEIN_CELL[0], (min(xRight, (square[0] + square[2]) * CHUNK_SIZE) - 1) // ORE_VEIN_CELL[0] + 2)
+        rows: tuple[int] = (max(yTop, square[1] * CHUNK_SIZE) // ORE_VEIN_CELL[1], (min(yBottom, (square[1] + square[3]) * CHUNK_SIZE) - 1) // ORE_VEIN_CELL[1] + 2)
+        around: numpy.ndarray = lattice[rows[0] - latticeY:rows[1] - latticeY, columns[0] - latticeX:columns[1] - latticeX]
+        jobs.append((square, bounds, tilDirtY, ids, worldOres, reaching, ((columns[0], rows[0]), around)))
+
+    chunks: dict[tuple[int], Chunk] = {}
+    # Starting processes costs more than painting a single square, the pool is only imported when it is used
+    pool = None
+    if workers != 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(workers)
+    try:
+        results = map(paintRegion, jobs) if pool is None else pool.map(paintRegion, jobs)
+        for positions, pieces, counts in results:
+            # The painted pieces are read as raw bytes at once, then every chunk copies its slice
+            blocks: array = array("H")
+            blocks.frombytes(pieces.view(numpy.uint8))
+            for start, chunkPos, count in zip(range(0, len(blocks), CHUNK_AREA), positions, counts):
+                chunks[chunkPos] = Chunk(chunkPos, blocks[start:start + CHUNK_AREA], count = count)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return chunks
 
 if __name__ == "__main__":
-    logMSG("Started making it")
     # X grows left to right
     # Y grows top to bottom
 
     # Advised size: the bigger the better
     # Don't go below 50 please
+    import argparse
+
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description = "Generate a map into 'src/map/'.")
+    parser.add_argument("alias", nargs = "?", default = "procedural", help = "The name of the map folder to write.")
+    parser.add_argument("--width", type = int, default = 300, help = "The width of the map in tiles.")
+    parser.add_argument("--height", type = int, default = 160, help = "The height of the map in tiles.")
+    parser.add_argument("--seed", type = int, default = None, help = "The seed of the map, the same seed gives the same map.")
+    parser.add_argument("--workers", type = int, default = None, help = "The number of processes, defaults to the number of cores.")
+    args: argparse.Namespace = parser.parse_args()
+
+    logMSG("Started making it")
     mapLeft: int = 0
-    mapRight: int = 300
+    mapRight: int = args.width
     mapTop: int = 0
-    mapBottom: int = 160
+    mapBottom: int = args.height
     logMSG(f"In range: x = ({mapLeft}; {mapRight}), y = ({mapTop}; {mapBottom})")
 
-    filename: str = "procedural"
-
     generatedMap = generateMap(
         xLeft = mapLeft,
         xRight = mapRight,
         yTop = mapTop,
-        yBottom = mapBottom)
+        yBottom = mapBottom,
+        seed = args.seed,
+        workers = args.workers)
 
-    saveMap(generatedMap, filename)
-    print(f"Map saved to \'{filename}\'")
+    saveMap(generatedMap, args.alias)
+    print(f"Map saved to \'{args.alias}\'")
 
-else:
-    logError("Did not do anything")
\ No newline at end of file
+elif __name__ != "__mp_main__":
+    # Processes started by the pool import this file again as '__mp_main__'. Importing it to call
+    # generateMap is fine too, so this is only a debug message and costs nothing at the default level
+    logDebug("Did not do anything")
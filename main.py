@@ -1,11 +1,9 @@
 import sys
-
-if __name__ != '__main__':
-    sys.exit()
-
 import random
 import math
+import time
 from copy import deepcopy
+from typing import Callable
 
 from src.script.log import *
 logSuccess("Program started")
@@ -14,33 +12,55 @@ import pygame
 pygame.init()
 logMSG("Initialized pygame")
 
-from src.script.loader import loadImage, STGS, FIX_STGS, loadDirectory, loadImagesAsList, loadTiles, resizeImage, loadImageResized
+from src.script.loader import loadImage, STGS, FIX_STGS, loadDirectory, loadImagesAsList, loadTiles, loadImageResized, finalizeAssets, preloadImages, releaseImages, ASSETS, TRANSPARENT_COLOR
 from src.script.gui import Button, renderText
+from src.script.dirtyRects import DirtyRects
+from src.script.profiler import PROFILER
+from src.script.mathFunc import lerpPos
 
 from src.script.tilemap import Tilemap
+from src.script.chunkStreamer import ChunkStreamer
+from src.script.mapSaver import MapSaver
 from src.script.cloud import Clouds
 from src.script.animation import Animation
-from src.script.particle import Particle
+from src.script.particleSystem import ParticleSystem
+from src.script.atlas import TextureAtlas
 from src.script.item import *
 from src.script.floatingItem import FloatingItem
+from src.script.spatialHash import SpatialHash
+from src.script.activity import ActivitySet
+from src.script.scheduler import RegionScheduler
 from src.fixData.table import SAME_LOOT_TILE
+from src.fixData.itemSurface import ITEM_ICON, ITEM_IMAGE
 from src.script.mobType.player import Player
 logMSG("Loaded local dependency from script")
 
 ### INITIAL INPUTS HERE
 GAME_MODE: str = "admin"
 
+# The images only a state needs, kept in memory while the game is in it
+STATE_IMAGES: dict[str, list[tuple[str, tuple[int] | None]]] = {
+    "mainMenu": [("icon/lolBG", (STGS["windowWidth"], STGS["windowHeight"]))]
+}
+
 class Main:
     """Main class responsible for managing the game."""
-    def __init__(self) -> None:
+    def __init__(self, mapName: str = "map1") -> None:
         """Initialize the game with specified tile size and settings.
 
+        Args:
+            mapName (str, optional): The name of the map folder in 'src/map/' to play on. Defaults to "map1".
+
         Raises:
             Exception: If an error occurs during initialization.
         """
         try:
             # Base initialization
             self.frame = 0
+            self.tick = 0
+
+            # Fraction of a tick passed since the last update, used to interpolate rendering
+            self.interpolation: float = 1
 
             # State
             self.state = "mainMenu"
@@ -67,19 +87,29 @@ class Main:
             self.WINDOW: pygame.Surface = pygame.display.set_mode([STGS["windowWidth"], STGS["windowHeight"]])
             pygame.display.set_caption(FIX_STGS["windowName"])
             pygame.display.set_icon(self.assets["icon"]["main"])
+            # From here on images are converted to the display format as they are loaded, these were loaded before
+            logMSG(f"Converted {finalizeAssets([self.assets, ITEM_ICON, ITEM_IMAGE])} images loaded before the display")
+            preloadImages(self.state, STATE_IMAGES.get(self.state, []))
             self.scroll: list[float] = [0, 0]
+            self.previousScroll: list[float] = [0, 0]
+            self.dirtyRects: DirtyRects = DirtyRects(self.WINDOW)
             logMSG("Created main window")
 
             # Tilemap
             self.assets["tile"] = loadTiles("tile")
-            self.assets["tileBreakage"] = {int(key): resizeImage(surf, (STGS["tileSize"], STGS["tileSize"])) for key, surf in loadDirectory("tileBreakage").items()}
+            self.assets["tileBreakage"] = {int(key): loadImageResized(f"tileBreakage/{key}", (STGS["tileSize"], STGS["tileSize"])) for key in loadDirectory("tileBreakage")}
             logMSG("Loaded tile assets")
 
             self.tilemap: Tilemap = Tilemap(
                 assets = self.assets,
-                mapName = "map1")
+                mapName = mapName)
             logMSG("Created tilemap")
             self.floatingItems: list[FloatingItem] = []
+            # Every entity registers its hitbox here, interactions only check the entities near each other
+            self.entities: SpatialHash = SpatialHash(STGS["entityCellSize"])
+            # Only the awake entities are simulated, tile edits next to sleeping ones wake them
+            self.activity: ActivitySet = ActivitySet(self.entities)
+            self.tilemap.events.subscribe(onTiles = self.activity.onTileChanges)
 
             # Clouds
             self.assets["cloud"] = loadImagesAsList("cloud")
@@ -93,7 +123,7 @@ class Main:
             # Player
             self.assets["mob"]["player"]["idle"] = Animation(loadImagesAsList("mob/player/idle"), imageDuration = 6)
             self.assets["mob"]["player"]["run"] = Animation(loadImagesAsList("mob/player/run"), imageDuration = 4)
-            self.assets["mob"]["player"]["jump"] = Animation(loadImagesAsList("mob/player/jump"), imageDuration = STGS["FPS"] / 6)
+            self.assets["mob"]["player"]["jump"] = Animation(loadImagesAsList("mob/player/jump"), imageDuration = STGS["tickRate"] / 6)
             self.assets["mob"]["player"]["slide"] = Animation(loadImagesAsList("mob/player/slide"))
             self.assets["mob"]["player"]["wallSlide"] = Animation(loadImagesAsList("mob/player/wallSlide"))
 
@@ -101,39 +131,40 @@ class Main:
                 self.assets["mob"],
                 pos = [STGS["windowWidth"] / 2, STGS["windowHeight"] / 2],
                 gameMode = GAME_MODE)
+            self.entities.insert(self.player, self.player.rect())
             logMSG("Created player")
 
             # Particles
-            self.assets["particle"]["leaf"] = Animation(loadImagesAsList("particle/leaf"), imageDuration = STGS["FPS"] // 2, loop = False)
-            self.particles: list[Particle] = [] # List of all existing particles at a given moment
-
-            # Any tile that spawns particles
-            self.particleTilePairs: dict[str, list[tuple[str | int]]] = NAME_SPACE["idPairParticleSpawners"]
-
-            # Any tile thats any variant spawns particles
-            self.particleTiles: dict[str, list[str]] = NAME_SPACE["anyVariantParticleSpawners"]
-            
-            # Format: {"leaf": [rects], "": [rects]} ~ dict[particle] = rectsOfTilesThatEmit{particle}
-            # This contains all the rects of tiles, that emit particles
-            self.particleSpawnerTiles: dict[str, list[pygame.Rect]] = {}
-            
-            for particleStr, spawnerPairs in self.particleTilePairs.items():
-                for spawner in self.tilemap.extract(spawnerPairs, keep=True):
-                    if particleStr in self.particleSpawnerTiles:
-                        self.particleSpawnerTiles[particleStr].append(pygame.Rect(spawner[0][0], spawner[0][1], STGS["tileSize"], STGS["tileSize"]))
-                    else:
-                        self.particleSpawnerTiles[particleStr] = [pygame.Rect(spawner[0][0], spawner[0][1], STGS["tileSize"], STGS["tileSize"])]
-
-            for particleStr, blockList in self.particleTiles.items():
-                for block in blockList:
-                    for spawner in self.tilemap.extractAnyVariant(block, keep=True):
-                        if particleStr in self.particleSpawnerTiles:
-                            self.particleSpawnerTiles[particleStr].append(pygame.Rect(spawner[0][0], spawner[0][1], STGS["tileSize"], STGS["tileSize"]))
-                        else:
-                            self.particleSpawnerTiles[particleStr] = [pygame.Rect(spawner[0][0], spawner[0][1], STGS["tileSize"], STGS["tileSize"])]
-
-            logMSG("Loaded and generated particles, and their respective spawning tiles")
-            logMSG(f"Currently {sum([len(rectList) for rectList in self.particleSpawnerTiles.values()])} tiles emit particles")
+            self.assets["particle"]["leaf"] = Animation(loadImagesAsList("particle/leaf"), imageDuration = STGS["tickRate"] // 2, loop = False)
+
+            # The sprites drawn every frame are packed into a few large sheets, the tables keep working as they were
+            self.atlas: TextureAtlas = TextureAtlas()
+            for block, variants in self.assets["tile"].items():
+                self.atlas.pack(variants, ("tile", block))
+            self.atlas.pack(self.assets["tileBreakage"], "tileBreakage")
+            self.atlas.pack(ITEM_ICON, "itemIcon")
+            self.atlas.pack(ITEM_IMAGE, "itemImage")
+            for species, actions in self.assets["mob"].items():
+                for action, animation in actions.items():
+                    self.atlas.pack(animation.images, ("mob", species, action))
+            for species, animation in self.assets["particle"].items():
+                self.atlas.pack(animation.images, ("particle", species))
+            self.atlas.build()
+            logMSG(f"Packed {len(self.atlas.regions)} sprites into {len(self.atlas.sheets)} sheets")
+
+            self.particles: ParticleSystem = ParticleSystem(self.assets["particle"]) # All existing particles at a given moment
+
+            # The tiles that spawn particles are indexed by the tilemap as their chunks are loaded
+            logMSG("Loaded particles")
+
+            # Changed chunks are written in the background, on autosave and when they are unloaded
+            self.mapSaver: MapSaver = MapSaver(self.tilemap)
+            # From here on only the chunks around the camera are kept in memory
+            self.chunkStreamer: ChunkStreamer = ChunkStreamer(self.tilemap)
+            logMSG("Started chunk streaming")
+
+            # Far from the camera things are simulated less often, or not at all
+            self.scheduler: RegionScheduler = RegionScheduler()
 
             self.clicking: dict[str, bool] = {
                 "left": False,
@@ -181,9 +212,11 @@ class Main:
             logError(f"An error occurred during initialization: {e}")
             sys.exit(1)
 
-    @staticmethod
-    def exitApp() -> None:
+    def exitApp(self) -> None:
         """Exit the application."""
+        self.chunkStreamer.close()
+        self.mapSaver.close()
+        logMSG(f"Image cache: {ASSETS.stats}")
         logSuccess("Successfully ran program")
         pygame.quit()
         sys.exit()
@@ -195,13 +228,19 @@ class Main:
                 FloatingItem(
                     [STGS["tileSize"] * (self.tilePosAtMouse[0] + 0.5) - ITEM_IMAGE[item.id].get_width() * 0.5,
                     STGS["tileSize"] * self.tilePosAtMouse[1]],
-                item))
+                item,
+                bornTick = self.tick))
             # Set .velocity to a bit side so it has a curve TODO using random
             self.floatingItems[-1].velocity[1] = - 0.3 - random.random() * 0.2
             self.floatingItems[-1].velocity[0] = (random.random() * 2 - 1) * 2
+            self.entities.insert(self.floatingItems[-1], self.floatingItems[-1].getCollisonRect())
+            self.activity.add(self.floatingItems[-1])
 
     def setState(self, state: str) -> None:
         """Set the current state of the game."""
+        if state != self.state:
+            releaseImages(self.state)
+            preloadImages(state, STATE_IMAGES.get(state, []))
         self.state = state
         logMSG(f"Set state to \'{state}\'")
 
@@ -213,6 +252,10 @@ class Main:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.exitApp()
+
+            if event.type in [pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED]:
+                # Something else drew over the window
+                self.dirtyRects.invalidate()
             
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
@@ -281,12 +324,12 @@ class Main:
                             if self.player.cursorSlot.getItem() is None:
 
                                 if self.player.inventory.getItemByNum(slotNum) is None:
-                                    logMSG("\'None\' with \'None\' lol")
+                                    logDebug("\'None\' with \'None\' lol")
 
                                 elif self.player.inventory.getItemByNum(slotNum).maxAmount == 1:
                                     # Cursor item and slot item swich places
                                     self.player.getInventory()[slotNum], self.player.cursorSlot.slot = self.player.cursorSlot.getItem(), self.player.inventory.getItemByNum(slotNum)
-                                    logMSG("Picked up \'non-stackable\' item")
+                                    logDebug("Picked up \'non-stackable\' item")
 
                                 else:
                                     if self.player.inventory.getItemByNum(slotNum).amount % 2 == 0:
@@ -298,21 +341,21 @@ class Main:
                                         self.player.cursorSlot.getItem().amount -= 1
                                         if self.player.cursorSlot.getItem().amount == 0:
                                             self.player.cursorSlot.slot = None
-                                    logMSG("Picked up half of \'stackable\' item")
+                                    logDebug("Picked up half of \'stackable\' item")
                             
                             elif self.player.cursorSlot.getItem().maxAmount == 1:
 
                                 if self.player.inventory.getItemByNum(slotNum) is None:
                                     self.player.getInventory()[slotNum], self.player.cursorSlot.slot = self.player.cursorSlot.getItem(), self.player.inventory.getItemByNum(slotNum)
-                                    logMSG("Put down \'non-stackable\' item")
+                                    logDebug("Put down \'non-stackable\' item")
 
                                 elif self.player.inventory.getItemByNum(slotNum).maxAmount == 1:
                                     self.player.getInventory()[slotNum], self.player.cursorSlot.slot = self.player.cursorSlot.getItem(), self.player.inventory.getItemByNum(slotNum)
-                                    logMSG("Swapped \'non-stackable\' items")
+                                    logDebug("Swapped \'non-stackable\' items")
 
                                 else:
                                     self.player.getInventory()[slotNum], self.player.cursorSlot.slot = self.player.cursorSlot.getItem(), self.player.inventory.getItemByNum(slotNum)
-                                    logMSG("Put \'non-stackable\' itemin the place of \'stackable\' item")
+                                    logDebug("Put \'non-stackable\' itemin the place of \'stackable\' item")
 
                             else:
 
@@ -323,28 +366,28 @@ class Main:
                                     if self.player.cursorSlot.slot.amount == 0:
                                         self.player.cursorSlot.slot = None
 
-                                    logMSG("Put down 1 \'stackable\' item to empty slot")
+                                    logDebug("Put down 1 \'stackable\' item to empty slot")
 
                                 elif self.player.inventory.getItemByNum(slotNum).maxAmount == 1:
                                     self.player.getInventory()[slotNum], self.player.cursorSlot.slot = self.player.cursorSlot.getItem(), self.player.inventory.getItemByNum(slotNum)
-                                    logMSG("Swapped \'non-stackable\' item with \'stackable\' items")
+                                    logDebug("Swapped \'non-stackable\' item with \'stackable\' items")
 
                                 else:
                                     if self.player.inventory.getItemByNum(slotNum).id != self.player.cursorSlot.getItem().id:
                                         self.player.getInventory()[slotNum], self.player.cursorSlot.slot = self.player.cursorSlot.getItem(), self.player.inventory.getItemByNum(slotNum)
-                                        logMSG("Swapped \'stackable\' items")
+                                        logDebug("Swapped \'stackable\' items")
                                     else:
                                         # ItemIDs are the same
 
                                         if self.player.inventory.getItemByNum(slotNum).amount == self.player.inventory.getItemByNum(slotNum).maxAmount:
                                             # Item in inventpry is at max stack
-                                            logMSG("Swapped \'stackable\' items")
+                                            logDebug("Swapped \'stackable\' items")
                                         else:
                                             self.player.getInventory()[slotNum].amount += 1
                                             self.player.cursorSlot.slot.amount -= 1
                                             if self.player.cursorSlot.slot.amount == 0:
                                                 self.player.cursorSlot.slot = None
-                                            logMSG("Put 1 \'stackable\' item to inventory")
+                                            logDebug("Put 1 \'stackable\' item to inventory")
 
                 if event.button == 4:
                     self.clicking["up"] = True
@@ -396,6 +439,9 @@ class Main:
                         self.setState("mainGame")
                     elif self.state == "mainGame":
                         self.setState("mainGameInventory")
+                if event.key == pygame.K_F3:
+                    PROFILER.toggle()
+                    logMSG(f"Profiling {'enabled' if PROFILER.enabled else 'disabled'}")
                 
             if event.type == pygame.KEYUP:
                 if event.key == pygame.K_a:
@@ -413,182 +459,335 @@ class Main:
         if self.state in ["mainGame", "mainGameInventory"]:
             self.tilePosAtMouse = (int(self.mousePos[0] + self.scroll[0]) // STGS["tileSize"], int(self.mousePos[1] + self.scroll[1]) // STGS["tileSize"])
         
+    def updateSystems(self) -> dict[str, Callable[[], None]]:
+        """
+        Return the parts of a game tick in the order they are run.
+
+        Returns:
+            dict[str, Callable[[], None]]: Maps the name of each subsystem to its update method.
+        """
+        return {
+            "camera": self.updateCamera,
+            "tileBreaking": self.updateTileBreaking,
+            "clouds": self.updateClouds,
+            "particles": self.updateParticles,
+            "player": self.updatePlayer,
+            "floatingItems": self.updateFloatingItems
+        }
+
     def handleUpdates(self) -> None:
-        """Update game state."""
+        """Update game state by one tick."""
+        self.tick += 1
+
         if self.state in ["mainGame", "mainGameInventory"]:
+            for name, update in self.updateSystems().items():
+                with PROFILER.scope(name):
+                    update()
 
-            # Camera movement
-            self.scroll[0] += (self.player.pos[0] + self.player.width / 2  - STGS["windowWidth"] / 2 - self.scroll[0]) / STGS["FPS"] * 2
-            self.scroll[1] += (self.player.pos[1] + self.player.height / 2  - STGS["windowHeight"] / 2 - self.scroll[1]) / STGS["FPS"] * 2
-            self.renderScroll: tuple[int] = (int(self.scroll[0]), int(self.scroll[1]))
+            # Hand the tile changes of this tick to everything derived from the tilemap
+            with PROFILER.scope("tileEvents"):
+                self.tilemap.flushEvents()
+            with PROFILER.scope("mapSaver"):
+                self.mapSaver.update()
 
-            # Player breaking tiles
-            self.player.toolUsePenalty += 1
+    def updateCamera(self) -> None:
+        """Move the camera towards the player and stream the chunks around it."""
+        # Camera movement
+        self.previousScroll = list(self.scroll)
+        self.scroll[0] += (self.player.pos[0] + self.player.width / 2  - STGS["windowWidth"] / 2 - self.scroll[0]) / STGS["tickRate"] * 2
+        self.scroll[1] += (self.player.pos[1] + self.player.height / 2  - STGS["windowHeight"] / 2 - self.scroll[1]) / STGS["tickRate"] * 2
+        self.renderScroll: tuple[int] = (int(self.scroll[0]), int(self.scroll[1]))
 
-            if self.clicking["left"]:
-                if self.tilemap.isTileAt(self.tilePosAtMouse):
-                    if isinstance(self.player.getItemInHand(), Tool): # Tool in hand
-                        if self.player.toolUsePenalty >= self.player.getItemInHand().useTime:
+        # Chunks
+        self.chunkStreamer.update(self.scroll, self.WINDOW.get_size())
+        self.scheduler.update(self.scroll, self.WINDOW.get_size())
 
-                            tile = self.tilemap.getTileAt(self.tilePosAtMouse)
+    def updateTileBreaking(self) -> None:
+        """Damage and break the tile under the mouse while the left button is held."""
+        # Player breaking tiles
+        self.player.toolUsePenalty += 1
 
-                            if self.player.isAbleToBreak(block = tile["block"]): 
-                                # Currenty you have the correct tool in hand
+        if self.clicking["left"]:
+            if self.tilemap.isTileAt(self.tilePosAtMouse):
+                if isinstance(self.player.getItemInHand(), Tool): # Tool in hand
+                    if self.player.toolUsePenalty >= self.player.getItemInHand().useTime:
 
-                                hitTileRect = pygame.Rect(self.tilePosAtMouse[0] * STGS["tileSize"], self.tilePosAtMouse[1] * STGS["tileSize"], STGS["tileSize"], STGS["tileSize"])
+                        tile = self.tilemap.getTileAt(self.tilePosAtMouse)
 
-                                if tile["block"] in NAME_SPACE["instantMinedBlocks"]:
-                                    tile["durability"] = 0
+                        if self.player.isAbleToBreak(block = tile["block"]): 
+                            # Currenty you have the correct tool in hand
 
-                                elif "durability" in tile:
-                                    powerType = self.player.breakTileWith(block = tile["block"])
+                            if tile["block"] in NAME_SPACE["instantMinedBlocks"]:
+                                tile["durability"] = 0
 
-                                    # Already hit tile
-                                    tile["durability"] -= self.player.getItemInHand().toolType[powerType]
+                            elif "durability" in tile:
+                                powerType = self.player.breakTileWith(block = tile["block"])
+
+                                # Already hit tile
+                                tile["durability"] -= self.player.getItemInHand().toolType[powerType]
+
+                            else:
+                                powerType = self.player.breakTileWith(block = tile["block"])
 
+                                # Tile has full durability
+                                if tile["block"] in NAME_SPACE["durabilityOfTile"].keys():
+                                    tile["durability"] = NAME_SPACE["durabilityOfTile"][tile["block"]]
                                 else:
-                                    powerType = self.player.breakTileWith(block = tile["block"])
+                                    tile["durability"] = NAME_SPACE["durabilityOfTile"]["_"]
+                                tile["durability"] -= self.player.getItemInHand().toolType[powerType]
 
-                                    # Tile has full durability
-                                    if tile["block"] in NAME_SPACE["durabilityOfTile"].keys():
-                                        tile["durability"] = NAME_SPACE["durabilityOfTile"][tile["block"]]
-                                    else:
-                                        tile["durability"] = NAME_SPACE["durabilityOfTile"]["_"]
-                                    tile["durability"] -= self.player.getItemInHand().toolType[powerType]
+                            # The tile is a copy, so write the new durability back
+                            self.tilemap.setDurability(self.tilePosAtMouse, tile["durability"])
 
-                                if tile["durability"] <= 0:
-                                    self.tilemap.breakTile(self.tilePosAtMouse)
+                            if tile["durability"] <= 0:
+                                self.tilemap.breakTile(self.tilePosAtMouse)
 
-                                    # Spawn particles TODO
+                                # Spawn particles TODO
 
-                                    # Pop an item TODO other cases
-                                    if tile["block"] in SAME_LOOT_TILE.keys():
-                                        self.spawnFloatingItem(deepcopy(SAME_LOOT_TILE[tile["block"]]))
+                                # Pop an item TODO other cases
+                                if tile["block"] in SAME_LOOT_TILE.keys():
+                                    self.spawnFloatingItem(deepcopy(SAME_LOOT_TILE[tile["block"]]))
 
-                                    # Remove the tile formed as rect from particle spawners
-                                    for key, rectList in self.particleSpawnerTiles.items():
-                                        if hitTileRect in rectList:
-                                            rectList.remove(hitTileRect)
-                                    
-                                    # Check for tile below/ at the broken tile TODO if it would spawn particles, and then append it accordingly
+                            self.player.toolUsePenalty = 0
+                        else:
+                            # The logger limits how often a single line shows up
+                            logMSG("Other tool is required to break this tile")
+
+    def updateClouds(self) -> None:
+        """Move the clouds with the wind."""
+        # Background
+        self.clouds.update(windSpeed = self.windSpeed)
+
+    def updateParticles(self) -> None:
+        """Spawn particles from the visible spawner tiles and move the existing ones."""
+        # Particles
+        # Spawn particles
+        for particleStr, tilePos in self.tilemap.visibleSpawners(self.WINDOW, self.renderScroll):
+            if random.random() * 49999  * 4 < STGS["tileSize"] * STGS["tileSize"]:
+                pos: tuple[float] = ((tilePos[0] + random.random()) * STGS["tileSize"], (tilePos[1] + random.random()) * STGS["tileSize"])
+                self.particles.spawn(
+                    species = particleStr,
+                    pos = pos,
+                    velocity = (
+                        (self.windSpeed if particleStr == "leaf" else random.random()) * 0.2,
+                        random.random() * 0.4),
+                    frame = random.randint(0, len(self.assets["particle"][particleStr].images)))
+
+        # Udpate particles, the ones that drifted out of the simulated area are dropped
+        self.particles.update()
+        self.particles.cull(self.scheduler.simulatedRect())
+
+    def updatePlayer(self) -> None:
+        """Move the player according to its input."""
+        # Player movement
+        self.player.update(self.tilemap,
+            (self.player.movementInput["right"] - self.player.movementInput["left"],
+            0))
+        self.entities.move(self.player, self.player.rect())
+
+    def updateFloatingItems(self) -> None:
+        """Move the floating items and let the player pick them up."""
+        playerCenter: tuple[float] = (
+            self.player.pos[0] + self.player.pivot[0] + self.player.hitBoxWidth / 2,
+            self.player.pos[1] + self.player.pivot[1] + self.player.hitBoxHeight / 2)
+        # The items the player could pull wake up
+        self.activity.wakeAround(playerCenter, STGS["tileSize"] * FIX_STGS["reach"])
+
+        # Floating items, sleeping ones and the ones in regions not due this tick are skipped,
+        # the lazy ones catch up on the ticks they skipped so they keep their speed
+        due: list[tuple[FloatingItem, int]] = [
+            (floatingItem, self.scheduler.ticksDue(floatingItem.pos, self.tick)) for floatingItem in self.activity.awakeOf(FloatingItem)]
+        moved: list[FloatingItem] = []
+        for floatingItem, ticks in due:
+            if not ticks:
+                continue
+            for _ in range(ticks):
+                floatingItem.update(self.tilemap, playerCenter)
+            self.entities.move(floatingItem, floatingItem.getCollisonRect())
+            self.activity.settle(floatingItem)
+            moved.append(floatingItem)
+
+        removed: set[FloatingItem] = self.mergeFloatingItems(moved)
+
+        # Only the items registered near the player are checked for pickup
+        for floatingItem in self.entities.queryRect(self.player.rect(), FloatingItem):
+            if floatingItem in removed:
+                continue
+            item = self.player.inventory.addItem(floatingItem.item)
+            if item is None:
+                removed.add(floatingItem)
+            else:
+                floatingItem.item = item
+
+        # Old items despawn, checked once a second since sleeping items age too
+        if not self.tick % STGS["tickRate"]:
+            despawnTicks: int = FIX_STGS["floatingItemDespawnTime"] * STGS["tickRate"]
+            removed.update(floatingItem for floatingItem in self.floatingItems if floatingItem.age(self.tick) >= despawnTicks)
+        # Past the cap the oldest ones go first
+        overCap: int = len(self.floatingItems) - len(removed) - FIX_STGS["maxFloatingItems"]
+        if overCap > 0:
+            removed.update(sorted(
+                (floatingItem for floatingItem in self.floatingItems if floatingItem not in removed),
+                key = lambda floatingItem: floatingItem.bornTick)[:overCap])
+
+        if removed:
+            self.floatingItems = [floatingItem for floatingItem in self.floatingItems if floatingItem not in removed]
+            for floatingItem in removed:
+                self.entities.remove(floatingItem)
+                self.activity.remove(floatingItem)
+
+    def mergeFloatingItems(self, moved: list[FloatingItem]) -> set[FloatingItem]:
+        """
+        Merge the items that moved into nearby stacks of the same item.
 
-                                self.player.toolUsePenalty = 0
-                            else:
-                                if not self.frame % 10:
-                                    logMSG("Other tool is required to break this tile")
+        Sleeping items already had their chance to merge when they landed, so only the awake ones look around.
 
-            # Background
-            self.clouds.update(windSpeed = self.windSpeed)
+        Args:
+            moved (list[FloatingItem]): The items that moved this tick.
 
-            # Particles
-            # Spawn particles
-            rectsOnWindow: list[pygame.Rect] = self.tilemap.getRectsOnWindow(self.WINDOW, self.renderScroll)
-            for rect in rectsOnWindow:
-                for particleStr, rects in self.particleSpawnerTiles.items():
-                    if rect in rects:
-                        if random.random() * 49999  * 4 < rect.width * rect.height:
-                            pos: tuple[float] = (rect.x + random.random() * rect.width, rect.y + random.random() * rect.height)
-                            self.particles.append(Particle(
-                                assets = self.assets["particle"],
-                                species = particleStr,
-                                pos = pos,
-                                velocity = [
-                                    (self.windSpeed if particleStr == "leaf" else random.random()) * 0.2,
-                                    random.random() * 0.4],
-                                frame = random.randint(0, len(self.assets["particle"][particleStr].images)) ))
-
-            # Udpate particles
-            for particle in self.particles.copy():
-                kill = particle.update()
-                if kill:
-                    self.particles.remove(particle)
-                if particle.species in ["leaf"]:
-                    particle.pos[0] += math.sin(particle.animation.frame * 0.035) * 0.25
-
-            # Player movement
-            self.player.update(self.tilemap,
-                (self.player.movementInput["right"] - self.player.movementInput["left"],
-                0))
-            
-            # Floating items
-            for index, floatingItem in enumerate(self.floatingItems):
-                floatingItem.update(
-                    self.tilemap,
-                    (self.player.pos[0] + self.player.pivot[0] + self.player.hitBoxWidth / 2,
-                    self.player.pos[1] + self.player.pivot[1] + self.player.hitBoxHeight / 2)
-                )
-                if floatingItem.getCollisonRect().colliderect(self.player.rect()):
-                    item = self.player.inventory.addItem(floatingItem.item)
-                    if item is None:
-                        self.floatingItems.remove(floatingItem)
-                    else:
-                        self.floatingItems[index] = item
+        Returns:
+            set[FloatingItem]: The items that were emptied into others.
+        """
+        removed: set[FloatingItem] = set()
+        radius: float = FIX_STGS["floatingItemMergeRadius"] * STGS["tileSize"]
+        for floatingItem in moved:
+            if floatingItem in removed or floatingItem.item.maxAmount == 1:
+                continue
+            center: tuple[int] = floatingItem.getCollisonRect().center
+            for other in self.entities.queryRadius(center, radius, FloatingItem):
+                if other is floatingItem or other in removed or other.item.id != floatingItem.item.id:
+                    continue
+                # The older stack takes in the newer one
+                target, source = (other, floatingItem) if other.bornTick <= floatingItem.bornTick else (floatingItem, other)
+                self.activity.wake(target)
+                if target.merge(source):
+                    removed.add(source)
+                    if source is floatingItem:
+                        break
+        return removed
 
     def handleRender(self) -> None:
-        """Render game elements."""
-        if self.state == "mainMenu":
-            # Background
-            self.WINDOW.fill(NAME_SPACE["color"]["mainTheme"])
-            self.WINDOW.blit(loadImageResized("icon/lolBG", (STGS["windowWidth"], STGS["windowHeight"])), (0, 0))
-        
-        elif self.state in ["mainGame", "mainGameInventory"]:
-            # Background
-            self.WINDOW.fill(NAME_SPACE["color"]["pink"])
+        """Render game elements.
 
-            self.clouds.render(self.WINDOW, offset = self.renderScroll)
+        The background layer is only redrawn when what it shows changes,
+        everything drawn on top of it reports the rect it changed.
+        """
+        if self.state in ["mainGame", "mainGameInventory"]:
+            # Camera between the last two ticks
+            scroll: tuple[float] = lerpPos(self.previousScroll, self.scroll, self.interpolation)
+            self.renderScroll: tuple[int] = (int(scroll[0]), int(scroll[1]))
+            # The clouds move on their own, so they are drawn as sprites behind the tiles instead
+            backgroundKey: tuple = ("mainGame", self.renderScroll, self.tilemap.version)
+        else:
+            backgroundKey: tuple = (self.state,)
 
-            # Tilemap
-            self.tilemap.render(self.WINDOW, offset = self.renderScroll)
+        if self.dirtyRects.beginFrame(backgroundKey):
+            background: pygame.Surface = self.dirtyRects.background
+
+            if self.state == "mainMenu":
+                # Background
+                background.fill(NAME_SPACE["color"]["mainTheme"])
+                background.blit(loadImageResized("icon/lolBG", (STGS["windowWidth"], STGS["windowHeight"])), (0, 0))
+
+            elif self.state in ["mainGame", "mainGameInventory"]:
+                # Background
+                background.fill(NAME_SPACE["color"]["pink"])
+
+                # Tilemap, kept apart as the foreground to cover the clouds with
+                foreground: pygame.Surface = self.dirtyRects.foreground
+                foreground.fill(TRANSPARENT_COLOR)
+                self.tilemap.render(foreground, offset = self.renderScroll)
+                background.blit(foreground, (0, 0))
+
+            else:
+                # Unknown state
+                background.fill(NAME_SPACE["color"]["mainTheme"])
+
+                # Render das text
+                renderText(
+                    background,
+                    (int(STGS["windowWidth"] // 2),
+                    int(STGS["windowHeight"] // 2)),
+                    "Unknown state",
+                    fontName = "arial",
+                    fontSize = 48)
+
+            self.dirtyRects.commitBackground()
+
+        if self.state in ["mainGame", "mainGameInventory"]:
+            # Clouds
+            for rect in self.clouds.render(self.WINDOW, offset = self.renderScroll):
+                self.dirtyRects.addBehind(rect)
 
             # Mobs
-            self.player.render(self.WINDOW, offset = self.renderScroll)
+            self.dirtyRects.add(self.player.render(self.WINDOW, offset = self.renderScroll, interpolation = self.interpolation))
 
             # Particles
-            for particle in self.particles:
-                particle.render(self.WINDOW, offset = self.renderScroll)
+            self.dirtyRects.add(self.particles.render(self.WINDOW, offset = self.renderScroll, interpolation = self.interpolation))
 
             # Floating items
-            for item in self.floatingItems:
-                item.render(self.WINDOW, offset = self.renderScroll)
+            for rect in self.WINDOW.blits([item.blitPair(offset = self.renderScroll, interpolation = self.interpolation) for item in self.floatingItems]):
+                self.dirtyRects.add(rect)
 
             # Inventory
             if self.state == "mainGame":
-                self.player.inventory.renderHotbar(self.WINDOW, self.player.hotbarNum, mousePos = self.mousePos)
+                self.dirtyRects.add(self.player.inventory.renderHotbar(self.WINDOW, self.player.hotbarNum, mousePos = self.mousePos))
 
             elif self.state == "mainGameInventory":
-                self.player.inventory.renderFullInventory(self.WINDOW, self.player.hotbarNum, mousePos = self.mousePos)
-                self.player.cursorSlot.renderItemAtCursor(self.WINDOW, self.mousePos)
-
-        else:
-            # Unknown state
-            self.WINDOW.fill(NAME_SPACE["color"]["mainTheme"])
-
-            # Render das text
-            renderText(
-                self.WINDOW,
-                (int(STGS["windowWidth"] // 2),
-                int(STGS["windowHeight"] // 2)),
-                "Unknown state",
-                fontName = "arial",
-                fontSize = 48)
+                self.dirtyRects.add(self.player.inventory.renderFullInventory(self.WINDOW, self.player.hotbarNum, mousePos = self.mousePos))
+                self.dirtyRects.add(self.player.cursorSlot.renderItemAtCursor(self.WINDOW, self.mousePos))
 
         # Buttons
         for name, button in self.buttons[self.state].items():
-            button.render(self.WINDOW, self.mousePos)
+            self.dirtyRects.add(button.render(self.WINDOW, self.mousePos))
+
+        # Profiling overlay
+        if PROFILER.enabled:
+            PROFILER.count("particles", len(self.particles))
+            PROFILER.count("floatingItems", len(self.floatingItems))
+            PROFILER.count("awakeEntities", len(self.activity.awake))
+            self.dirtyRects.add(PROFILER.renderOverlay(self.WINDOW))
 
         # Cursor
-        self.WINDOW.blit(self.assets["icon"]["cursor"], self.mousePos)
+        self.dirtyRects.add(self.WINDOW.blit(self.assets["icon"]["cursor"], self.mousePos))
     
     def run(self) -> None:
-        """Main game loop."""
+        """Main game loop.
+
+        The game state advances in fixed ticks of 1 / tickRate seconds, however many frames are rendered.
+        Slow frames are caught up with extra ticks, up to maxTicksPerFrame, beyond that the game slows down.
+        """
+        tickTime: float = 1 / STGS["tickRate"]
+        accumulator: float = tickTime
+        previousTime: float = time.perf_counter()
+
         while True:
             self.handleEvents()
-            self.handleUpdates()
-            self.handleRender()
+
+            currentTime: float = time.perf_counter()
+            accumulator += (currentTime - previousTime) * STGS["timeScale"]
+            previousTime = currentTime
+
+            ticks: int = 0
+            with PROFILER.scope("update"):
+                while accumulator >= tickTime and ticks < STGS["maxTicksPerFrame"]:
+                    self.handleUpdates()
+                    accumulator -= tickTime
+                    ticks += 1
+            if accumulator >= tickTime:
+                # Too far behind, so the ticks left over are dropped instead of spiralling, only the part of a tick is kept
+                accumulator %= tickTime
+            self.interpolation = accumulator / tickTime
+
+            with PROFILER.scope("render"):
+                self.handleRender()
 
             self.clock.tick(STGS["FPS"])
-            pygame.display.update()
+            with PROFILER.scope("present"):
+                self.dirtyRects.present()
+            PROFILER.endFrame()
             self.frame += 1
 
-GAME: Main = Main()
-GAME.run()
+if __name__ == "__main__":
+    GAME: Main = Main()
+    GAME.run()
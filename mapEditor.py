@@ -9,6 +9,7 @@ from src.script.log import *
 logMSG("Initialized pygame")
 
 from src.script.tilemap import Tilemap
+from src.script.mapSaver import MapSaver
 from src.script.log import *
 from src.script.loader import *
 logMSG("Loaded all local dependency script")
@@ -34,9 +35,9 @@ class Main:
 
             self.tilemap: Tilemap = Tilemap(
                 assets = self.assets["tiles"],
-                mapName = "map1",
-                tileSize = self.tileSize)
+                mapName = "map1")
             logMSG("Created tilemap")
+            self.mapSaver: MapSaver = MapSaver(self.tilemap)
 
             self.clock: pygame.time.Clock = pygame.time.Clock()
 
@@ -100,7 +101,8 @@ class Main:
                     self.clicking["down"] = False
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    self.tilemap.saveMap()
+                    # Saves what changed since the last autosave and waits for it to be written
+                    self.mapSaver.close()
                     self.exitApp()
 
                 if event.key == pygame.K_a:
@@ -142,6 +144,8 @@ class Main:
 
         self.currentTileImg = self.assets["tiles"][self.tileList[self.tileIndex][0]][self.tileList[self.tileIndex][1]].copy()
         self.currentTileImg.set_alpha(100)
+
+        self.mapSaver.update()
     
     def handleRender(self) -> None:
         """Handle rendering of game objects."""
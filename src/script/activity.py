@@ -0,0 +1,115 @@
+import pygame
+
+from src.script.loader import STGS
+from src.script.spatialHash import SpatialHash
+from src.script.tileEvents import TileChange
+
+class ActivitySet:
+    """
+    Splits the entities into awake ones, which are simulated every tick, and sleeping ones, which are not.
+
+    An entity falls asleep when its isAtRest method says so after an update. It is woken by tile
+    changes next to it, by coming into a radius around the player, or by getting an impulse.
+    Sleeping entities stay in the spatial hash, so they can still be found and picked up.
+
+    Attributes:
+        entities (SpatialHash): The spatial hash the entities are registered in, used to find the ones to wake.
+        awake (dict[object, None]): The awake entities, in the order they were added or woken.
+        asleep (set[object]): The sleeping entities.
+    """
+    def __init__(self, entities: SpatialHash) -> None:
+        """
+        Initialize an ActivitySet object.
+
+        Args:
+            entities (SpatialHash): The spatial hash the entities are registered in.
+        """
+        self.entities: SpatialHash = entities
+        self.awake: dict[object, None] = {}
+        self.asleep: set[object] = set()
+
+    def __len__(self) -> int:
+        return len(self.awake) + len(self.asleep)
+
+    def add(self, entity: object) -> None:
+        """Start tracking an entity, awake."""
+        self.asleep.discard(entity)
+        self.awake[entity] = None
+
+    def remove(self, entity: object) -> None:
+        """Stop tracking an entity, nothing happens if it is not tracked."""
+        self.awake.pop(entity, None)
+        self.asleep.discard(entity)
+
+    def clear(self) -> None:
+        """Stop tracking every entity."""
+        self.awake.clear()
+        self.asleep.clear()
+
+    def isAsleep(self, entity: object) -> bool:
+        """Return whether an entity is sleeping."""
+        return entity in self.asleep
+
+    def awakeOf(self, kind: type) -> list[object]:
+        """
+        Get the awake entities of a class, safe to iterate while entities fall asleep or are removed.
+
+        Args:
+            kind (type): The class of the entities.
+
+        Returns:
+            list[object]: The awake entities of the class.
+        """
+        return [entity for entity in self.awake if isinstance(entity, kind)]
+
+    def settle(self, entity: object) -> None:
+        """
+        Put an awake entity to sleep if it came to rest, call it after the entity was updated.
+
+        Args:
+            entity (object): The entity, it must have an isAtRest method.
+        """
+        if entity in self.awake and entity.isAtRest():
+            del self.awake[entity]
+            self.asleep.add(entity)
+
+    def wake(self, entity: object) -> None:
+        """Wake a sleeping entity, nothing happens if it is not sleeping."""
+        if entity in self.asleep:
+            self.asleep.remove(entity)
+            self.awake[entity] = None
+
+    def impulse(self, entity: object, velocity: tuple[float]) -> None:
+        """
+        Push an entity, waking it.
+
+        Args:
+            entity (object): The entity, it must have a velocity.
+            velocity (tuple[float]): The velocity added to the entity's.
+        """
+        entity.velocity[0] += velocity[0]
+        entity.velocity[1] += velocity[1]
+        self.wake(entity)
+
+    def wakeRect(self, rect: pygame.Rect) -> None:
+        """Wake the sleeping entities overlapping a rect."""
+        if not self.asleep:
+            return
+        for entity in self.entities.queryRect(rect):
+            self.wake(entity)
+
+    def wakeAround(self, center: tuple[float], radius: float) -> None:
+        """Wake the sleeping entities closer to a center than a radius."""
+        if not self.asleep:
+            return
+        for entity in self.entities.queryRadius(center, radius):
+            self.wake(entity)
+
+    def onTileChanges(self, changes: list[TileChange]) -> None:
+        """Wake the entities touching or lying on changed tiles, subscribed to the tile events of the tilemap."""
+        if not self.asleep:
+            return
+        tileSize: int = STGS["tileSize"]
+        for change in changes:
+            # The tile and a margin around it, so the entities resting on it are included
+            self.wakeRect(pygame.Rect((change.pos[0] - 1) * tileSize, (change.pos[1] - 1) * tileSize, tileSize * 3, tileSize * 3))
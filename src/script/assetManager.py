@@ -0,0 +1,78 @@
+import weakref
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+class AssetManager:
+    """
+    Loads every asset once and hands out the same object to everyone asking for it.
+
+    An asset is kept while anything still holds it, the most recently used ones are kept
+    even if nothing does, up to the capacity, and the ones of a preloaded group are kept
+    until the group is released. Everything else is forgotten and loaded again when asked for.
+
+    Attributes:
+        capacity (int): The number of recently used assets kept when nothing else holds them.
+        live (weakref.WeakValueDictionary): Every loaded asset still held by something, by key.
+        recent (OrderedDict[Hashable, Any]): The recently used assets, least recently used first.
+        groups (dict[str, dict[Hashable, Any]]): The assets of every preloaded group.
+        stats (dict[str, int]): Counters of hits, loads and assets dropped from the recent ones.
+    """
+    def __init__(self, capacity: int) -> None:
+        """
+        Initialize an AssetManager object.
+
+        Args:
+            capacity (int): The number of recently used assets kept when nothing else holds them.
+        """
+        self.capacity: int = capacity
+        self.live: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self.recent: OrderedDict[Hashable, Any] = OrderedDict()
+        self.groups: dict[str, dict[Hashable, Any]] = {}
+        self.stats: dict[str, int] = {"hits": 0, "loads": 0, "evictions": 0}
+
+    def get(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """
+        Get an asset, loading it only if it is not in memory.
+
+        Args:
+            key (Hashable): What the asset is, the path, the size and the format for images.
+            load (Callable[[], Any]): Loads the asset if it is not in memory.
+
+        Returns:
+            Any: The asset.
+        """
+        asset: Any = self.live.get(key)
+        if asset is None:
+            asset = load()
+            self.live[key] = asset
+            self.stats["loads"] += 1
+        else:
+            self.stats["hits"] += 1
+
+        self.recent[key] = asset
+        self.recent.move_to_end(key)
+        if len(self.recent) > self.capacity:
+            # Still shared if something holds it
+            self.recent.popitem(last = False)
+            self.stats["evictions"] += 1
+        return asset
+
+    def preload(self, group: str, assets: dict[Hashable, Any]) -> None:
+        """
+        Keep assets in memory until their group is released.
+
+        Args:
+            group (str): The name of the group, a game state for example.
+            assets (dict[Hashable, Any]): The keys and the loaded assets of the group.
+        """
+        self.groups.setdefault(group, {}).update(assets)
+
+    def release(self, group: str) -> None:
+        """Stop keeping the assets of a group, they stay while anything else holds them."""
+        self.groups.pop(group, None)
+
+    def clear(self) -> None:
+        """Forget every asset that is not held by anything but the manager."""
+        self.recent.clear()
+        self.groups.clear()
@@ -0,0 +1,153 @@
+import pygame
+
+from typing import Hashable
+
+from src.script.loader import TRANSPARENT_COLOR
+
+ATLAS_SHEET_SIZE: int = 1024
+
+class TextureAtlas:
+    """
+    Packs many small images into a few large sheets.
+
+    The images are placed in rows by height, a new sheet is started when one is full.
+    Images with per-pixel alpha and colorkeyed ones go to separate sheets, so both are
+    drawn exactly as before. Once built, every packed image is a subsurface of its sheet,
+    so the tables that held the images can keep being used as they were. An image added
+    under several keys, like a frame shared by two animations, is packed once and its
+    subsurface is shared by all of them.
+
+    Attributes:
+        sheetSize (int): The width and height of a sheet in pixels.
+        images (dict[Hashable, pygame.Surface]): The images added and not packed yet.
+        tables (list[tuple[dict | list, Hashable]]): The tables whose images are replaced once the atlas is built.
+        sheets (list[pygame.Surface]): The sheets the images are packed into.
+        regions (dict[Hashable, tuple[int, pygame.Rect]]): The sheet index and the area of every packed image.
+        subsurfaces (dict[Hashable, pygame.Surface]): The packed images, as subsurfaces of their sheets.
+    """
+    def __init__(self, sheetSize: int = ATLAS_SHEET_SIZE) -> None:
+        """
+        Initialize a TextureAtlas object.
+
+        Args:
+            sheetSize (int, optional): The width and height of a sheet in pixels. Defaults to ATLAS_SHEET_SIZE.
+        """
+        self.sheetSize: int = sheetSize
+        self.images: dict[Hashable, pygame.Surface] = {}
+        self.tables: list[tuple[dict | list, Hashable]] = []
+        self.sheets: list[pygame.Surface] = []
+        self.regions: dict[Hashable, tuple[int, pygame.Rect]] = {}
+        self.subsurfaces: dict[Hashable, pygame.Surface] = {}
+
+    def add(self, key: Hashable, image: pygame.Surface) -> None:
+        """
+        Add an image to be packed.
+
+        Args:
+            key (Hashable): The name the image is looked up by.
+            image (pygame.Surface): The image.
+        """
+        self.images[key] = image
+
+    def pack(self, table: dict | list, name: Hashable) -> None:
+        """
+        Add every image of a table to be packed, and replace them with their packed version once built.
+
+        Args:
+            table (dict | list): A dict or a list of images, the images of an animation for example.
+            name (Hashable): The name of the table, the images are looked up by (name, key or index).
+        """
+        for key, image in (table.items() if isinstance(table, dict) else enumerate(table)):
+            self.add((name, key), image)
+        self.tables.append((table, name))
+
+    def build(self) -> None:
+        """Pack the added images into sheets and replace them in their tables."""
+        # The first key of every image, the images are told apart by identity
+        firstKeys: dict[int, Hashable] = {}
+        for key, image in self.images.items():
+            firstKeys.setdefault(id(image), key)
+        for hasAlpha in (False, True):
+            images: list[tuple[Hashable, pygame.Surface]] = sorted(
+                ((key, self.images[key]) for key in firstKeys.values() if bool(self.images[key].get_flags() & pygame.SRCALPHA) == hasAlpha),
+                key = lambda item: (item[1].get_height(), item[1].get_width()), reverse = True
+            )
+            if images:
+                self.buildSheets(images, hasAlpha)
+        for key, image in self.images.items():
+            firstKey: Hashable = firstKeys[id(image)]
+            if firstKey != key:
+                self.regions[key] = self.regions[firstKey]
+                self.subsurfaces[key] = self.subsurfaces[firstKey]
+        self.images = {}
+
+        for table, name in self.tables:
+            for key in (list(table) if isinstance(table, dict) else range(len(table))):
+                table[key] = self.subsurfaces[(name, key)]
+        self.tables = []
+
+    def buildSheets(self, images: list[tuple[Hashable, pygame.Surface]], hasAlpha: bool) -> None:
+        """
+        Pack images of the same kind into rows of new sheets, tallest first.
+
+        Args:
+            images (list[tuple[Hashable, pygame.Surface]]): The keys and images, sorted by height.
+            hasAlpha (bool): Whether the images have per-pixel alpha.
+        """
+        placed: list[tuple[Hashable, pygame.Surface, int, pygame.Rect]] = []
+        sheetSizes: list[list[int]] = []
+        x: int = self.sheetSize
+        y: int = 0
+        rowHeight: int = 0
+        for key, image in images:
+            width, height = image.get_size()
+            if x + width > self.sheetSize:
+                # Next row
+                x = 0
+                y += rowHeight
+                rowHeight = height
+            if not sheetSizes or y + height > self.sheetSize:
+                # Next sheet, images larger than a sheet get their own
+                sheetSizes.append([0, 0])
+                x = 0
+                y = 0
+                rowHeight = height
+            placed.append((key, image, len(self.sheets) + len(sheetSizes) - 1, pygame.Rect(x, y, width, height)))
+            sheetSizes[-1][0] = max(sheetSizes[-1][0], x + width)
+            sheetSizes[-1][1] = max(sheetSizes[-1][1], y + height)
+            x += width
+
+        first: int = len(self.sheets)
+        for size in sheetSizes:
+            sheet: pygame.Surface = pygame.Surface(size, pygame.SRCALPHA if hasAlpha else 0, 32 if hasAlpha else 24)
+            sheet.fill((0, 0, 0, 0) if hasAlpha else TRANSPARENT_COLOR)
+            self.sheets.append(sheet)
+
+        for key, image, index, rect in placed:
+            if hasAlpha:
+                # Copies the pixels as they are, blending them onto the empty sheet would darken the translucent ones
+                self.sheets[index].blit(image, rect, special_flags = pygame.BLEND_RGBA_MAX)
+            else:
+                self.sheets[index].blit(image, rect)
+
+        for index in range(first, len(self.sheets)):
+            if pygame.display.get_surface() is not None:
+                self.sheets[index] = self.sheets[index].convert_alpha() if hasAlpha else self.sheets[index].convert()
+            # The colorkey is kept on images with alpha too, their pixels of that color were never drawn
+            self.sheets[index].set_colorkey(TRANSPARENT_COLOR)
+
+        for key, image, index, rect in placed:
+            self.regions[key] = (index, rect)
+            self.subsurfaces[key] = self.sheets[index].subsurface(rect)
+            # Only the subsurfaces are RLE accelerated, encoding a sheet could free the pixels they point into
+            if pygame.display.get_surface() is not None:
+                self.subsurfaces[key].set_colorkey(TRANSPARENT_COLOR, pygame.RLEACCEL)
+
+    def get(self, key: Hashable) -> pygame.Surface:
+        """Return a packed image, as a subsurface of its sheet."""
+        return self.subsurfaces[key]
+
+    def area(self, key: Hashable) -> tuple[pygame.Surface, pygame.Rect]:
+        """Return the sheet and the area of a packed image, for blitting straight from the sheet."""
+        index, rect = self.regions[key]
+        return self.sheets[index], rect
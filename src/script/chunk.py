@@ -0,0 +1,134 @@
+from array import array
+
+from src.script.loader import FIX_STGS
+
+CHUNK_SIZE: int = FIX_STGS["chunkSize"]
+CHUNK_AREA: int = CHUNK_SIZE * CHUNK_SIZE
+
+# Block id 0 is reserved for "no tile"
+# Every other block name gets the next free id the first time it is seen
+BLOCK_NAMES: list[str] = [""]
+BLOCK_IDS: dict[str, int] = {"": 0}
+
+def blockId(block: str) -> int:
+    """
+    Get the numeric id of a block name, registering it if it is new.
+
+    Args:
+        block (str): The name of the block.
+
+    Returns:
+        int: The id used inside the chunk arrays.
+    """
+    if block not in BLOCK_IDS:
+        BLOCK_IDS[block] = len(BLOCK_NAMES)
+        BLOCK_NAMES.append(block)
+    return BLOCK_IDS[block]
+
+def blockName(id: int) -> str:
+    """Get the name of a block from its numeric id."""
+    return BLOCK_NAMES[id]
+
+def chunkPosOf(pos: tuple[int]) -> tuple[int]:
+    """Get the position of the chunk containing the given tile position."""
+    return (pos[0] // CHUNK_SIZE, pos[1] // CHUNK_SIZE)
+
+def localIndexOf(pos: tuple[int]) -> int:
+    """Get the index inside its chunk's arrays of the given tile position."""
+    return (pos[1] % CHUNK_SIZE) * CHUNK_SIZE + (pos[0] % CHUNK_SIZE)
+
+class Chunk:
+    """
+    A square piece of the tilemap stored in compact typed arrays.
+
+    Attributes:
+        pos (tuple[int]): The position of the chunk in chunk coordinates.
+        blocks (array): Block ids, row by row. 0 means there is no tile.
+        variants (array): Variants, row by row.
+        durability (dict[int, int]): Durability of damaged tiles only, keyed by local index.
+        count (int): The number of tiles in the chunk.
+    """
+    __slots__ = ("pos", "blocks", "variants", "durability", "count")
+
+    def __init__(self, pos: tuple[int], blocks: array | None = None, variants: array | None = None, durability: dict[int, int] | None = None, count: int | None = None) -> None:
+        """
+        Initialize a Chunk object.
+
+        Args:
+            pos (tuple[int]): The position of the chunk in chunk coordinates.
+            blocks (array | None, optional): Block ids to use. Defaults to an empty chunk.
+            variants (array | None, optional): Variants to use. Defaults to all 0.
+            durability (dict[int, int] | None, optional): Durability of damaged tiles. Defaults to none.
+            count (int | None, optional): The number of tiles in the blocks, if the caller already knows it. Defaults to counting them.
+        """
+        self.pos: tuple[int] = pos
+        self.blocks: array = blocks if blocks is not None else array("H", bytes(2 * CHUNK_AREA))
+        self.variants: array = variants if variants is not None else array("B", bytes(CHUNK_AREA))
+        self.durability: dict[int, int] = durability if durability is not None else {}
+        self.count: int = count if count is not None else CHUNK_AREA - self.blocks.count(0)
+
+    def getTile(self, index: int) -> dict[str, str | int] | None:
+        """
+        Get the tile at the given local index.
+
+        Args:
+            index (int): The local index of the tile.
+
+        Returns:
+            dict[str, str | int] | None: A new tile dictionary, or None if there is no tile.
+        """
+        id: int = self.blocks[index]
+        if not id:
+            return None
+        tile: dict[str, str | int] = {"block": BLOCK_NAMES[id], "variant": self.variants[index]}
+        if index in self.durability:
+            tile["durability"] = self.durability[index]
+        return tile
+
+    def setTile(self, index: int, tile: dict[str, str | int]) -> None:
+        """
+        Set the tile at the given local index.
+
+        Args:
+            index (int): The local index of the tile.
+            tile (dict[str, str | int]): The tile information containing block, variant and optionally durability.
+        """
+        if not self.blocks[index]:
+            self.count += 1
+        self.blocks[index] = blockId(tile["block"])
+        self.variants[index] = tile["variant"]
+        if "durability" in tile:
+            self.durability[index] = tile["durability"]
+        else:
+            self.durability.pop(index, None)
+
+    def clearTile(self, index: int) -> None:
+        """
+        Remove the tile at the given local index.
+
+        Args:
+            index (int): The local index of the tile.
+        """
+        if self.blocks[index]:
+            self.count -= 1
+        self.blocks[index] = 0
+        self.variants[index] = 0
+        self.durability.pop(index, None)
+
+    def tiles(self) -> list[tuple[tuple[int], int]]:
+        """
+        Get every tile of the chunk.
+
+        Returns:
+            list[tuple[tuple[int], int]]: A list of (world tile position, local index) pairs.
+        """
+        originX: int = self.pos[0] * CHUNK_SIZE
+        originY: int = self.pos[1] * CHUNK_SIZE
+        return [
+            ((originX + index % CHUNK_SIZE, originY + index // CHUNK_SIZE), index)
+            for index, id in enumerate(self.blocks) if id
+        ]
+
+    def copy(self) -> "Chunk":
+        """Create an independent copy of the chunk."""
+        return Chunk(self.pos, array("H", self.blocks), array("B", self.variants), dict(self.durability), self.count)
@@ -0,0 +1,139 @@
+import queue
+import threading
+
+from src.script.log import logMSG, logError, logSuccess
+from src.script.loader import STGS
+from src.script.chunk import Chunk, CHUNK_SIZE
+from src.script.tilemap import Tilemap
+
+class ChunkStreamer:
+    """
+    Keeps the chunks around the camera in memory, reading them on a background thread.
+
+    Chunks inside the load radius are requested ahead of time, chunks outside the unload
+    radius are dropped from memory, and handed to the map saver of the tilemap if they changed.
+
+    Attributes:
+        tilemap (Tilemap): The tilemap whose chunks are streamed.
+        loadRadius (int): Chunks this far from the visible ones are loaded.
+        unloadRadius (int): Chunks further than this from the visible ones are unloaded.
+        stats (dict[str, int]): Counters of loads, evictions, writes and stalls.
+    """
+    def __init__(self, tilemap: Tilemap, loadRadius: int = STGS["chunkLoadRadius"], unloadRadius: int = STGS["chunkUnloadRadius"]) -> None:
+        """
+        Initialize a ChunkStreamer object and start its background thread.
+
+        The tilemap must have a map saver, changed chunks are written back through it.
+
+        Args:
+            tilemap (Tilemap): The tilemap whose chunks are streamed.
+            loadRadius (int, optional): Chunks this far from the visible ones are loaded. Defaults to the settings.
+            unloadRadius (int, optional): Chunks further than this from the visible ones are unloaded. Defaults to the settings.
+        """
+        assert unloadRadius > loadRadius, "Chunks must be unloaded further than they are loaded"
+        assert tilemap.saver is not None, "Changed chunks are written back through the map saver"
+
+        self.tilemap: Tilemap = tilemap
+        self.loadRadius: int = loadRadius
+        self.unloadRadius: int = unloadRadius
+        self.stats: dict[str, int] = {"loads": 0, "evictions": 0, "writes": 0, "stalls": 0}
+
+        # Main thread -> worker: chunkPos to load or None to stop
+        self.jobs: queue.Queue = queue.Queue()
+        # Worker -> main thread: (chunkPos, chunk)
+        self.loaded: queue.Queue = queue.Queue()
+        self.requested: set[tuple[int]] = set()
+
+        self.tilemap.streamer = self
+        self.thread: threading.Thread = threading.Thread(target = self.work, name = "ChunkStreamer", daemon = True)
+        self.thread.start()
+
+    def work(self) -> None:
+        """Read the chunks the main thread asks for until it is told to stop."""
+        while True:
+            chunkPos: tuple[int] | None = self.jobs.get()
+            if chunkPos is None:
+                return
+
+            try:
+                self.loaded.put((chunkPos, self.tilemap.region.readChunk(chunkPos)))
+            except Exception as e:
+                logError(f"Chunk streaming failed to load {chunkPos}: {e}")
+                # Handed back empty, so the chunk can be requested again
+                self.loaded.put((chunkPos, None))
+
+    def fetch(self, chunkPos: tuple[int]) -> Chunk | None:
+        """
+        Get a chunk that is not in memory right now, blocking until it is read.
+
+        Args:
+            chunkPos (tuple[int]): The position of the chunk in chunk coordinates.
+
+        Returns:
+            Chunk | None: The chunk, or None if the map file does not contain it.
+        """
+        if self.tilemap.region is None or not self.tilemap.region.has(chunkPos):
+            return None
+        self.stats["stalls"] += 1
+        return self.tilemap.region.readChunk(chunkPos)
+
+    def update(self, scroll: tuple[float], windowSize: tuple[int]) -> None:
+        """
+        Install finished loads, request chunks near the camera and unload far ones.
+
+        Args:
+            scroll (tuple[float]): The camera offset.
+            windowSize (tuple[int]): The size of the window in pixels.
+        """
+        if self.tilemap.region is None:
+            return
+
+        while not self.loaded.empty():
+            chunkPos, chunk = self.loaded.get()
+            self.requested.discard(chunkPos)
+            # The chunk may have been read already by a stalled access
+            if chunk is not None and chunkPos not in self.tilemap.chunks:
+                self.tilemap.addChunk(chunk)
+                self.stats["loads"] += 1
+
+        chunkPixels: int = CHUNK_SIZE * STGS["tileSize"]
+        left: int = int(scroll[0] // chunkPixels)
+        top: int = int(scroll[1] // chunkPixels)
+        right: int = int((scroll[0] + windowSize[0]) // chunkPixels)
+        bottom: int = int((scroll[1] + windowSize[1]) // chunkPixels)
+
+        for chunkX in range(left - self.loadRadius, right + self.loadRadius + 1):
+            for chunkY in range(top - self.loadRadius, bottom + self.loadRadius + 1):
+                chunkPos: tuple[int] = (chunkX, chunkY)
+                if chunkPos in self.tilemap.chunks or chunkPos in self.requested:
+                    continue
+
+                unwritten: Chunk | None = self.tilemap.saver.pendingChunk(chunkPos)
+                if unwritten is not None:
+                    self.tilemap.addChunk(unwritten)
+                elif self.tilemap.region.has(chunkPos):
+                    self.requested.add(chunkPos)
+                    self.jobs.put(chunkPos)
+
+        evicted: list[Chunk] = []
+        for chunkPos in list(self.tilemap.chunks):
+            if left - self.unloadRadius <= chunkPos[0] <= right + self.unloadRadius and top - self.unloadRadius <= chunkPos[1] <= bottom + self.unloadRadius:
+                continue
+
+            chunk: Chunk = self.tilemap.removeChunk(chunkPos)
+            self.stats["evictions"] += 1
+            if chunkPos in self.tilemap.dirtyChunks:
+                self.tilemap.dirtyChunks.discard(chunkPos)
+                evicted.append(chunk)
+
+        if evicted:
+            # Dropped from memory, the chunks can be written without a copy
+            self.tilemap.saver.write(evicted)
+            self.stats["writes"] += len(evicted)
+
+    def close(self) -> None:
+        """Stop the background thread, the changed chunks still in memory are left to the map saver."""
+        self.jobs.put(None)
+        self.thread.join()
+        self.tilemap.streamer = None
+        logMSG(f"Chunk streaming stopped: {self.stats}")
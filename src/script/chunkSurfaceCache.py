@@ -0,0 +1,124 @@
+import pygame
+
+from collections import OrderedDict
+
+from src.script.loader import NAME_SPACE, STGS, TRANSPARENT_COLOR
+from src.script.chunk import Chunk, CHUNK_SIZE, BLOCK_NAMES, chunkPosOf, localIndexOf
+from src.script.profiler import PROFILER
+from src.script.tileEvents import TileChange
+
+class ChunkSurface:
+    """
+    A chunk baked into a single surface.
+
+    Attributes:
+        surface (pygame.Surface): The tiles of the chunk, transparent where there is no tile.
+        dirty (set[int]): Local indices of tiles that changed since they were drawn.
+    """
+    __slots__ = ("surface", "dirty")
+
+    def __init__(self, surface: pygame.Surface) -> None:
+        self.surface: pygame.Surface = surface
+        self.dirty: set[int] = set()
+
+class ChunkSurfaceCache:
+    """
+    A bounded cache of baked chunk surfaces, evicting the least recently rendered chunk first.
+
+    Attributes:
+        assets (dict[str, dict[str | int, pygame.Surface]]): The "tile" and "tileBreakage" assets of the tilemap.
+        capacity (int): The maximum number of chunk surfaces kept.
+        entries (OrderedDict[tuple[int], ChunkSurface]): The cached surfaces, least recently used first.
+    """
+    def __init__(self, assets: dict[str, dict[str | int, pygame.Surface]], capacity: int = STGS["chunkSurfaceCacheSize"]) -> None:
+        """
+        Initialize a ChunkSurfaceCache object.
+
+        Args:
+            assets (dict[str, dict[str | int, pygame.Surface]]): The "tile" and "tileBreakage" assets of the tilemap.
+            capacity (int, optional): The maximum number of chunk surfaces kept. Defaults to the settings.
+        """
+        self.assets: dict[str, dict[str | int, pygame.Surface]] = assets
+        self.capacity: int = capacity
+        self.entries: OrderedDict[tuple[int], ChunkSurface] = OrderedDict()
+
+    def clear(self) -> None:
+        """Drop every cached surface."""
+        self.entries.clear()
+
+    def invalidateTile(self, pos: tuple[int]) -> None:
+        """
+        Mark a tile to be redrawn the next time its chunk is rendered.
+
+        Args:
+            pos (tuple[int]): The position of the tile.
+        """
+        entry: ChunkSurface | None = self.entries.get(chunkPosOf(pos))
+        if entry is not None:
+            entry.dirty.add(localIndexOf(pos))
+
+    def onTileChanges(self, changes: list[TileChange]) -> None:
+        """Mark the changed tiles to be redrawn, subscribed to the tile events of the tilemap."""
+        for change in changes:
+            self.invalidateTile(change.pos)
+
+    def drawTiles(self, surface: pygame.Surface, chunk: Chunk, indices: set[int]) -> None:
+        """
+        Draw tiles and their breakage onto a chunk surface, with a single blits call.
+
+        Args:
+            surface (pygame.Surface): The surface of the chunk.
+            chunk (Chunk): The chunk the tiles are in.
+            indices (set[int]): The local indices of the tiles.
+        """
+        tileSize: int = STGS["tileSize"]
+        tiles: dict[str, dict[int, pygame.Surface]] = self.assets["tile"]
+        breakage: dict[int, pygame.Surface] = self.assets["tileBreakage"]
+        sequence: list[tuple[pygame.Surface, tuple[int]]] = []
+        for index in indices:
+            location: tuple[int] = (index % CHUNK_SIZE * tileSize, index // CHUNK_SIZE * tileSize)
+            surface.fill(TRANSPARENT_COLOR, (location[0], location[1], tileSize, tileSize))
+            if not chunk.blocks[index]:
+                continue
+
+            block: str = BLOCK_NAMES[chunk.blocks[index]]
+            sequence.append((tiles[block][chunk.variants[index]], location))
+
+            if index in chunk.durability:
+                maxDurability: int = NAME_SPACE["durabilityOfTile"][block if block in NAME_SPACE["durabilityOfTile"] else "_"]
+                sequence.append((breakage[int((len(breakage) - 1) * (1 - (chunk.durability[index] / maxDurability)))], location))
+
+        # Tiles do not overlap, so every fill can come before the blits
+        surface.blits(sequence, doreturn = False)
+
+    def get(self, chunk: Chunk) -> pygame.Surface:
+        """
+        Get the surface of a chunk, baking it or redrawing its changed tiles if needed.
+
+        Args:
+            chunk (Chunk): The chunk to get the surface of.
+
+        Returns:
+            pygame.Surface: The surface of the whole chunk.
+        """
+        entry: ChunkSurface | None = self.entries.get(chunk.pos)
+
+        if entry is None:
+            surface: pygame.Surface = pygame.Surface((CHUNK_SIZE * STGS["tileSize"], CHUNK_SIZE * STGS["tileSize"]))
+            surface.fill(TRANSPARENT_COLOR)
+            surface.set_colorkey(TRANSPARENT_COLOR)
+            entry = ChunkSurface(surface)
+            entry.dirty = {index for index, id in enumerate(chunk.blocks) if id}
+
+            self.entries[chunk.pos] = entry
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last = False)
+        else:
+            self.entries.move_to_end(chunk.pos)
+
+        self.drawTiles(entry.surface, chunk, entry.dirty)
+        if PROFILER.enabled:
+            PROFILER.count("tilesDrawn", len(entry.dirty))
+        entry.dirty.clear()
+
+        return entry.surface
@@ -30,16 +30,35 @@ class Cloud:
         """Update the position of the cloud based on its speed."""
         self.pos[0] += self.speed * windSpeed
 
-    def render(self, surface: pygame.Surface, offset: tuple[float] = (0, 0)) -> None:
+    def renderPos(self, surface: pygame.Surface, offset: tuple[float] = (0, 0)) -> tuple[int]:
+        """
+        Get the position the cloud is drawn at on the given surface with optional offset.
+
+        Args:
+            surface (pygame.Surface): The pygame surface the cloud is rendered on.
+            offset (tuple[float], optional): The offset to apply to the cloud's position. Defaults to (0, 0).
+
+        Returns:
+            tuple[int]: The top left corner of the cloud on the surface.
+        """
+        renderPos: tuple[float] = (self.pos[0] - offset[0] * self.depth, self.pos[1] - offset[1] * self.depth)
+        return (
+            int(renderPos[0] % (surface.get_width() + self.img.get_width()) - self.img.get_width()),
+            int(renderPos[1] % (surface.get_height() + self.img.get_height()) - self.img.get_height())
+        )
+
+    def render(self, surface: pygame.Surface, offset: tuple[float] = (0, 0)) -> pygame.Rect:
         """
         Render the cloud on the given surface with optional offset.
 
         Args:
             surface (pygame.Surface): The pygame surface to render the cloud on.
             offset (tuple[float], optional): The offset to apply to the cloud's position. Defaults to (0, 0).
+
+        Returns:
+            pygame.Rect: The area of the surface that changed.
         """
-        renderPos: tuple[float] = (self.pos[0] - offset[0] * self.depth, self.pos[1] - offset[1] * self.depth)
-        surface.blit(self.img, (renderPos[0] % (surface.get_width() + self.img.get_width()) - self.img.get_width(), renderPos[1] % (surface.get_height() + self.img.get_height()) - self.img.get_height()))
+        return surface.blit(self.img, self.renderPos(surface, offset = offset))
 
 class Clouds:
     """
@@ -72,13 +91,15 @@ class Clouds:
         for cloud in self.clouds:
             cloud.update(windSpeed = windSpeed)
 
-    def render(self, surface: pygame.Surface, offset: tuple[float] = (0, 0)) -> None:
+    def render(self, surface: pygame.Surface, offset: tuple[float] = (0, 0)) -> list[pygame.Rect]:
         """
         Render all clouds on the given surface with optional offset.
 
         Args:
             surface (pygame.Surface): The pygame surface to render the clouds on.
             offset (tuple[float], optional): The offset to apply to the clouds' positions. Defaults to (0, 0).
+
+        Returns:
+            list[pygame.Rect]: The areas of the surface that changed, one per cloud.
         """
-        for cloud in self.clouds:
-            cloud.render(surface, offset = offset)
+        return [cloud.render(surface, offset = offset) for cloud in self.clouds]
@@ -0,0 +1,118 @@
+import math
+
+from dataclasses import dataclass, field
+
+from src.script.loader import STGS
+from src.script.tilemap import Tilemap
+
+# The side of the moving box that touched a tile, by contact normal
+NORMAL_SIDES: dict[tuple[int], str] = {(-1, 0): "right", (1, 0): "left", (0, -1): "down", (0, 1): "up"}
+# Edges closer than this to a tile border, in tiles, count as lying on it, so rounding errors can not let a resting box sink into the ground
+EPSILON: float = 1e-6
+
+@dataclass(slots = True)
+class Sweep:
+    """
+    The result of moving a box through the solid tiles of a tilemap.
+
+    Attributes:
+        movement (list[float]): The movement that was possible, per axis.
+        time (float): The fraction of the wanted movement done before the first contact, 1 if nothing was hit.
+        normals (list[tuple[int]]): The normals of the tile faces that stopped the box, pointing at the box.
+    """
+    movement: list[float]
+    time: float = 1
+    normals: list[tuple[int]] = field(default_factory = list)
+
+    def collisions(self, collisions: dict[str, bool] | None = None) -> dict[str, bool]:
+        """
+        Return which sides of the box touched a tile, in the format the mobs keep them.
+
+        Args:
+            collisions (dict[str, bool] | None, optional): A dictionary to fill in instead of making a new one. Defaults to None.
+
+        Returns:
+            dict[str, bool]: The touching sides, by side name.
+        """
+        if collisions is None:
+            collisions = {}
+        for side in NORMAL_SIDES.values():
+            collisions[side] = False
+        for normal in self.normals:
+            collisions[NORMAL_SIDES[normal]] = True
+        return collisions
+
+def sweepAxis(tilemap: Tilemap, box: list[float], axis: int, distance: float) -> float:
+    """
+    Move a box along one axis until it touches a solid tile.
+
+    Every tile row or column the leading edge of the box passes is checked,
+    so the box can not skip a tile however far it moves. Tiles the box
+    already overlaps are ignored, so it can always leave them.
+
+    Args:
+        tilemap (Tilemap): The tilemap to collide with.
+        box (list[float]): The left, top, width and height of the box.
+        axis (int): 0 to move horizontally, 1 to move vertically.
+        distance (float): The wanted movement along the axis.
+
+    Returns:
+        float: The possible movement along the axis.
+    """
+    tileSize: int = STGS["tileSize"]
+    other: int = 1 - axis
+    # The tiles the box spans across the motion
+    first: int = math.floor(box[other] / tileSize + EPSILON)
+    last: int = math.ceil((box[other] + box[other + 2]) / tileSize - EPSILON) - 1
+
+    if distance > 0:
+        leading: float = box[axis] + box[axis + 2]
+        start: int = math.ceil(leading / tileSize - EPSILON)
+        end: int = math.ceil((leading + distance) / tileSize - EPSILON) - 1
+        if end < start:
+            return distance
+        cells: list[tuple[int]] = tilemap.solidCells(start, first, end, last) if axis == 0 else tilemap.solidCells(first, start, last, end)
+        if not cells:
+            return distance
+        return min(cell[axis] for cell in cells) * tileSize - leading
+
+    leading: float = box[axis]
+    start: int = math.floor(leading / tileSize + EPSILON) - 1
+    end: int = math.floor((leading + distance) / tileSize + EPSILON)
+    if end > start:
+        return distance
+    cells: list[tuple[int]] = tilemap.solidCells(end, first, start, last) if axis == 0 else tilemap.solidCells(first, end, last, start)
+    if not cells:
+        return distance
+    return (max(cell[axis] for cell in cells) + 1) * tileSize - leading
+
+def sweepBox(tilemap: Tilemap, box: tuple[float], movement: tuple[float]) -> Sweep:
+    """
+    Move a box through the solid tiles of a tilemap, horizontally first, then vertically.
+
+    A box stopped on one axis keeps its movement on the other, so it slides along walls and floors.
+
+    Args:
+        tilemap (Tilemap): The tilemap to collide with.
+        box (tuple[float]): The left, top, width and height of the box.
+        movement (tuple[float]): The wanted movement of the box.
+
+    Returns:
+        Sweep: The possible movement, the time of the first impact and the contact normals.
+    """
+    box: list[float] = list(box)
+    sweep: Sweep = Sweep([0, 0])
+    for axis in (0, 1):
+        distance: float = movement[axis]
+        if distance == 0:
+            continue
+
+        moved: float = sweepAxis(tilemap, box, axis, distance)
+        if moved != distance:
+            sweep.time = min(sweep.time, max(moved / distance, 0))
+            normal: list[int] = [0, 0]
+            normal[axis] = -1 if distance > 0 else 1
+            sweep.normals.append(tuple(normal))
+        sweep.movement[axis] = moved
+        box[axis] += moved
+    return sweep
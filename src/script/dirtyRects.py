@@ -0,0 +1,104 @@
+import pygame
+
+from src.script.loader import STGS, TRANSPARENT_COLOR
+from src.script.profiler import PROFILER
+
+class DirtyRects:
+    """
+    Tracks which parts of the window changed, so only those are redrawn and presented.
+
+    A frame is split into a background layer (everything that only changes with the camera,
+    the map or the state) and sprites drawn on top of it. While the background stays the same,
+    only the places sprites covered last frame are restored, and only those and the new sprites are presented.
+    Sprites can also be drawn behind the foreground, the part of the background that is in front of them.
+
+    Attributes:
+        window (pygame.Surface): The display surface.
+        enabled (bool): Flag indicating whether partial updates are used at all.
+        background (pygame.Surface): The background layer, the window itself when disabled.
+        foreground (pygame.Surface): The part of the background drawn over sprites behind it, transparent where it has TRANSPARENT_COLOR.
+        backgroundKey: Describes what is on the background layer, the layer is redrawn when it changes.
+        full (bool): Flag indicating whether the whole window has to be presented this frame.
+        rects (list[pygame.Rect]): The sprite rects of this frame.
+        previous (list[pygame.Rect]): The sprite rects of last frame.
+    """
+    def __init__(self, window: pygame.Surface, enabled: bool = STGS["dirtyRectRendering"]) -> None:
+        """
+        Initialize a DirtyRects object.
+
+        Args:
+            window (pygame.Surface): The display surface.
+            enabled (bool, optional): Flag indicating whether partial updates are used at all. Defaults to the settings.
+        """
+        self.window: pygame.Surface = window
+        self.enabled: bool = enabled
+        self.background: pygame.Surface = pygame.Surface(window.get_size()) if enabled else window
+        self.foreground: pygame.Surface = pygame.Surface(window.get_size())
+        self.foreground.set_colorkey(TRANSPARENT_COLOR)
+        self.backgroundKey = None
+        self.full: bool = True
+        self.rects: list[pygame.Rect] = []
+        self.previous: list[pygame.Rect] = []
+
+    def invalidate(self) -> None:
+        """Force the next frame to redraw and present the whole window."""
+        self.backgroundKey = None
+
+    def beginFrame(self, backgroundKey) -> bool:
+        """
+        Start a frame, restoring the background where sprites were last frame.
+
+        Args:
+            backgroundKey: Describes what the background layer should show this frame.
+
+        Returns:
+            bool: True if the background layer has to be redrawn, then passed on with commitBackground.
+        """
+        if not self.enabled or backgroundKey != self.backgroundKey:
+            self.backgroundKey = backgroundKey
+            self.full = True
+            return True
+
+        for rect in self.previous:
+            self.window.blit(self.background, rect, rect)
+        return False
+
+    def commitBackground(self) -> None:
+        """Put the freshly drawn background layer onto the window."""
+        if self.enabled:
+            self.window.blit(self.background, (0, 0))
+
+    def add(self, rect: pygame.Rect | None) -> None:
+        """
+        Report a rect a sprite was drawn to this frame.
+
+        Args:
+            rect (pygame.Rect | None): The rect that changed, None is ignored.
+        """
+        if rect is not None and rect.width and rect.height:
+            self.rects.append(rect)
+
+    def addBehind(self, rect: pygame.Rect | None) -> None:
+        """
+        Report a rect a sprite behind the foreground was drawn to this frame, and cover it with the foreground.
+
+        Args:
+            rect (pygame.Rect | None): The rect that changed, None is ignored.
+        """
+        if rect is not None and rect.width and rect.height:
+            self.window.blit(self.foreground, rect, rect)
+            self.rects.append(rect)
+
+    def present(self) -> None:
+        """Show the changed parts of the window and start tracking the next frame."""
+        if self.full:
+            pygame.display.update()
+        elif self.rects or self.previous:
+            pygame.display.update(self.previous + self.rects)
+
+        if PROFILER.enabled:
+            PROFILER.count("presentedRects", 1 if self.full else len(self.previous) + len(self.rects))
+
+        self.previous = self.rects
+        self.rects = []
+        self.full = False
@@ -0,0 +1,194 @@
+import os
+import struct
+import zlib
+
+from src.script.log import logError
+
+# Layout of a journal file, one batch per commit:
+#     batch header | length and CRC32 of the records
+#     records      | palette records, which name a block, and tile records, which set a tile
+# A batch that was cut off by a crash fails its checksum, and it and everything after it is ignored.
+BATCH_HEADER_FORMAT: str = "<II"
+BATCH_HEADER_SIZE: int = struct.calcsize(BATCH_HEADER_FORMAT)
+PALETTE_RECORD: bytes = b"P"
+TILE_RECORD: bytes = b"T"
+# x, y, palette index of the block (0 for no tile), variant and durability (-1 for none)
+TILE_RECORD_FORMAT: str = "<iiHBi"
+TILE_RECORD_SIZE: int = struct.calcsize(TILE_RECORD_FORMAT)
+
+class EditJournal:
+    """
+    An append-only log of the tile edits made since the last save of a map.
+
+    Edits are recorded in memory at almost no cost and written and fsynced in batches,
+    so a crash loses at most the last batch instead of everything since the last save.
+    The journal is split into generations. A save starts a new one, and the older ones
+    are deleted once the save is on disk, as the map file holds their edits by then.
+
+    Attributes:
+        directory (str): The folder of the map the journal belongs to.
+        generation (int): The number of the generation new edits are recorded into.
+        generations (list[int]): The generations that may have a file, oldest first.
+        palette (dict[str, int]): The palette index of every block named in the current generation.
+        buffer (list[bytes]): The records not handed over to be written yet.
+        file (BufferedWriter | None): The open file of the generation last written to.
+        fileGeneration (int): The generation of the open file.
+    """
+    def __init__(self, directory: str) -> None:
+        """
+        Initialize an EditJournal object, continuing after the generations already on disk.
+
+        Args:
+            directory (str): The folder of the map the journal belongs to.
+        """
+        self.directory: str = directory
+        self.generations: list[int] = sorted(
+            int(name.rsplit(".", 1)[1]) for name in os.listdir(directory)
+            if name.startswith("tilemap.journal.") and name.rsplit(".", 1)[1].isdigit()
+        )
+        self.generation: int = self.generations[-1] + 1 if self.generations else 0
+        self.palette: dict[str, int] = {}
+        self.buffer: list[bytes] = []
+        self.file = None
+        self.fileGeneration: int = -1
+
+    def pathOf(self, generation: int) -> str:
+        """Return the path of the file of a generation."""
+        return f"{self.directory}/tilemap.journal.{generation}"
+
+    def record(self, pos: tuple[int], tile: dict[str, str | int] | None) -> None:
+        """
+        Record the new state of a tile.
+
+        Args:
+            pos (tuple[int]): The position of the tile.
+            tile (dict[str, str | int] | None): The tile after the edit, None if it was removed.
+        """
+        if self.generation not in self.generations:
+            self.generations.append(self.generation)
+        if tile is None:
+            self.buffer.append(TILE_RECORD + struct.pack(TILE_RECORD_FORMAT, pos[0], pos[1], 0, 0, -1))
+            return
+
+        index: int | None = self.palette.get(tile["block"])
+        if index is None:
+            index = self.palette[tile["block"]] = len(self.palette) + 1
+            encoded: bytes = tile["block"].encode("utf-8")
+            self.buffer.append(PALETTE_RECORD + struct.pack("<B", len(encoded)) + encoded)
+        self.buffer.append(TILE_RECORD + struct.pack(TILE_RECORD_FORMAT, pos[0], pos[1], index, tile["variant"], tile.get("durability", -1)))
+
+    def takeBatch(self) -> bytes:
+        """Take the recorded edits out of memory as one batch."""
+        records: bytes = b"".join(self.buffer)
+        self.buffer = []
+        return records
+
+    def writeBatch(self, generation: int, records: bytes) -> None:
+        """
+        Append a batch to the file of a generation and wait until it is on disk.
+
+        Args:
+            generation (int): The generation the records were made in.
+            records (bytes): The records of the batch.
+        """
+        if not records:
+            return
+        if self.fileGeneration != generation:
+            self.closeFile()
+            self.file = open(self.pathOf(generation), mode = "ab")
+            self.fileGeneration = generation
+        self.file.write(struct.pack(BATCH_HEADER_FORMAT, len(records), zlib.crc32(records)) + records)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def commit(self) -> None:
+        """Write the recorded edits right away."""
+        self.writeBatch(self.generation, self.takeBatch())
+
+    def rotate(self) -> list[int]:
+        """
+        Start a new generation, call it when the changed chunks are handed over to be saved.
+
+        Returns:
+            list[int]: The generations whose edits are all in the save.
+        """
+        finished: list[int] = list(self.generations)
+        if self.generation in self.generations:
+            self.generation += 1
+            self.palette = {}
+        self.generations = []
+        return finished
+
+    def discard(self, generations: list[int]) -> None:
+        """
+        Delete the files of generations, call it once the save holding their edits is on disk.
+
+        Args:
+            generations (list[int]): The generations to delete.
+        """
+        for generation in generations:
+            if generation == self.fileGeneration:
+                self.closeFile()
+            try:
+                os.remove(self.pathOf(generation))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        """Forget every edit, for when the whole map was just written."""
+        self.takeBatch()
+        self.discard(self.rotate())
+
+    def replay(self) -> list[tuple[tuple[int], dict[str, str | int] | None]]:
+        """
+        Read the edits of every generation on disk, oldest first.
+
+        Returns:
+            list[tuple[tuple[int], dict[str, str | int] | None]]: The position and new state of every edited tile.
+        """
+        edits: list[tuple[tuple[int], dict[str, str | int] | None]] = []
+        for generation in self.generations:
+            with open(self.pathOf(generation), mode = "rb") as file:
+                data: bytes = file.read()
+
+            palette: list[str] = [""]
+            cursor: int = 0
+            while cursor + BATCH_HEADER_SIZE <= len(data):
+                length, checksum = struct.unpack_from(BATCH_HEADER_FORMAT, data, cursor)
+                records: bytes = data[cursor + BATCH_HEADER_SIZE:cursor + BATCH_HEADER_SIZE + length]
+                if len(records) < length or zlib.crc32(records) != checksum:
+                    logError(f"Ignoring the torn end of \'{self.pathOf(generation)}\' at byte {cursor}")
+                    break
+                cursor += BATCH_HEADER_SIZE + length
+
+                position: int = 0
+                while position < len(records):
+                    kind: bytes = records[position:position + 1]
+                    if kind == PALETTE_RECORD:
+                        size: int = records[position + 1]
+                        palette.append(records[position + 2:position + 2 + size].decode("utf-8"))
+                        position += 2 + size
+                        continue
+
+                    x, y, index, variant, durability = struct.unpack_from(TILE_RECORD_FORMAT, records, position + 1)
+                    position += 1 + TILE_RECORD_SIZE
+                    if not index:
+                        edits.append(((x, y), None))
+                        continue
+                    tile: dict[str, str | int] = {"block": palette[index], "variant": variant}
+                    if durability != -1:
+                        tile["durability"] = durability
+                    edits.append(((x, y), tile))
+
+        return edits
+
+    def closeFile(self) -> None:
+        """Close the open generation file, if any."""
+        if self.file is not None:
+            self.file.close()
+        self.file = None
+        self.fileGeneration = -1
+
+    def close(self) -> None:
+        """Close the journal, the recorded edits that were not written are lost."""
+        self.closeFile()
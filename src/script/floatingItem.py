@@ -1,19 +1,57 @@
 import pygame
 
-from src.script.mathFunc import playerMagnetFunc, getHyp
+from src.script.mathFunc import playerMagnetFunc, getHyp, lerpPos
 from src.script.log import logMSG, logError, logSuccess
 from src.script.loader import STGS, FIX_STGS
 
 from src.script.item import Item
 from src.script.animation import Animation
 from src.script.tilemap import Tilemap
+from src.script.collision import Sweep, sweepBox
 from src.fixData.itemSurface import ITEM_IMAGE
 
 class FloatingItem:
-    def __init__(self, pos: list[float], item: Item) -> None:
+    def __init__(self, pos: list[float], item: Item, bornTick: int = 0) -> None:
         self.pos: list[float] = pos
+        self.previousPos: tuple[float] = tuple(pos)
         self.item: Item = item
         self.velocity: list[float] = [0, 0]
+        # Ages are counted from the tick the item appeared, so sleeping items age without being updated
+        self.bornTick: int = bornTick
+        self.inReach: bool = False
+        self.collisions: dict[str, bool] = {"left" : False, "right" : False, "up" : False, "down" : False}
+
+    def age(self, tick: int) -> int:
+        """Return the number of ticks the item has existed for at a tick."""
+        return tick - self.bornTick
+
+    def merge(self, other: "FloatingItem") -> bool:
+        """
+        Move as much of another floating item's stack into this one as fits.
+
+        Args:
+            other (FloatingItem): The item to take from, it must hold the same kind of item.
+
+        Returns:
+            bool: True if the other item was emptied and should be removed.
+        """
+        moved: int = min(other.item.amount, self.item.maxAmount - self.item.amount)
+        if moved <= 0:
+            return False
+        self.item.amount += moved
+        other.item.amount -= moved
+        # The merged stack lasts as long as its youngest part
+        self.bornTick = max(self.bornTick, other.bornTick)
+        return other.item.amount == 0
+
+    def isAtRest(self) -> bool:
+        """Return whether the item lies still on the ground out of the player's reach, so it may sleep."""
+        return self.collisions["down"] and self.velocity[0] == 0 and self.velocity[1] == 0 and not self.inReach
+
+    def collisionBox(self) -> tuple[float]:
+        """Return the left, top, width and height of the item's hitbox without rounding them."""
+        image: pygame.Surface = ITEM_IMAGE[self.item.id]
+        return (self.pos[0] + image.get_width() * 0.25, self.pos[1] + image.get_height() * 0.25, image.get_width() * 0.5, image.get_height() * 0.5)
 
     def getCollisonRect(self) -> pygame.Rect:
         return pygame.Rect(
@@ -31,36 +69,17 @@ class FloatingItem:
             tilemap (Tilemap): The tilemap the item collides with.
             playerPos (tuple[float], optional)
         """
-        self.collisions: dict[str, bool] = {"left" : False, "right" : False, "up" : False, "down" : False}
-        frameMovement: tuple[float] = (self.velocity[0], self.velocity[1])
-
-        self.pos[0] += frameMovement[0]
-        itemRect: pygame.Rect = self.getCollisonRect()
-        for tileRect in tilemap.physicsRectsAround((int(itemRect.x + itemRect.w * 0.5), int(itemRect.y + itemRect.h * 0.5))):
-            if tileRect.colliderect(itemRect):
-                if frameMovement[0] > 0:
-                    itemRect.right = tileRect.left
-                    self.collisions["right"] = True
-                if frameMovement[0] < 0:
-                    itemRect.left = tileRect.right
-                    self.collisions["left"] = True
-
-                if self.collisions["left"] or self.collisions["right"]:
-                    self.velocity[0] = 0
-
-                self.pos[0] = itemRect.x - ITEM_IMAGE[self.item.id].get_width() * 0.25
-
-        self.pos[1] += frameMovement[1]
-        itemRect: pygame.Rect = self.getCollisonRect()
-        for tileRect in tilemap.physicsRectsAround((int(itemRect.x + itemRect.w * 0.5), int(itemRect.y + itemRect.h * 0.5))):
-            if tileRect.colliderect(itemRect):
-                if frameMovement[1] > 0:
-                    itemRect.bottom = tileRect.top
-                    self.collisions["down"] = True
-                if frameMovement[1] < 0:
-                    itemRect.top = tileRect.bottom
-                    self.collisions["up"] = True
-                self.pos[1] = itemRect.y - ITEM_IMAGE[self.item.id].get_width() * 0.25
+        self.previousPos = tuple(self.pos)
+        box: tuple[float] = self.collisionBox()
+        center: tuple[float] = (box[0] + box[2] * 0.5, box[1] + box[3] * 0.5)
+        self.inReach = getHyp(center[0] - playerPos[0], center[1] - playerPos[1]) <= STGS["tileSize"] * FIX_STGS["reach"]
+
+        sweep: Sweep = sweepBox(tilemap, box, self.velocity)
+        self.pos[0] += sweep.movement[0]
+        self.pos[1] += sweep.movement[1]
+        sweep.collisions(self.collisions)
+        if self.collisions["left"] or self.collisions["right"]:
+            self.velocity[0] = 0
         
         # Slow down the item
         if self.velocity[0] > FIX_STGS["airResistHorizontal"]:
@@ -70,15 +89,13 @@ class FloatingItem:
         else:
             self.velocity[0] = 0
 
-        if getHyp(
-            self.getCollisonRect().centerx - playerPos[0],
-            self.getCollisonRect().centery - playerPos[1]
-        ) <= STGS["tileSize"] * FIX_STGS["reach"]:
+        if self.inReach:
             # The item is in the range of the player
             # So it approaches the player
+            itemCenter: tuple[int] = self.getCollisonRect().center
             appVel: tuple[float] = playerMagnetFunc((
-                (playerPos[0] - self.getCollisonRect().centerx) / STGS["tileSize"] / FIX_STGS["reach"],
-                (playerPos[1] - self.getCollisonRect().centery) / STGS["tileSize"] / FIX_STGS["reach"]
+                (playerPos[0] - itemCenter[0]) / STGS["tileSize"] / FIX_STGS["reach"],
+                (playerPos[1] - itemCenter[1]) / STGS["tileSize"] / FIX_STGS["reach"]
             ))
 
             #####-------#####
@@ -112,5 +129,10 @@ class FloatingItem:
         if self.collisions["down"] or self.collisions["up"]:
             self.velocity[1] = 0
 
-    def render(self, surface: pygame.Surface, offset: tuple[float] = (0, 0)) -> None:
-        surface.blit(ITEM_IMAGE[self.item.id], (self.pos[0] - offset[0], self.pos[1] - offset[1]))
+    def blitPair(self, offset: tuple[float] = (0, 0), interpolation: float = 1) -> tuple[pygame.Surface, tuple[float]]:
+        """Return the image of the item and where it is drawn, for drawing many items with a single Surface.blits call."""
+        pos: tuple[float] = lerpPos(self.previousPos, self.pos, interpolation)
+        return (ITEM_IMAGE[self.item.id], (pos[0] - offset[0], pos[1] - offset[1]))
+
+    def render(self, surface: pygame.Surface, offset: tuple[float] = (0, 0), interpolation: float = 1) -> pygame.Rect:
+        return surface.blit(*self.blitPair(offset, interpolation))
@@ -4,6 +4,7 @@ from src.script.log import logMSG, logError, logSuccess
 from src.script.loader import loadSysFont, NAME_SPACE, loadJson, STGS, FIX_STGS
 
 from src.script.item import Item
+from src.script.textCache import TEXT_CACHE
 from src.fixData.itemSurface import ITEM_ICON
 
 # https://fonts.google.com/specimen/Pixelify+Sans?query=pixel
@@ -12,14 +13,11 @@ def renderText(surface: pygame.Surface, pos: tuple[int], text: str, color: str =
     """
     Renders text to the specified surface.
     """
-    font: pygame.font = loadSysFont(
-        fontName,
-        size = fontSize
-    )
-    textRendered: pygame.Surface = font.render(
+    textRendered: pygame.Surface = TEXT_CACHE.render(
         text,
-        True,
-        NAME_SPACE["color"][color]
+        NAME_SPACE["color"][color],
+        fontName = fontName,
+        fontSize = fontSize
     )
     textRect: pygame.Rect = textRendered.get_rect()
     textRect.center = (
@@ -142,9 +140,9 @@ class Button:
 
         return True
         
-    def render(self, surface: pygame.Surface, mousePos: tuple[int]) -> None:
+    def render(self, surface: pygame.Surface, mousePos: tuple[int]) -> pygame.Rect:
         """
-        Render the button to the specified surface.
+        Render the button to the specified surface, returning the area drawn to.
         """
 
         isHovered: bool = False
@@ -170,6 +168,7 @@ class Button:
             self.textRendered,
             self.textRect
         )
+        return self.borderRect.union(self.innerRect).union(self.textRect)
 
 class Inventory:
     def __init__(self, *args) -> None:
@@ -204,6 +203,10 @@ class Inventory:
             ) for i in range(len(self.inventory))
         ]
 
+        # The areas the hotbar and the full inventory are drawn to
+        self.hotbarRect: pygame.Rect = self.borderRects[0].unionall(self.borderRects[:FIX_STGS["inventoryCol"]])
+        self.fullInventoryRect: pygame.Rect = self.borderRects[0].unionall(self.borderRects)
+
     def click(self, mousePos: tuple[int]) -> bool:
         # Placeholder
         if True:
@@ -223,19 +226,32 @@ class Inventory:
             return False
         return True
         
-    def renderHotbar(self, surface: pygame.Surface, hotbarNum: int, mousePos: tuple[int]) -> None:
-        # Actual inventory
-        for slotNum in range(10): # The number of slots in a row
-
-            surface.blit(
-                self.hoveredInner if self.borderRects[slotNum].collidepoint(mousePos) else self.notHoveredInner,
-                self.innerRects[slotNum].topleft
-            )
-            #pygame.draw.rect(
-            #    surface,
-            #    NAME_SPACE["color"]["buttonHover" if self.borderRects[slotNum].collidepoint(mousePos) else "buttonInner"],
-            #    self.innerRects[slotNum]
-            #)
+    def slotIconSequence(self, slotNums: range) -> list[tuple[pygame.Surface, tuple[int] | pygame.Rect]]:
+        """Return the icons of the items in the given slots, as pairs for Surface.blits."""
+        sequence: list[tuple[pygame.Surface, tuple[int] | pygame.Rect]] = []
+        for slotNum in slotNums:
+            item = self.inventory[slotNum]
+            if item is not None:
+                sequence.extend(item.iconSequence(
+                    (int(self.innerRects[slotNum].x + self.innerRects[slotNum].w * 0.5 - STGS["guiSize"] * 0.5),
+                    int(self.innerRects[slotNum].y + self.innerRects[slotNum].h * 0.5 - STGS["guiSize"] * 0.5))
+                ))
+        return sequence
+
+    def renderHotbar(self, surface: pygame.Surface, hotbarNum: int, mousePos: tuple[int]) -> pygame.Rect:
+        # Actual inventory, the slots do not overlap, so it is drawn layer by layer
+        slotNums: range = range(10) # The number of slots in a row
+        surface.blits([(
+            self.hoveredInner if self.borderRects[slotNum].collidepoint(mousePos) else self.notHoveredInner,
+            self.innerRects[slotNum].topleft
+        ) for slotNum in slotNums], doreturn = False)
+        #for slotNum in slotNums:
+        #    pygame.draw.rect(
+        #        surface,
+        #        NAME_SPACE["color"]["buttonHover" if self.borderRects[slotNum].collidepoint(mousePos) else "buttonInner"],
+        #        self.innerRects[slotNum]
+        #    )
+        for slotNum in slotNums:
             pygame.draw.rect(
                 surface,
                 NAME_SPACE["color"]["hotbarSelectedBorder" if slotNum == hotbarNum else "buttonBorder"],
@@ -243,17 +259,13 @@ class Inventory:
                 width = FIX_STGS["GUI"]["buttonBorderWidth"],
                 border_radius = FIX_STGS["GUI"]["buttonBorderRadius"]
             )
-            
-            item = self.inventory[slotNum]
-            if item is not None:
-                item.renderIcon(surface,
-                    (int(self.innerRects[slotNum].x + self.innerRects[slotNum].w * 0.5 - STGS["guiSize"] * 0.5),
-                    int(self.innerRects[slotNum].y + self.innerRects[slotNum].h * 0.5 - STGS["guiSize"] * 0.5))
-                )
+        surface.blits(self.slotIconSequence(slotNums), doreturn = False)
+        return self.hotbarRect
 
-    def renderFullInventory(self, surface: pygame.Surface, hotbarNum: int, mousePos: tuple[int]) -> None:
-        # Actual inventory
-        for slotNum, item in self.inventory.items():
+    def renderFullInventory(self, surface: pygame.Surface, hotbarNum: int, mousePos: tuple[int]) -> pygame.Rect:
+        # Actual inventory, the slots do not overlap, so it is drawn layer by layer
+        slotNums: range = range(len(self.inventory))
+        for slotNum in slotNums:
             pygame.draw.rect(
                 surface,
                 NAME_SPACE["color"]["buttonHover" if self.borderRects[slotNum].collidepoint(mousePos) else "buttonInner"],
@@ -266,13 +278,8 @@ class Inventory:
                 width = FIX_STGS["GUI"]["buttonBorderWidth"],
                 border_radius = FIX_STGS["GUI"]["buttonBorderRadius"]
             )
-            
-            item = self.inventory[slotNum]
-            if item is not None:
-                item.renderIcon(surface,
-                    (int(self.innerRects[slotNum].x + self.innerRects[slotNum].w * 0.5 - STGS["guiSize"] * 0.5),
-                    int(self.innerRects[slotNum].y + self.innerRects[slotNum].h * 0.5 - STGS["guiSize"] * 0.5))
-                )
+        surface.blits(self.slotIconSequence(slotNums), doreturn = False)
+        return self.fullInventoryRect
                 
     def doesHover(self, mousePos: tuple[int]) -> bool:
         for slotNum, item in self.inventory.items():
@@ -362,9 +369,10 @@ class CursorSlot:
         """Returns the item the cursor contains"""
         return self.slot
 
-    def renderItemAtCursor(self, surface: pygame.Surface, mousePos: tuple[int]) -> None:
+    def renderItemAtCursor(self, surface: pygame.Surface, mousePos: tuple[int]) -> pygame.Rect | None:
         item = self.slot
         if item is not None:
-            item.renderIcon(surface,
+            return item.renderIcon(surface,
                 (int(mousePos[0] - STGS["guiSize"] * 0.5),
                 int(mousePos[1] - STGS["guiSize"] * 0.5)))
+        return None
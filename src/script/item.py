@@ -3,7 +3,8 @@ import math
 
 from dataclasses import dataclass, field
 
-from src.script.loader import loadSysFont, NAME_SPACE, STGS, FIX_STGS
+from src.script.loader import NAME_SPACE, STGS, FIX_STGS
+from src.script.textCache import TEXT_CACHE
 from src.fixData.itemSurface import ITEM_ICON, ITEM_IMAGE
 
 @dataclass(repr = False)
@@ -12,25 +13,30 @@ class Item:
     id: int
     name: str
     description: str | None = field(default = None)
-    useTime: int = field(default = int(STGS["FPS"] // 2))
+    useTime: int = field(default = int(STGS["tickRate"] // 2))
     amount: int = field(default = 1)
     maxAmount: int = field(default = 2 ** 10)
 
     def getName(self) -> str:
         return self.name.title()
     
-    def renderIcon(self, surface: pygame.Surface, pos: tuple[int]) -> None:
-        surface.blit(ITEM_ICON[self.id], pos)
+    def iconSequence(self, pos: tuple[int]) -> list[tuple[pygame.Surface, tuple[int] | pygame.Rect]]:
+        """Return the icon and the amount of the item at a position, as pairs for Surface.blits."""
+        sequence: list[tuple[pygame.Surface, tuple[int] | pygame.Rect]] = [(ITEM_ICON[self.id], pos)]
 
         # The amount number
         if self.maxAmount != 1:
-            font: pygame.font = loadSysFont("arial")
-            
-            textRendered = font.render(str(self.amount), True, NAME_SPACE["color"]["text"])
+            textRendered: pygame.Surface = TEXT_CACHE.render(str(self.amount), NAME_SPACE["color"]["text"])
             textRect: pygame.Rect = textRendered.get_rect()
             textRect.bottomright = (pos[0] + STGS["guiSize"], pos[1] + STGS["guiSize"])
 
-            surface.blit(textRendered, textRect)
+            sequence.append((textRendered, textRect))
+
+        return sequence
+
+    def renderIcon(self, surface: pygame.Surface, pos: tuple[int]) -> pygame.Rect:
+        rects: list[pygame.Rect] = surface.blits(self.iconSequence(pos))
+        return rects[0].unionall(rects[1:])
 
 @dataclass
 class Weapon(Item):
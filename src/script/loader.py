@@ -6,6 +6,8 @@ import math
 from typing import Any
 
 from src.script.log import logMSG, logError, logSuccess
+from src.script.animation import Animation
+from src.script.assetManager import AssetManager
 
 def loadJson(path: str) -> Any:
     """
@@ -39,9 +41,61 @@ FIX_STGS: dict = loadJson("fixData/fixSettings")
 NAME_SPACE = loadJson("fixData/nameSpace")
 TRANSPARENT_COLOR: list[int] = NAME_SPACE["color"]["toBeTransparent"]
 
+# Every image is read from disk once, by path, size and whether it is in the display format
+ASSETS: AssetManager = AssetManager(STGS["assetCacheSize"])
+
+def finalizeImage(image: pygame.Surface) -> pygame.Surface:
+    """
+    Convert an image to the pixel format of the display, with an RLE accelerated colorkey.
+
+    Blitting an image of another format converts every pixel on every blit, and the
+    RLE colorkey lets transparent runs be skipped. Images loaded before the display
+    exists are returned as they are, finalizeAssets converts them later.
+    Images packed into an atlas share the pixels of their sheet and are finalized by it.
+
+    Args:
+        image (pygame.Surface): The image to convert.
+
+    Returns:
+        pygame.Surface: The converted image.
+    """
+    if pygame.display.get_surface() is None or image.get_parent() is not None:
+        return image
+
+    colorkey: tuple[int] | None = image.get_colorkey()
+    converted: pygame.Surface = image.convert_alpha() if image.get_flags() & pygame.SRCALPHA else image.convert()
+    if colorkey is not None:
+        converted.set_colorkey(colorkey, pygame.RLEACCEL)
+    return converted
+
+def finalizeAssets(assets: Any) -> int:
+    """
+    Finalize every image of a table of assets in place, for the ones loaded before the display existed.
+
+    Args:
+        assets (Any): A dict or a list of images, animations or further tables.
+
+    Returns:
+        int: The number of images converted.
+    """
+    if isinstance(assets, Animation):
+        return finalizeAssets(assets.images)
+
+    converted: int = 0
+    for key, value in (assets.items() if isinstance(assets, dict) else enumerate(assets)):
+        if isinstance(value, pygame.Surface):
+            assets[key] = finalizeImage(value)
+            if assets[key] is not value:
+                converted += 1
+        else:
+            converted += finalizeAssets(value)
+    return converted
+
 def loadImage(path: str) -> pygame.Surface:
     """
-    Loads a '.png' image from a file.
+    Loads a '.png' image from a file, or from memory if it was loaded before.
+
+    The image is shared, it must not be drawn on.
 
     Args:
         path (str): The path to the image file: from 'src/img/' to '.png' WITHOUT the said
@@ -49,10 +103,22 @@ def loadImage(path: str) -> pygame.Surface:
     Returns:
         pygame.Surface: The loaded image.
     """
+    return ASSETS.get((path, None, pygame.display.get_surface() is not None), lambda: readImage(path))
+
+def readImage(path: str) -> pygame.Surface:
+    """
+    Reads a '.png' image from a file, use loadImage to read it only once.
+
+    Args:
+        path (str): The path to the image file: from 'src/img/' to '.png' WITHOUT the said
+
+    Returns:
+        pygame.Surface: The read image, the placeholder image if it could not be read.
+    """
     try:
         img: pygame.Surface = pygame.image.load(f"src/img/{path}.png")
         img.set_colorkey(TRANSPARENT_COLOR)
-        return img
+        return finalizeImage(img)
     
     except FileNotFoundError as e:
         logError(f"\'src/img/{path}.png\' not found: {e}")
@@ -64,7 +130,9 @@ def loadImage(path: str) -> pygame.Surface:
         
 def loadImageResized(path: str, size: tuple[int]) -> pygame.Surface:
     """
-    Load an image from a file, and resizes it.
+    Load an image from a file, and resizes it, or get it from memory if it was loaded in this size before.
+
+    The image is shared, it must not be drawn on.
 
     Args:
         path (str): The path to the image file.
@@ -75,6 +143,19 @@ def loadImageResized(path: str, size: tuple[int]) -> pygame.Surface:
     """
     assert size[0] > 0 and size[1] > 0, "The new size must be an integer greater than 0"
 
+    return ASSETS.get((path, (size[0], size[1]), pygame.display.get_surface() is not None), lambda: resizeLoadedImage(path, size))
+
+def resizeLoadedImage(path: str, size: tuple[int]) -> pygame.Surface:
+    """
+    Resize an image loaded from a file, use loadImageResized to resize it only once.
+
+    Args:
+        path (str): The path to the image file.
+        size (tuple[int]): The new size of the image file.
+
+    Returns:
+        pygame.Surface: The resized image.
+    """
     img: pygame.Surface = loadImage(path)
     returnImage: pygame.Surface = pygame.transform.scale(
         img,
@@ -82,7 +163,7 @@ def loadImageResized(path: str, size: tuple[int]) -> pygame.Surface:
         size[1])
     )
     returnImage.set_colorkey(TRANSPARENT_COLOR)
-    return returnImage
+    return finalizeImage(returnImage)
 
 def loadDirectory(path: str) -> dict[str, pygame.Surface]:
     """
@@ -153,13 +234,32 @@ def getBit(block: str = "_") -> str:
             return key
     return "_"
 
+# Every font is created once, creating one scans the fonts of the system
+FONTS: dict[tuple[str, int, bool, bool], pygame.font.Font] = {}
+
 def loadSysFont(name: str, size: int = 16, bold: bool = False, italic: bool = False) -> pygame.font:
-    return pygame.font.SysFont(
-        name = name,
-        size = size,
-        bold = bold,
-        italic = italic
-    )
+    """
+    Get a system font, it is created on first use and shared afterwards.
+
+    Args:
+        name (str): The name of the font.
+        size (int, optional): The size of the font. Defaults to 16.
+        bold (bool, optional): Whether the font is bold. Defaults to False.
+        italic (bool, optional): Whether the font is italic. Defaults to False.
+
+    Returns:
+        pygame.font.Font: The font, it must not be changed.
+    """
+    key: tuple[str, int, bool, bool] = (name, size, bold, italic)
+    font: pygame.font.Font | None = FONTS.get(key)
+    if font is None:
+        font = FONTS[key] = pygame.font.SysFont(
+            name = name,
+            size = size,
+            bold = bold,
+            italic = italic
+        )
+    return font
 
 def loadIcon(path: str) -> pygame.Surface:
     """
@@ -171,4 +271,20 @@ def resizeImage(image: pygame.Surface, size: tuple[int]) -> pygame.Surface:
     """
     Resize an image.
     """
-    return pygame.transform.scale(image, size)
+    return finalizeImage(pygame.transform.scale(image, size))
+
+def preloadImages(group: str, images: list[tuple[str, tuple[int] | None]]) -> None:
+    """
+    Load images and keep them in memory until their group is released.
+
+    Args:
+        group (str): The name of the group, the game state needing them for example.
+        images (list[tuple[str, tuple[int] | None]]): The path and the size of every image, None to keep its size.
+    """
+    ASSETS.preload(group, {
+        (path, size): loadImage(path) if size is None else loadImageResized(path, size) for path, size in images
+    })
+
+def releaseImages(group: str) -> None:
+    """Stop keeping the images of a group in memory, they stay while anything else uses them."""
+    ASSETS.release(group)
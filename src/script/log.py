@@ -1,4 +1,29 @@
+import os
+import sys
 import time
+import queue
+import atexit
+import logging
+import logging.handlers
+
+from collections import deque
+
+__all__ = ["Color", "logDebug", "logMSG", "logError", "logSuccess", "setLogLevel", "recentLogs", "flushLogs"]
+
+# Where the log files are written, the oldest is dropped after LOG_FILE_BACKUPS rotations
+LOG_DIRECTORY: str = "log"
+LOG_FILE: str = os.path.join(LOG_DIRECTORY, "game.log")
+LOG_FILE_MAX_BYTES: int = 1024 * 1024
+LOG_FILE_BACKUPS: int = 3
+# Records are written to the file in batches of this many, errors are written at once
+LOG_FILE_BATCH: int = 64
+# The number of recent records kept in memory
+RING_BUFFER_SIZE: int = 256
+# A single line of code may log this many messages per second, the rest are counted and dropped. Errors are never dropped
+RATE_LIMIT: int = 5
+
+SUCCESS: int = 25
+logging.addLevelName(SUCCESS, "SUCCESS")
 
 class Color:
     """
@@ -32,29 +57,247 @@ class Color:
         color_code = cls.color_codes.get(color_name, "")
         return f"{color_code}{text}{cls.color_codes['reset']}"
 
-def logMSG(msg) -> None:
+class LogFormatter(logging.Formatter):
+    """
+    Formats records as "<timestamp> :> <message>", optionally colored by level.
+
+    Attributes:
+        colored (bool): Flag indicating whether ANSI colors are applied.
+    """
+    LEVEL_COLORS: dict[int, str] = {
+        logging.DEBUG: "cyan",
+        logging.INFO: "white",
+        SUCCESS: "green",
+        logging.WARNING: "yellow",
+        logging.ERROR: "red",
+        logging.CRITICAL: "red"
+    }
+
+    def __init__(self, colored: bool) -> None:
+        super().__init__()
+        self.colored: bool = colored
+
+    def format(self, record: logging.LogRecord) -> str:
+        text: str = f"{time.asctime(time.localtime(record.created))} :> "
+        if record.levelno >= logging.WARNING:
+            text += f"{record.levelname} - "
+        text += record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            text += "\n" + record.exc_text
+        return Color.apply(text, self.LEVEL_COLORS.get(record.levelno, "white")) if self.colored else text
+
+class ConsoleHandler(logging.Handler):
+    """Prints records to whatever the standard output is at the time they are written."""
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            print(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+class RawQueueHandler(logging.handlers.QueueHandler):
+    """Puts records into the queue unformatted, so the message is only built on the listener thread."""
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The args are kept for the listener, only a traceback has to be rendered before its frames are gone
+        if record.exc_info:
+            record.exc_text = EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keeps the most recent records in memory.
+
+    Attributes:
+        records (deque[logging.LogRecord]): The kept records, oldest first.
+    """
+    def __init__(self, capacity: int) -> None:
+        super().__init__()
+        self.records: deque[logging.LogRecord] = deque(maxlen = capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+class RateLimiter:
+    """
+    Limits how many messages a single line of code may log per second.
+
+    Attributes:
+        limit (int): The number of messages allowed per second and call site.
+        sites (dict[tuple[str, int], list[float | int]]): Start of the current second, messages logged and messages dropped per call site.
+    """
+    def __init__(self, limit: int) -> None:
+        self.limit: int = limit
+        self.sites: dict[tuple[str, int], list[float | int]] = {}
+
+    def allow(self, site: tuple[str, int]) -> tuple[bool, int]:
+        """
+        Count a message of a call site.
+
+        Args:
+            site (tuple[str, int]): The file and line the message is logged from.
+
+        Returns:
+            tuple[bool, int]: Whether the message may be logged, and how many messages were dropped before it.
+        """
+        now: float = time.monotonic()
+        state: list[float | int] | None = self.sites.get(site)
+        if state is None or now - state[0] >= 1:
+            dropped: int = state[2] if state is not None else 0
+            self.sites[site] = [now, 1, 0]
+            return True, dropped
+        if state[1] < self.limit:
+            state[1] += 1
+            return True, 0
+        state[2] += 1
+        return False, 0
+
+    def takeDropped(self) -> dict[tuple[str, int], int]:
+        """
+        Take the counts of the messages dropped since the last message of each call site.
+
+        Returns:
+            dict[tuple[str, int], int]: The number of dropped messages by call site, the ones that dropped none are left out.
+        """
+        dropped: dict[tuple[str, int], int] = {}
+        for site, state in self.sites.items():
+            if state[2]:
+                dropped[site] = state[2]
+                state[2] = 0
+        return dropped
+
+LOGGER: logging.Logger = logging.getLogger("practiceGame")
+LOGGER.setLevel(logging.INFO)
+LOGGER.propagate = False
+
+RING_BUFFER: RingBufferHandler = RingBufferHandler(RING_BUFFER_SIZE)
+EXCEPTION_FORMATTER: logging.Formatter = logging.Formatter()
+RATE_LIMITER: RateLimiter = RateLimiter(RATE_LIMIT)
+LOG_QUEUE: queue.Queue = queue.Queue()
+
+def startLogging() -> logging.handlers.QueueListener:
+    """
+    Route the records of the game logger through a queue to a background thread.
+
+    The calling thread only puts records into the queue, printing them
+    and writing them to the rotating log file happens on the listener.
+
+    Returns:
+        logging.handlers.QueueListener: The started listener.
+    """
+    consoleHandler: ConsoleHandler = ConsoleHandler()
+    consoleHandler.setFormatter(LogFormatter(colored = True))
+    handlers: list[logging.Handler] = [consoleHandler]
+
+    try:
+        os.makedirs(LOG_DIRECTORY, exist_ok = True)
+        fileHandler: logging.Handler = logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes = LOG_FILE_MAX_BYTES, backupCount = LOG_FILE_BACKUPS, encoding = "utf-8", delay = True)
+        fileHandler.setFormatter(LogFormatter(colored = False))
+        handlers.append(logging.handlers.MemoryHandler(LOG_FILE_BATCH, flushLevel = logging.ERROR, target = fileHandler))
+    except OSError as e:
+        print(Color.apply(f"{time.asctime()} :> ERROR - Logging to \'{LOG_FILE}\' is not possible: {e}", "red"))
+
+    LOGGER.addHandler(RING_BUFFER)
+    LOGGER.addHandler(RawQueueHandler(LOG_QUEUE))
+    listener: logging.handlers.QueueListener = logging.handlers.QueueListener(LOG_QUEUE, *handlers)
+    listener.start()
+    return listener
+
+def logDropped() -> None:
+    """Log how many messages of every call site were dropped and not reported yet."""
+    for (fileName, line), dropped in RATE_LIMITER.takeDropped().items():
+        LOGGER.warning("%d messages from %s:%d were dropped", dropped, fileName, line)
+
+def stopLogging() -> None:
+    """Write every waiting record and stop the background thread."""
+    logDropped()
+    LISTENER.stop()
+    for handler in LISTENER.handlers:
+        handler.close()
+
+def flushLogs() -> None:
+    """Block until every record logged so far is written, along with the counts of the dropped messages."""
+    logDropped()
+    LOG_QUEUE.join()
+
+def setLogLevel(level: int) -> None:
+    """
+    Set the lowest level that is logged, messages below it cost next to nothing.
+
+    Args:
+        level (int): The level, like logging.DEBUG or logging.INFO.
+    """
+    LOGGER.setLevel(level)
+
+def recentLogs(count: int = RING_BUFFER_SIZE) -> list[str]:
+    """
+    Return the most recent log lines, oldest first.
+
+    Args:
+        count (int, optional): The maximum number of lines. Defaults to the size of the ring buffer.
+    """
+    formatter: LogFormatter = LogFormatter(colored = False)
+    return [formatter.format(record) for record in list(RING_BUFFER.records)[-count:]]
+
+def log(level: int, msg, args: tuple) -> None:
+    """
+    Log a message at a level, formatting it only if it is logged.
+
+    Args:
+        level (int): The level of the message.
+        msg (str): The message, formatted with args using %.
+        args (tuple): The arguments of the message.
+    """
+    if not LOGGER.isEnabledFor(level):
+        return
+
+    if level < logging.ERROR:
+        # The caller of logDebug, logMSG or logSuccess
+        caller = sys._getframe(2)
+        allowed, dropped = RATE_LIMITER.allow((caller.f_code.co_filename, caller.f_lineno))
+        if not allowed:
+            return
+        if dropped:
+            msg = f"{msg} ({dropped} similar messages dropped)"
+    LOGGER.log(level, msg, *args)
+
+def logDebug(msg, *args) -> None:
+    """
+    Log a debug message, hidden unless the log level is lowered.
+
+    Args:
+        msg (str): The message to log, formatted with args only if it is logged.
+    """
+    log(logging.DEBUG, msg, args)
+
+def logMSG(msg, *args) -> None:
     """
     Log a message with a timestamp in white color.
 
     Args:
-        msg (str): The message to log.
+        msg (str): The message to log, formatted with args only if it is logged.
     """
-    print(Color.apply(f"{time.asctime()} :> {msg}", "white"))
+    log(logging.INFO, msg, args)
 
-def logError(msg) -> None:
+def logError(msg, *args) -> None:
     """
     Log an error message with a timestamp in red color.
 
     Args:
-        msg (str): The error message to log.
+        msg (str): The error message to log, formatted with args only if it is logged.
     """
-    print(Color.apply(f"{time.asctime()} :> ERROR - {msg}", "red"))
+    log(logging.ERROR, msg, args)
 
-def logSuccess(msg) -> None:
+def logSuccess(msg, *args) -> None:
     """
     Log a message with a timestamp in green color.
 
     Args:
-        msg (str): The error message to log.
+        msg (str): The message to log, formatted with args only if it is logged.
     """
-    print(Color.apply(f"{time.asctime()} :> {msg}", "green"))
+    log(SUCCESS, msg, args)
+
+LISTENER: logging.handlers.QueueListener = startLogging()
+atexit.register(stopLogging)
@@ -0,0 +1,179 @@
+import queue
+import threading
+import time
+
+from src.script.log import logMSG, logError
+from src.script.loader import STGS
+from src.script.chunk import Chunk
+from src.script.region import RegionFile
+from src.script.editJournal import EditJournal
+from src.script.tilemap import Tilemap
+
+class MapSaver:
+    """
+    Writes the changed chunks of a tilemap to its map file on a background thread.
+
+    A save copies only the chunks changed since the last one, so it costs the main thread
+    time by the number of edits, not by the size of the map. The copies are written in the
+    order they were handed over, and are served to readers until they are on disk, so a chunk
+    dropped from memory in the meantime is never read back older than it was.
+
+    Between saves, the edit journal of the tilemap is written every journalInterval seconds
+    on the same thread, and its old generations are deleted once a save holding them is on disk.
+
+    Attributes:
+        tilemap (Tilemap): The tilemap whose chunks are saved.
+        interval (float): The seconds between two autosaves, 0 turns autosaving off.
+        journalInterval (float): The seconds between two writes of the edit journal.
+        lastSave (float): The monotonic time of the last save.
+        lastJournalSync (float): The monotonic time of the last write of the edit journal.
+        failed (bool): Whether writing chunks failed, the journal is kept from then on.
+        stats (dict[str, int]): Counters of saves and written chunks.
+    """
+    def __init__(self, tilemap: Tilemap, interval: float = STGS["autosaveInterval"], journalInterval: float = STGS["journalSyncInterval"]) -> None:
+        """
+        Initialize a MapSaver object and start its background thread.
+
+        Args:
+            tilemap (Tilemap): The tilemap whose chunks are saved.
+            interval (float, optional): The seconds between two autosaves, 0 turns autosaving off. Defaults to the settings.
+            journalInterval (float, optional): The seconds between two writes of the edit journal. Defaults to the settings.
+        """
+        self.tilemap: Tilemap = tilemap
+        self.interval: float = interval
+        self.journalInterval: float = journalInterval
+        self.lastSave: float = time.monotonic()
+        self.lastJournalSync: float = self.lastSave
+        self.failed: bool = False
+        self.stats: dict[str, int] = {"saves": 0, "chunks": 0, "journalBatches": 0}
+
+        # Main thread -> worker: ("journal", journal, generation, records), ("write", region, [chunks], journal, [generations]) or None to stop
+        self.jobs: queue.Queue = queue.Queue()
+
+        # Chunks handed over that are not written to the map file yet
+        self.pendingLock: threading.Lock = threading.Lock()
+        self.pending: dict[tuple[int], Chunk] = {}
+
+        self.tilemap.saver = self
+        self.thread: threading.Thread = threading.Thread(target = self.work, name = "MapSaver", daemon = True)
+        self.thread.start()
+
+    def work(self) -> None:
+        """Write the handed over chunks until it is told to stop."""
+        while True:
+            job: tuple | None = self.jobs.get()
+            if job is None:
+                self.jobs.task_done()
+                return
+
+            if job[0] == "journal":
+                journal: EditJournal = job[1]
+                try:
+                    journal.writeBatch(job[2], job[3])
+                except Exception as e:
+                    logError(f"Writing the edit journal of \'{journal.directory}\' failed: {e}")
+                finally:
+                    self.jobs.task_done()
+                continue
+
+            region: RegionFile = job[1]
+            chunks: list[Chunk] = job[2]
+            try:
+                region.writeChunks(chunks)
+                # The journal is the only copy of the edits once a save failed
+                if job[3] is not None and not self.failed:
+                    job[3].discard(job[4])
+            except Exception as e:
+                self.failed = True
+                logError(f"Saving {len(chunks)} chunks to \'{region.path}\' failed: {e}")
+            finally:
+                with self.pendingLock:
+                    for chunk in chunks:
+                        # A newer copy of the chunk may be waiting behind this one
+                        if self.pending.get(chunk.pos) is chunk:
+                            del self.pending[chunk.pos]
+                self.jobs.task_done()
+
+    def write(self, chunks: list[Chunk], finished: list[int] | None = None) -> None:
+        """
+        Hand chunks over to be written, they must not be changed afterwards.
+
+        Args:
+            chunks (list[Chunk]): The chunks to write.
+            finished (list[int] | None, optional): The journal generations to delete once the chunks are written. Defaults to None.
+        """
+        if not chunks or self.tilemap.region is None:
+            return
+        # A journal older than the map file would undo the newest edits when it is replayed
+        self.commitJournal()
+        with self.pendingLock:
+            for chunk in chunks:
+                self.pending[chunk.pos] = chunk
+        self.stats["chunks"] += len(chunks)
+        self.jobs.put(("write", self.tilemap.region, chunks, self.tilemap.journal, finished or []))
+
+    def commitJournal(self) -> None:
+        """Hand the edits recorded in the journal since its last write over to be written."""
+        self.lastJournalSync = time.monotonic()
+        journal: EditJournal | None = self.tilemap.journal
+        if journal is None or not journal.buffer:
+            return
+        self.stats["journalBatches"] += 1
+        self.jobs.put(("journal", journal, journal.generation, journal.takeBatch()))
+
+    def pendingChunk(self, chunkPos: tuple[int]) -> Chunk | None:
+        """
+        Get a copy of a chunk that is handed over but not written yet.
+
+        Args:
+            chunkPos (tuple[int]): The position of the chunk in chunk coordinates.
+
+        Returns:
+            Chunk | None: The copy, or None if the chunk is not waiting to be written.
+        """
+        with self.pendingLock:
+            chunk: Chunk | None = self.pending.get(chunkPos)
+            return chunk.copy() if chunk is not None else None
+
+    def save(self) -> int:
+        """
+        Snapshot the chunks changed since the last save and write them in the background.
+
+        Returns:
+            int: The number of chunks saved.
+        """
+        self.lastSave = time.monotonic()
+        if self.tilemap.region is None or not self.tilemap.dirtyChunks:
+            return 0
+
+        # Copy on save, the main thread keeps editing the originals while the copies are written
+        snapshot: list[Chunk] = [self.tilemap.chunks[chunkPos].copy() for chunkPos in self.tilemap.dirtyChunks]
+        self.tilemap.dirtyChunks = set()
+        self.stats["saves"] += 1
+        # The records of the buffer refer to the palette of the generation that is rotated out
+        self.commitJournal()
+        self.write(snapshot, self.tilemap.journal.rotate() if self.tilemap.journal is not None else [])
+        return len(snapshot)
+
+    def update(self) -> None:
+        """Save if the autosave interval passed since the last save, or else write the journal if its interval passed."""
+        if self.interval and time.monotonic() - self.lastSave >= self.interval:
+            saved: int = self.save()
+            if saved:
+                logMSG(f"Autosaved {saved} chunks")
+        elif time.monotonic() - self.lastJournalSync >= self.journalInterval:
+            self.commitJournal()
+
+    def flush(self) -> None:
+        """Block until every handed over chunk is written."""
+        self.jobs.join()
+
+    def close(self) -> None:
+        """Save the remaining changes, wait for them to be written and stop the background thread."""
+        self.save()
+        self.jobs.put(None)
+        self.thread.join()
+        if self.tilemap.journal is not None:
+            self.tilemap.journal.close()
+        self.tilemap.saver = None
+        logMSG(f"Map saving stopped: {self.stats}")
@@ -4,6 +4,10 @@ def getHyp(side1: float, side2: float) -> float:
     """Returns the hypotenuse of a right triangle given two sides."""
     return math.sqrt(side1**2 + side2**2)
 
+def lerpPos(previous: tuple[float], current: tuple[float], t: float) -> tuple[float]:
+    """Returns the point at t between two positions, t = 0 being previous and t = 1 current."""
+    return (previous[0] + (current[0] - previous[0]) * t, previous[1] + (current[1] - previous[1]) * t)
+
 def playerMagnetFunc(distance: tuple[float]) -> tuple[float]:
     """
     Accepts float from the range [-1; 1]
@@ -2,7 +2,9 @@ import pygame
 
 from src.script.loader import STGS
 from src.script.animation import Animation
+from src.script.mathFunc import lerpPos
 from src.script.tilemap import Tilemap
+from src.script.collision import Sweep, sweepBox
 
 class Mob:
     """
@@ -19,6 +21,7 @@ class Mob:
         assets (dict[str, dict[str, Animation]]): Dictionary mapping species names to dictionaries containing action names and Animation objects.
         movementInput (dict[str, bool]): Dictionary mapping movement direction keys to boolean values indicating if the key is pressed.
         velocity (list[float]): The velocity of the mob in the x and y directions.
+        collisions (dict[str, bool]): The sides of the mob that touched a tile in the last update.
         action (str): The current action of the mob.
         animationOffset (tuple[int]): Offset to adjust the position of the mob's animation.
         flip (bool): Flag indicating if the mob's sprite should be flipped horizontally.
@@ -33,6 +36,7 @@ class Mob:
             pos (list[float]): The initial position of the mob as a list containing x and y coordinates.
         """
         self.pos: list[float] = pos
+        self.previousPos: tuple[float] = tuple(pos)
         self.width: int = 48
         self.height: int = 48
 
@@ -44,6 +48,7 @@ class Mob:
         self.assets: dict[str, dict[str, Animation]] = assets
         self.movementInput: dict[str, bool] = {"left" : False, "right" : False, "up" : False, "down" : False, "space" : False}
         self.velocity: list[float] = [0, 0]
+        self.collisions: dict[str, bool] = {"left" : False, "right" : False, "up" : False, "down" : False}
 
         self.action: str = ""
         self.animationOffset: tuple[int] = (0, 0)
@@ -55,6 +60,10 @@ class Mob:
         """Return the rectangular hitbox of the mob."""
         return pygame.Rect(self.pos[0] + self.pivot[0], self.pos[1] + self.pivot[1], self.hitBoxWidth, self.hitBoxHeight)
 
+    def isAtRest(self) -> bool:
+        """Return whether the mob stands still on the ground with nothing to do, so it may sleep."""
+        return self.collisions["down"] and self.velocity[0] == 0 and self.velocity[1] == 0 and not any(self.movementInput.values())
+
     def setAction(self, action: str) -> None:
         """
         Set the action of the mob.
@@ -74,32 +83,13 @@ class Mob:
             tilemap (Tilemap): The tilemap the mob interacts with.
             movement (tuple[int], optional): The movement vector. Defaults to (0, 0).
         """
-        self.collisions: dict[str, bool] = {"left" : False, "right" : False, "up" : False, "down" : False}
+        self.previousPos = tuple(self.pos)
         frameMovement: tuple[float] = (movement[0] + self.velocity[0], movement[1] + self.velocity[1])
 
-        self.pos[0] += frameMovement[0]
-        mobRect: pygame.Rect = self.rect()
-        for rect in tilemap.physicsRectsAround((self.pos[0] + self.pivot[0] + self.hitBoxWidth / 2, self.pos[1] + self.pivot[1] + self.hitBoxHeight / 2)):
-            if rect.colliderect(mobRect):
-                if frameMovement[0] > 0:
-                    mobRect.right = rect.left
-                    self.collisions["right"] = True
-                if frameMovement[0] < 0:
-                    mobRect.left = rect.right
-                    self.collisions["left"] = True
-                self.pos[0] = mobRect.x - self.pivot[0]
-
-        self.pos[1] += frameMovement[1]
-        mobRect: pygame.Rect = self.rect()
-        for rect in tilemap.physicsRectsAround((self.pos[0] + self.pivot[0] + self.hitBoxWidth / 2, self.pos[1] + self.pivot[1] + self.hitBoxHeight / 2)):
-            if rect.colliderect(mobRect):
-                if frameMovement[1] > 0:
-                    mobRect.bottom = rect.top
-                    self.collisions["down"] = True
-                if frameMovement[1] < 0:
-                    mobRect.top = rect.bottom
-                    self.collisions["up"] = True
-                self.pos[1] = mobRect.y - self.pivot[1]
+        sweep: Sweep = sweepBox(tilemap, (self.pos[0] + self.pivot[0], self.pos[1] + self.pivot[1], self.hitBoxWidth, self.hitBoxHeight), frameMovement)
+        self.pos[0] += sweep.movement[0]
+        self.pos[1] += sweep.movement[1]
+        sweep.collisions(self.collisions)
         
         if movement[0] > 0:
             self.flip = False
@@ -123,13 +113,18 @@ class Mob:
 
         self.animation.update()
 
-    def render(self, surface: pygame.Surface, offset: tuple[float] = (0, 0)) -> None:
+    def render(self, surface: pygame.Surface, offset: tuple[float] = (0, 0), interpolation: float = 1) -> pygame.Rect:
         """
         Render the mob on the given surface with optional offset.
 
         Args:
             surface (pygame.Surface): The surface to render the mob on.
             offset (tuple[float], optional): The offset to apply to the mob's position. Defaults to (0, 0).
+            interpolation (float, optional): How far the frame is between the last two ticks. Defaults to 1.
+
+        Returns:
+            pygame.Rect: The area of the surface that was drawn to.
         """
-        surface.blit(pygame.transform.flip(self.animation.img(), self.flip, False),
-            (self.pos[0] - offset[0] + self.animationOffset[0], self.pos[1] - offset[1] + self.animationOffset[1]))
+        pos: tuple[float] = lerpPos(self.previousPos, self.pos, interpolation)
+        return surface.blit(pygame.transform.flip(self.animation.img(), self.flip, False),
+            (pos[0] - offset[0] + self.animationOffset[0], pos[1] - offset[1] + self.animationOffset[1]))
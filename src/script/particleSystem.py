@@ -0,0 +1,172 @@
+import numpy
+import pygame
+
+from src.script.animation import Animation
+
+# Species drifting from side to side while they move
+SWAYING_SPECIES: set[str] = {"leaf"}
+
+class ParticleSystem:
+    """
+    Every particle of the game, stored as a structure of arrays and updated and drawn in batches.
+
+    A particle lives until its animation played once. Dead particles are removed
+    by moving the living ones together, so the first count entries are always alive.
+
+    Attributes:
+        species (list[str]): Species names, indexed by the species ids of the particles.
+        count (int): The number of living particles.
+        pos (numpy.ndarray): Positions of the particles, shape (capacity, 2).
+        previousPos (numpy.ndarray): Positions of the particles before the last update.
+        velocity (numpy.ndarray): Velocities of the particles, shape (capacity, 2).
+        frame (numpy.ndarray): Animation frames of the particles.
+        speciesId (numpy.ndarray): Species ids of the particles.
+    """
+    def __init__(self, assets: dict[str, Animation], capacity: int = 1024) -> None:
+        """
+        Initialize a ParticleSystem object.
+
+        Args:
+            assets (dict[str, Animation]): A dictionary mapping species names to the animations of those particles.
+            capacity (int, optional): The number of particles room is made for at first, it grows when needed. Defaults to 1024.
+        """
+        self.species: list[str] = list(assets)
+        self.speciesIds: dict[str, int] = {species: id for id, species in enumerate(self.species)}
+
+        # Every image of every species in one table, so a particle's image is a single index
+        self.images: list[pygame.Surface] = []
+        firstImage: list[int] = []
+        for species in self.species:
+            firstImage.append(len(self.images))
+            self.images.extend(assets[species].images)
+        self.firstImage: numpy.ndarray = numpy.array(firstImage, dtype = numpy.int32)
+        self.imageDuration: numpy.ndarray = numpy.array([assets[species].imageDuration for species in self.species], dtype = numpy.float64)
+        self.lastFrame: numpy.ndarray = numpy.array(
+            [assets[species].imageDuration * len(assets[species].images) - 1 for species in self.species], dtype = numpy.int32)
+        self.sways: numpy.ndarray = numpy.array([species in SWAYING_SPECIES for species in self.species], dtype = bool)
+        self.halfSizes: numpy.ndarray = numpy.array([(image.get_width() // 2, image.get_height() // 2) for image in self.images], dtype = numpy.int32).reshape(-1, 2)
+        self.sizes: numpy.ndarray = numpy.array([image.get_size() for image in self.images], dtype = numpy.int32).reshape(-1, 2)
+
+        self.count: int = 0
+        self.pos: numpy.ndarray = numpy.zeros((capacity, 2))
+        self.previousPos: numpy.ndarray = numpy.zeros((capacity, 2))
+        self.velocity: numpy.ndarray = numpy.zeros((capacity, 2))
+        self.frame: numpy.ndarray = numpy.zeros(capacity, dtype = numpy.int32)
+        self.speciesId: numpy.ndarray = numpy.zeros(capacity, dtype = numpy.int16)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def grow(self) -> None:
+        """Double the room for particles."""
+        capacity: int = len(self.frame) * 2
+        for name in ("pos", "previousPos", "velocity", "frame", "speciesId"):
+            old: numpy.ndarray = getattr(self, name)
+            new: numpy.ndarray = numpy.zeros((capacity, *old.shape[1:]), dtype = old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def spawn(self, species: str, pos: tuple[float], velocity: tuple[float] = (0, 0), frame: int = 0) -> None:
+        """
+        Add a particle.
+
+        Args:
+            species (str): The species of the particle.
+            pos (tuple[float]): The position of the particle.
+            velocity (tuple[float], optional): The velocity of the particle. Defaults to (0, 0).
+            frame (int, optional): The frame of the animation the particle starts at. Defaults to 0.
+        """
+        if self.count == len(self.frame):
+            self.grow()
+
+        index: int = self.count
+        self.pos[index] = pos
+        self.previousPos[index] = pos
+        self.velocity[index] = velocity
+        self.frame[index] = frame
+        self.speciesId[index] = self.speciesIds[species]
+        self.count += 1
+
+    def clear(self) -> None:
+        """Remove every particle."""
+        self.count = 0
+
+    def cull(self, area: pygame.Rect) -> None:
+        """
+        Remove the particles outside an area, like the part of the world that is simulated.
+
+        Args:
+            area (pygame.Rect): The area in world pixels the particles are kept in.
+        """
+        count: int = self.count
+        if not count:
+            return
+
+        pos: numpy.ndarray = self.pos[:count]
+        inside: numpy.ndarray = (pos[:, 0] >= area.left) & (pos[:, 0] < area.right) & (pos[:, 1] >= area.top) & (pos[:, 1] < area.bottom)
+        if not inside.all():
+            kept: numpy.ndarray = numpy.flatnonzero(inside)
+            self.count = len(kept)
+            for array in (self.pos, self.previousPos, self.velocity, self.frame, self.speciesId):
+                array[:self.count] = array[kept]
+
+    def update(self) -> None:
+        """Move and animate every particle, removing the ones whose animation is over."""
+        count: int = self.count
+        if not count:
+            return
+
+        speciesId: numpy.ndarray = self.speciesId[:count]
+        lastFrame: numpy.ndarray = self.lastFrame[speciesId]
+        alive: numpy.ndarray = self.frame[:count] < lastFrame
+
+        self.previousPos[:count] = self.pos[:count]
+        self.pos[:count] += self.velocity[:count]
+        numpy.minimum(self.frame[:count] + 1, lastFrame, out = self.frame[:count])
+
+        sways: numpy.ndarray = self.sways[speciesId]
+        self.pos[:count, 0] += numpy.where(sways, numpy.sin(self.frame[:count] * 0.035) * 0.25, 0)
+
+        if not alive.all():
+            kept: numpy.ndarray = numpy.flatnonzero(alive)
+            self.count = len(kept)
+            for array in (self.pos, self.previousPos, self.velocity, self.frame, self.speciesId):
+                array[:self.count] = array[kept]
+
+    def render(self, surface: pygame.Surface, offset: tuple[float] = (0, 0), interpolation: float = 1) -> pygame.Rect | None:
+        """
+        Draw every particle on the surface with a single batched blit.
+
+        Args:
+            surface (pygame.Surface): The surface to render the particles on.
+            offset (tuple[float], optional): The offset to apply to the particles' positions. Defaults to (0, 0).
+            interpolation (float, optional): How far the frame is between the last two ticks. Defaults to 1.
+
+        Returns:
+            pygame.Rect | None: The area around every drawn particle, None if nothing was drawn.
+        """
+        count: int = self.count
+        if not count:
+            return None
+
+        speciesId: numpy.ndarray = self.speciesId[:count]
+        imageIndex: numpy.ndarray = self.firstImage[speciesId] + (self.frame[:count] / self.imageDuration[speciesId]).astype(numpy.int32)
+        previousPos: numpy.ndarray = self.previousPos[:count]
+        topLeft: numpy.ndarray = (
+            previousPos + (self.pos[:count] - previousPos) * interpolation - offset - self.halfSizes[imageIndex]
+        ).astype(numpy.int32)
+
+        # Only the particles overlapping the surface are drawn
+        bottomRight: numpy.ndarray = topLeft + self.sizes[imageIndex]
+        visible: numpy.ndarray = (bottomRight[:, 0] > 0) & (bottomRight[:, 1] > 0) & (topLeft[:, 0] < surface.get_width()) & (topLeft[:, 1] < surface.get_height())
+        if not visible.any():
+            return None
+        imageIndex = imageIndex[visible]
+        topLeft = topLeft[visible]
+        bottomRight = bottomRight[visible]
+
+        surface.blits(zip(map(self.images.__getitem__, imageIndex.tolist()), topLeft.tolist()), doreturn = False)
+
+        left, top = topLeft.min(axis = 0).tolist()
+        right, bottom = bottomRight.max(axis = 0).tolist()
+        return pygame.Rect(left, top, right - left, bottom - top).clip(surface.get_rect())
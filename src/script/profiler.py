@@ -0,0 +1,204 @@
+import time
+import pygame
+
+from collections import deque
+
+from src.script.loader import NAME_SPACE, STGS, loadSysFont
+
+class Scope:
+    """
+    Times a named part of the frame while used as a context manager.
+
+    Attributes:
+        profiler (Profiler): The profiler the time is added to.
+        name (str): The name of the scope.
+        start (float): When the scope was entered.
+    """
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self.profiler: Profiler = profiler
+        self.name: str = name
+        self.start: float = 0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *args) -> None:
+        times: dict[str, float] = self.profiler.times
+        times[self.name] = times.get(self.name, 0) + time.perf_counter() - self.start
+
+class NullScope:
+    """A scope that does nothing, handed out while profiling is disabled."""
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *args) -> None:
+        pass
+
+NULL_SCOPE: NullScope = NullScope()
+
+class Profiler:
+    """
+    Collects the time spent in named scopes and named counters every frame, and draws them as an overlay.
+
+    While disabled, scope hands out a shared scope that does nothing, and
+    hot paths are expected to check enabled before counting anything.
+
+    Attributes:
+        enabled (bool): Flag indicating whether anything is collected.
+        historyLength (int): The number of frames the graphs show.
+        times (dict[str, float]): Seconds spent in each scope this frame.
+        counters (dict[str, int]): Counters of this frame.
+        frameTimes (deque[float]): Seconds each of the last frames took.
+        scopeHistory (dict[str, deque[float]]): Seconds spent in each scope in the last frames.
+        lastCounters (dict[str, int]): The counters of the last finished frame.
+    """
+    # Scopes drawn stacked in the frame time graph, from the bottom up
+    GRAPH_SCOPES: dict[str, tuple[int]] = {
+        "update": (80, 200, 120),
+        "render": (80, 140, 230),
+        "present": (230, 180, 60)
+    }
+    GRAPH_SIZE: tuple[int] = (240, 80)
+    PADDING: int = 8
+    LINE_HEIGHT: int = 14
+
+    def __init__(self, enabled: bool = STGS["profiling"], historyLength: int = STGS["profilerHistory"]) -> None:
+        """
+        Initialize a Profiler object.
+
+        Args:
+            enabled (bool, optional): Flag indicating whether anything is collected. Defaults to the settings.
+            historyLength (int, optional): The number of frames the graphs show. Defaults to the settings.
+        """
+        self.enabled: bool = enabled
+        self.historyLength: int = historyLength
+        self.scopes: dict[str, Scope] = {}
+        self.times: dict[str, float] = {}
+        self.counters: dict[str, int] = {}
+        self.frameTimes: deque[float] = deque(maxlen = historyLength)
+        self.scopeHistory: dict[str, deque[float]] = {}
+        self.lastCounters: dict[str, int] = {}
+        self.frameStart: float = time.perf_counter()
+        self.font: pygame.font.Font | None = None
+
+    def toggle(self) -> None:
+        """Switch collecting and the overlay on or off, starting with empty graphs."""
+        self.enabled = not self.enabled
+        self.frameTimes.clear()
+        self.scopeHistory.clear()
+        self.times = {}
+        self.counters = {}
+        self.frameStart = time.perf_counter()
+
+    def scope(self, name: str) -> Scope | NullScope:
+        """
+        Get a context manager timing a named part of the frame.
+
+        Args:
+            name (str): The name of the scope, time of scopes with the same name adds up.
+
+        Returns:
+            Scope | NullScope: The scope, one that does nothing while disabled.
+        """
+        if not self.enabled:
+            return NULL_SCOPE
+        if name not in self.scopes:
+            self.scopes[name] = Scope(self, name)
+        return self.scopes[name]
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        Add to a named counter of this frame.
+
+        Args:
+            name (str): The name of the counter.
+            amount (int, optional): The amount to add. Defaults to 1.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def endFrame(self) -> None:
+        """Finish the frame, moving its times and counters into the history."""
+        if not self.enabled:
+            return
+
+        now: float = time.perf_counter()
+        self.frameTimes.append(now - self.frameStart)
+        self.frameStart = now
+
+        for name in self.times.keys() | self.scopeHistory.keys():
+            if name not in self.scopeHistory:
+                self.scopeHistory[name] = deque([0] * (len(self.frameTimes) - 1), maxlen = self.historyLength)
+            self.scopeHistory[name].append(self.times.get(name, 0))
+
+        self.lastCounters = self.counters
+        self.times = {}
+        self.counters = {}
+
+    def average(self, name: str) -> float:
+        """Return the average seconds a scope took per frame in the history."""
+        history: deque[float] = self.scopeHistory.get(name, ())
+        return sum(history) / len(history) if history else 0
+
+    def renderOverlay(self, surface: pygame.Surface) -> pygame.Rect | None:
+        """
+        Draw the frame time graph, the average time of each scope and the counters of the last frame.
+
+        Args:
+            surface (pygame.Surface): The surface to draw onto.
+
+        Returns:
+            pygame.Rect | None: The area of the surface that was drawn to, None while disabled.
+        """
+        if not self.enabled:
+            return None
+        if self.font is None:
+            self.font = loadSysFont("arial", size = 12)
+
+        lines: list[str] = []
+        if self.frameTimes:
+            average: float = sum(self.frameTimes) / len(self.frameTimes)
+            lines.append(f"frame {average * 1000:.2f} ms  max {max(self.frameTimes) * 1000:.2f} ms  {1 / average if average else 0:.0f} FPS")
+        for name in sorted(self.scopeHistory, key = self.average, reverse = True):
+            lines.append(f"{name} {self.average(name) * 1000:.3f} ms")
+        for name, value in sorted(self.lastCounters.items()):
+            lines.append(f"{name}: {value}")
+
+        width: int = self.GRAPH_SIZE[0] + self.PADDING * 2
+        height: int = self.GRAPH_SIZE[1] + self.PADDING * 3 + self.LINE_HEIGHT * len(lines)
+        panel: pygame.Rect = pygame.Rect(surface.get_width() - width - self.PADDING, self.PADDING, width, height)
+        surface.fill(NAME_SPACE["color"]["mainTheme"], panel)
+
+        # Columns of the graph are scaled so two frame budgets fill its height
+        graph: pygame.Rect = pygame.Rect(panel.x + self.PADDING, panel.y + self.PADDING, *self.GRAPH_SIZE)
+        scale: float = graph.height / (2 / STGS["FPS"])
+        columnWidth: float = graph.width / self.historyLength
+        offset: int = self.historyLength - len(self.frameTimes)
+        for index, frameTime in enumerate(self.frameTimes):
+            x: int = int(graph.x + (offset + index) * columnWidth)
+            bottom: int = graph.bottom
+            top: int = max(graph.top, int(bottom - frameTime * scale))
+            pygame.draw.line(surface, NAME_SPACE["color"]["buttonHover"], (x, bottom), (x, top))
+
+            # Known parts of the frame are stacked over the total
+            for name, color in self.GRAPH_SCOPES.items():
+                if name not in self.scopeHistory or index - len(self.frameTimes) < -len(self.scopeHistory[name]):
+                    continue
+                scopeHeight: int = int(self.scopeHistory[name][index - len(self.frameTimes)] * scale)
+                if scopeHeight:
+                    pygame.draw.line(surface, color, (x, bottom), (x, max(graph.top, bottom - scopeHeight)))
+                bottom -= scopeHeight
+        budgetY: int = int(graph.bottom - scale / STGS["FPS"])
+        pygame.draw.line(surface, NAME_SPACE["color"]["pink"], (graph.x, budgetY), (graph.right, budgetY))
+
+        y: int = graph.bottom + self.PADDING
+        for line in lines:
+            surface.blit(self.font.render(line, True, NAME_SPACE["color"]["text"]), (graph.x, y))
+            y += self.LINE_HEIGHT
+
+        return panel
+
+PROFILER: Profiler = Profiler()
@@ -0,0 +1,290 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+
+from array import array
+
+from src.script.log import logMSG, logError, logSuccess
+from src.script.chunk import Chunk, CHUNK_SIZE, CHUNK_AREA, BLOCK_NAMES, blockId
+
+# Layout of a region file:
+#     header  | magic, version, chunk size, offset and length of the trailer
+#     payload | one per chunk, appended on every save
+#     trailer | block palette and chunk index, appended on every save
+# The header is the only part ever overwritten, so a save is committed by
+# rewriting the trailer pointer after everything else is on disk.
+MAGIC: bytes = b"PGMAP\x00"
+VERSION: int = 1
+HEADER_FORMAT: str = "<6sHHQQ"
+HEADER_SIZE: int = 32
+INDEX_ENTRY_FORMAT: str = "<iiQI"
+INDEX_ENTRY_SIZE: int = struct.calcsize(INDEX_ENTRY_FORMAT)
+
+# Rewrite the whole file once this share of it is unreachable old payloads
+COMPACT_RATIO: float = 0.5
+
+def toLittleEndian(data: array) -> bytes:
+    """Return the bytes of an array in little endian order."""
+    if sys.byteorder == "big":
+        data = array(data.typecode, data)
+        data.byteswap()
+    return data.tobytes()
+
+def fromLittleEndian(typecode: str, data: bytes) -> array:
+    """Create an array from little endian bytes."""
+    result: array = array(typecode)
+    result.frombytes(data)
+    if sys.byteorder == "big":
+        result.byteswap()
+    return result
+
+class RegionFile:
+    """
+    A binary, chunked map file that is read through a memory map.
+
+    Attributes:
+        path (str): The path of the region file.
+        palette (list[str]): Block names in the order of the ids stored in the file.
+        index (dict[tuple[int], tuple[int]]): Maps chunk positions to the (offset, length) of their payloads.
+        lock (threading.RLock): Guards the file, so chunks can be read and written from any thread.
+    """
+    def __init__(self, path: str) -> None:
+        """
+        Open a region file, creating an empty one if it does not exist.
+
+        Args:
+            path (str): The path of the region file.
+
+        Raises:
+            ValueError: If the file is not a region file, or was written with another chunk size.
+        """
+        self.path: str = path
+        self.lock: threading.RLock = threading.RLock()
+        self.palette: list[str] = []
+        self.index: dict[tuple[int], tuple[int]] = {}
+
+        if not os.path.exists(path):
+            RegionFile.write(path, [])
+
+        self.file = open(path, mode = "r+b")
+        self.map: mmap.mmap = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+        self.readTrailer()
+
+    def readTrailer(self) -> None:
+        """Read the header, the palette and the chunk index."""
+        magic, version, chunkSize, trailerOffset, trailerLength = struct.unpack_from(HEADER_FORMAT, self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"\'{self.path}\' is not a version {VERSION} region file")
+        if chunkSize != CHUNK_SIZE:
+            raise ValueError(f"\'{self.path}\' has chunks of {chunkSize}, not {CHUNK_SIZE}")
+
+        # Filled in locals and swapped in at once, so other threads never see a half read index
+        cursor: int = trailerOffset
+        paletteLength: int = struct.unpack_from("<H", self.map, cursor)[0]
+        cursor += 2
+        palette: list[str] = []
+        for _ in range(paletteLength):
+            nameLength: int = self.map[cursor]
+            palette.append(self.map[cursor + 1:cursor + 1 + nameLength].decode("utf-8"))
+            cursor += 1 + nameLength
+
+        chunkCount: int = struct.unpack_from("<I", self.map, cursor)[0]
+        cursor += 4
+        index: dict[tuple[int], tuple[int]] = {}
+        for _ in range(chunkCount):
+            x, y, offset, length = struct.unpack_from(INDEX_ENTRY_FORMAT, self.map, cursor)
+            index[(x, y)] = (offset, length)
+            cursor += INDEX_ENTRY_SIZE
+
+        # File ids -> ids of the running game, and back
+        toGlobal: list[int] = [blockId(name) for name in palette]
+        toFile: dict[int, int] = {id: fileId for fileId, id in enumerate(toGlobal)}
+        self.palette = palette
+        self.index = index
+        self.toGlobal: list[int] = toGlobal
+        self.toFile: dict[int, int] = toFile
+        self.liveBytes: int = HEADER_SIZE + trailerLength + sum(length for offset, length in index.values())
+
+    def has(self, chunkPos: tuple[int]) -> bool:
+        """Return whether the file contains the chunk at the given chunk position."""
+        with self.lock:
+            return chunkPos in self.index
+
+    def readChunk(self, chunkPos: tuple[int]) -> Chunk | None:
+        """
+        Read a chunk from the file.
+
+        Args:
+            chunkPos (tuple[int]): The position of the chunk in chunk coordinates.
+
+        Returns:
+            Chunk | None: The chunk, or None if the file does not contain it.
+        """
+        with self.lock:
+            if chunkPos not in self.index:
+                return None
+            offset, length = self.index[chunkPos]
+            return self.decodeChunk(chunkPos, self.map[offset:offset + length])
+
+    def decodeChunk(self, chunkPos: tuple[int], payload: bytes) -> Chunk:
+        """Create a chunk from its payload."""
+        blocks: array = fromLittleEndian("H", payload[:2 * CHUNK_AREA])
+        if self.toGlobal != list(range(len(self.toGlobal))):
+            toGlobal: list[int] = self.toGlobal
+            blocks = array("H", [toGlobal[id] for id in blocks])
+        variants: array = array("B", payload[2 * CHUNK_AREA:3 * CHUNK_AREA])
+
+        cursor: int = 3 * CHUNK_AREA
+        durabilityCount: int = struct.unpack_from("<H", payload, cursor)[0]
+        cursor += 2
+        indices: array = fromLittleEndian("H", payload[cursor:cursor + 2 * durabilityCount])
+        cursor += 2 * durabilityCount
+        values: array = fromLittleEndian("i", payload[cursor:cursor + 4 * durabilityCount])
+
+        return Chunk(chunkPos, blocks, variants, dict(zip(indices, values)))
+
+    def encodeChunk(self, chunk: Chunk) -> bytes:
+        """Create the payload of a chunk, adding its new block names to the palette."""
+        for id in set(chunk.blocks):
+            if id not in self.toFile:
+                self.toFile[id] = len(self.palette)
+                self.palette.append(BLOCK_NAMES[id])
+                self.toGlobal.append(id)
+
+        blocks: array = chunk.blocks
+        if self.toGlobal != list(range(len(self.toGlobal))):
+            toFile: dict[int, int] = self.toFile
+            blocks = array("H", [toFile[id] for id in blocks])
+
+        return b"".join((
+            toLittleEndian(blocks),
+            chunk.variants.tobytes(),
+            struct.pack("<H", len(chunk.durability)),
+            toLittleEndian(array("H", chunk.durability.keys())),
+            toLittleEndian(array("i", chunk.durability.values()))
+        ))
+
+    def encodeTrailer(self) -> bytes:
+        """Create the trailer from the palette and the chunk index."""
+        parts: list[bytes] = [struct.pack("<H", len(self.palette))]
+        for name in self.palette:
+            encoded: bytes = name.encode("utf-8")
+            parts.append(struct.pack("<B", len(encoded)) + encoded)
+        parts.append(struct.pack("<I", len(self.index)))
+        for (x, y), (offset, length) in self.index.items():
+            parts.append(struct.pack(INDEX_ENTRY_FORMAT, x, y, offset, length))
+        return b"".join(parts)
+
+    def writeChunks(self, chunks: list[Chunk], removed: list[tuple[int]] = []) -> None:
+        """
+        Save changed chunks without touching the rest of the file.
+
+        The payloads and a new trailer are appended, then the header is pointed at
+        the new trailer, so a crash during saving leaves the previous save intact.
+
+        Args:
+            chunks (list[Chunk]): The chunks to write.
+            removed (list[tuple[int]], optional): Positions of chunks to drop from the file. Defaults to [].
+        """
+        with self.lock:
+            self.file.seek(0, os.SEEK_END)
+            offset: int = self.file.tell()
+            parts: list[bytes] = []
+            for chunk in chunks:
+                if not chunk.count:
+                    removed = [*removed, chunk.pos]
+                    continue
+                payload: bytes = self.encodeChunk(chunk)
+                self.index[chunk.pos] = (offset, len(payload))
+                parts.append(payload)
+                offset += len(payload)
+            for chunkPos in removed:
+                self.index.pop(chunkPos, None)
+
+            trailer: bytes = self.encodeTrailer()
+            self.file.write(b"".join(parts) + trailer)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+            self.file.seek(0)
+            self.file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, CHUNK_SIZE, offset, len(trailer)))
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+            self.map.close()
+            self.map = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+            self.liveBytes = HEADER_SIZE + len(trailer) + sum(length for offset, length in self.index.values())
+
+            if self.liveBytes < len(self.map) * COMPACT_RATIO:
+                self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the file without the payloads of old saves."""
+        with self.lock:
+            logMSG(f"Compacting \'{self.path}\' from {len(self.map)} to {self.liveBytes} bytes")
+            payloads: dict[tuple[int], bytes] = {
+                chunkPos: self.map[offset:offset + length] for chunkPos, (offset, length) in self.index.items()
+            }
+            # Windows can not replace a file that is still open
+            self.map.close()
+            self.file.close()
+            RegionFile.writeRaw(self.path, self.palette, payloads)
+
+            self.file = open(self.path, mode = "r+b")
+            self.map = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+            self.readTrailer()
+
+    def close(self) -> None:
+        """Close the file."""
+        with self.lock:
+            self.map.close()
+            self.file.close()
+
+    @staticmethod
+    def writeRaw(path: str, palette: list[str], payloads: dict[tuple[int], bytes]) -> None:
+        """
+        Write a whole region file from already encoded payloads.
+
+        The file is written next to its final place and then renamed over it.
+
+        Args:
+            path (str): The path of the region file.
+            palette (list[str]): Block names in the order of the ids in the payloads.
+            payloads (dict[tuple[int], bytes]): Encoded chunks keyed by chunk position.
+        """
+        region: RegionFile = RegionFile.__new__(RegionFile)
+        region.palette = palette
+        region.index = {}
+        offset: int = HEADER_SIZE
+        for chunkPos, payload in payloads.items():
+            region.index[chunkPos] = (offset, len(payload))
+            offset += len(payload)
+        trailer: bytes = region.encodeTrailer()
+
+        with open(f"{path}.tmp", mode = "wb") as file:
+            file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, CHUNK_SIZE, offset, len(trailer)).ljust(HEADER_SIZE, b"\x00"))
+            for payload in payloads.values():
+                file.write(payload)
+            file.write(trailer)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(f"{path}.tmp", path)
+
+    @staticmethod
+    def write(path: str, chunks: list[Chunk]) -> None:
+        """
+        Write a whole region file from chunks.
+
+        Args:
+            path (str): The path of the region file.
+            chunks (list[Chunk]): The chunks to write.
+        """
+        # The ids of the running game are used as file ids, so no translation is needed
+        region: RegionFile = RegionFile.__new__(RegionFile)
+        region.palette = list(BLOCK_NAMES)
+        region.toGlobal = list(range(len(BLOCK_NAMES)))
+        region.toFile = {id: id for id in region.toGlobal}
+        payloads: dict[tuple[int], bytes] = {chunk.pos: region.encodeChunk(chunk) for chunk in chunks if chunk.count}
+        RegionFile.writeRaw(path, region.palette, payloads)
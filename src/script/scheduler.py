@@ -0,0 +1,103 @@
+import pygame
+
+from src.script.loader import STGS
+from src.script.chunk import CHUNK_SIZE
+
+# How often an entity is simulated, by its distance from the camera
+NEAR: int = 0
+LAZY: int = 1
+FROZEN: int = 2
+
+class RegionScheduler:
+    """
+    Decides how often things are simulated by how far their region is from the camera.
+
+    The regions are the chunks. The visible ones and the ones within the near radius of them are
+    simulated every tick, the ones within the lazy radius every lazyInterval ticks, and the ones
+    further away not at all. Lazy regions take turns, so their work is spread over the ticks.
+
+    Attributes:
+        nearRadius (int): Regions this far from the visible ones are simulated every tick.
+        lazyRadius (int): Regions this far from the visible ones are simulated every lazyInterval ticks.
+        lazyInterval (int): The number of ticks between two updates of a lazy region.
+        regionPixels (int): The width and height of a region in pixels.
+        visible (tuple[int]): The leftmost, topmost, rightmost and bottommost visible regions.
+    """
+    def __init__(self, nearRadius: int = STGS["simulationNearRadius"], lazyRadius: int = STGS["simulationLazyRadius"], lazyInterval: int = STGS["lazyTickInterval"]) -> None:
+        """
+        Initialize a RegionScheduler object.
+
+        Args:
+            nearRadius (int, optional): Regions this far from the visible ones are simulated every tick. Defaults to the settings.
+            lazyRadius (int, optional): Regions this far from the visible ones are simulated every lazyInterval ticks. Defaults to the settings.
+            lazyInterval (int, optional): The number of ticks between two updates of a lazy region. Defaults to the settings.
+        """
+        assert lazyRadius >= nearRadius, "Lazy regions must be further than near ones"
+        # Simulated regions past the unload radius would have their chunks evicted under them
+        assert lazyRadius < STGS["chunkUnloadRadius"], "Lazy regions must be closer than the chunk unload radius"
+
+        self.nearRadius: int = nearRadius
+        self.lazyRadius: int = lazyRadius
+        self.lazyInterval: int = lazyInterval
+        self.regionPixels: int = CHUNK_SIZE * STGS["tileSize"]
+        self.visible: tuple[int] = (0, 0, 0, 0)
+
+    def update(self, scroll: tuple[float], windowSize: tuple[int]) -> None:
+        """
+        Follow the camera.
+
+        Args:
+            scroll (tuple[float]): The camera offset.
+            windowSize (tuple[int]): The size of the window in pixels.
+        """
+        self.visible = (
+            int(scroll[0] // self.regionPixels), int(scroll[1] // self.regionPixels),
+            int((scroll[0] + windowSize[0]) // self.regionPixels), int((scroll[1] + windowSize[1]) // self.regionPixels)
+        )
+
+    def regionOf(self, pos: tuple[float]) -> tuple[int]:
+        """Return the region a position in pixels is in."""
+        return (int(pos[0] // self.regionPixels), int(pos[1] // self.regionPixels))
+
+    def tierOf(self, region: tuple[int]) -> int:
+        """Return whether a region is NEAR, LAZY or FROZEN."""
+        distance: int = max(
+            self.visible[0] - region[0], region[0] - self.visible[2],
+            self.visible[1] - region[1], region[1] - self.visible[3]
+        )
+        if distance <= self.nearRadius:
+            return NEAR
+        if distance <= self.lazyRadius:
+            return LAZY
+        return FROZEN
+
+    def ticksDue(self, pos: tuple[float], tick: int) -> int:
+        """
+        Return how many ticks something at a position is simulated for this tick.
+
+        Lazy regions are due once every lazyInterval ticks and then catch up on all of them,
+        so what is in them moves as fast as in the near ones, only in bigger steps.
+
+        Args:
+            pos (tuple[float]): The position in pixels.
+            tick (int): The number of the current tick.
+
+        Returns:
+            int: The ticks to simulate, 0 if it is not due this tick.
+        """
+        region: tuple[int] = self.regionOf(pos)
+        tier: int = self.tierOf(region)
+        if tier == NEAR:
+            return 1
+        if tier == LAZY and (tick + region[0] + region[1]) % self.lazyInterval == 0:
+            return self.lazyInterval
+        return 0
+
+    def simulatedRect(self) -> pygame.Rect:
+        """Return the area in pixels that is simulated at all, the near and lazy regions."""
+        return pygame.Rect(
+            (self.visible[0] - self.lazyRadius) * self.regionPixels,
+            (self.visible[1] - self.lazyRadius) * self.regionPixels,
+            (self.visible[2] - self.visible[0] + 1 + self.lazyRadius * 2) * self.regionPixels,
+            (self.visible[3] - self.visible[1] + 1 + self.lazyRadius * 2) * self.regionPixels
+        )
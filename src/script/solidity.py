@@ -0,0 +1,107 @@
+from src.script.chunk import Chunk, CHUNK_SIZE, blockId, chunkPosOf, localIndexOf
+from src.script.tileEvents import TileChange
+
+class SolidityMap:
+    """
+    Packed bitmaps of the solid tiles of the chunks in memory.
+
+    Every chunk is stored as one integer per row, bit x of a row being set if the tile in
+    column x is solid, so a whole row of a collision query is a single mask.
+
+    Attributes:
+        solidIds (set[int]): The block ids that are solid.
+        rows (dict[tuple[int], list[int]]): The row bitmaps of every chunk in memory.
+    """
+    def __init__(self, solidIds: set[int]) -> None:
+        """
+        Initialize a SolidityMap object.
+
+        Args:
+            solidIds (set[int]): The block ids that are solid.
+        """
+        self.solidIds: set[int] = solidIds
+        self.rows: dict[tuple[int], list[int]] = {}
+
+    def clear(self) -> None:
+        """Forget every chunk."""
+        self.rows.clear()
+
+    def addChunk(self, chunk: Chunk) -> None:
+        """
+        Build the bitmap of a chunk that was brought into memory.
+
+        Args:
+            chunk (Chunk): The chunk to build the bitmap of.
+        """
+        solidIds: set[int] = self.solidIds
+        blocks = chunk.blocks
+        rows: list[int] = []
+        for rowStart in range(0, CHUNK_SIZE * CHUNK_SIZE, CHUNK_SIZE):
+            row: int = 0
+            for x in range(CHUNK_SIZE):
+                if blocks[rowStart + x] in solidIds:
+                    row |= 1 << x
+            rows.append(row)
+        self.rows[chunk.pos] = rows
+
+    def removeChunk(self, chunkPos: tuple[int]) -> None:
+        """
+        Forget the bitmap of a chunk that left memory.
+
+        Args:
+            chunkPos (tuple[int]): The position of the chunk in chunk coordinates.
+        """
+        self.rows.pop(chunkPos, None)
+
+    def onTileChanges(self, changes: list[TileChange]) -> None:
+        """Update the bits of changed tiles, subscribed to the tile events of the tilemap."""
+        for change in changes:
+            rows: list[int] | None = self.rows.get(chunkPosOf(change.pos))
+            if rows is None:
+                continue
+            index: int = localIndexOf(change.pos)
+            bit: int = 1 << (index % CHUNK_SIZE)
+            if change.new is not None and blockId(change.new["block"]) in self.solidIds:
+                rows[index // CHUNK_SIZE] |= bit
+            else:
+                rows[index // CHUNK_SIZE] &= ~bit
+
+    def isSolid(self, pos: tuple[int]) -> bool:
+        """Return whether the tile at the position is solid, tiles of chunks not in memory are not."""
+        rows: list[int] | None = self.rows.get(chunkPosOf(pos))
+        if rows is None:
+            return False
+        index: int = localIndexOf(pos)
+        return bool(rows[index // CHUNK_SIZE] >> (index % CHUNK_SIZE) & 1)
+
+    def solidCells(self, left: int, top: int, right: int, bottom: int) -> list[tuple[int]]:
+        """
+        Get the solid tiles inside an area of tiles, row by row.
+
+        Args:
+            left (int): The leftmost tile column of the area.
+            top (int): The topmost tile row of the area.
+            right (int): The rightmost tile column of the area.
+            bottom (int): The bottommost tile row of the area.
+
+        Returns:
+            list[tuple[int]]: The positions of the solid tiles.
+        """
+        cells: list[tuple[int]] = []
+        for y in range(top, bottom + 1):
+            chunkY: int = y // CHUNK_SIZE
+            rowIndex: int = y - chunkY * CHUNK_SIZE
+            for chunkX in range(left // CHUNK_SIZE, right // CHUNK_SIZE + 1):
+                rows: list[int] | None = self.rows.get((chunkX, chunkY))
+                if rows is None:
+                    continue
+
+                originX: int = chunkX * CHUNK_SIZE
+                firstBit: int = max(left - originX, 0)
+                lastBit: int = min(right - originX, CHUNK_SIZE - 1)
+                row: int = rows[rowIndex] >> firstBit & ((1 << (lastBit - firstBit + 1)) - 1)
+                while row:
+                    lowest: int = row & -row
+                    cells.append((originX + firstBit + lowest.bit_length() - 1, y))
+                    row ^= lowest
+        return cells
@@ -0,0 +1,187 @@
+import pygame
+
+from src.script.profiler import PROFILER
+
+class SpatialHash:
+    """
+    A uniform grid of buckets the entities register their hitboxes in, so interaction
+    checks only look at the entities near each other instead of every pair.
+
+    An entity is kept in the bucket of every cell its hitbox overlaps. Moving it only
+    touches the buckets when the range of overlapped cells changed.
+
+    Attributes:
+        cellSize (int): The width and height of a cell in pixels.
+        cells (dict[tuple[int], set[object]]): The entities overlapping each cell, by cell position.
+        rects (dict[object, pygame.Rect]): The hitbox of every registered entity.
+        spans (dict[object, tuple[int]]): The leftmost, topmost, rightmost and bottommost cells of every registered entity.
+    """
+    def __init__(self, cellSize: int) -> None:
+        """
+        Initialize a SpatialHash object.
+
+        Args:
+            cellSize (int): The width and height of a cell in pixels, about the size of the largest common entity.
+        """
+        self.cellSize: int = cellSize
+        self.cells: dict[tuple[int], set[object]] = {}
+        self.rects: dict[object, pygame.Rect] = {}
+        self.spans: dict[object, tuple[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rects)
+
+    def __contains__(self, entity: object) -> bool:
+        return entity in self.rects
+
+    def span(self, rect: pygame.Rect) -> tuple[int]:
+        """Return the leftmost, topmost, rightmost and bottommost cells a rect overlaps."""
+        return (
+            rect.left // self.cellSize, rect.top // self.cellSize,
+            (rect.right - 1) // self.cellSize, (rect.bottom - 1) // self.cellSize
+        )
+
+    def clear(self) -> None:
+        """Forget every entity."""
+        self.cells.clear()
+        self.rects.clear()
+        self.spans.clear()
+
+    def insert(self, entity: object, rect: pygame.Rect) -> None:
+        """
+        Register an entity, or move it if it already is.
+
+        Args:
+            entity (object): The entity, compared by identity.
+            rect (pygame.Rect): The hitbox of the entity.
+        """
+        if entity in self.rects:
+            self.move(entity, rect)
+            return
+
+        span: tuple[int] = self.span(rect)
+        self.rects[entity] = rect
+        self.spans[entity] = span
+        self.addToCells(entity, span)
+
+    def move(self, entity: object, rect: pygame.Rect) -> None:
+        """
+        Update the hitbox of a registered entity.
+
+        Args:
+            entity (object): The entity.
+            rect (pygame.Rect): The new hitbox of the entity.
+        """
+        self.rects[entity] = rect
+        span: tuple[int] = self.span(rect)
+        if span != self.spans[entity]:
+            self.removeFromCells(entity, self.spans[entity])
+            self.spans[entity] = span
+            self.addToCells(entity, span)
+
+    def remove(self, entity: object) -> None:
+        """
+        Forget an entity, nothing happens if it is not registered.
+
+        Args:
+            entity (object): The entity.
+        """
+        span: tuple[int] | None = self.spans.pop(entity, None)
+        if span is None:
+            return
+        del self.rects[entity]
+        self.removeFromCells(entity, span)
+
+    def addToCells(self, entity: object, span: tuple[int]) -> None:
+        """Put an entity into the buckets of every cell in a span."""
+        for cellX in range(span[0], span[2] + 1):
+            for cellY in range(span[1], span[3] + 1):
+                self.cells.setdefault((cellX, cellY), set()).add(entity)
+
+    def removeFromCells(self, entity: object, span: tuple[int]) -> None:
+        """Take an entity out of the buckets of every cell in a span, dropping emptied buckets."""
+        for cellX in range(span[0], span[2] + 1):
+            for cellY in range(span[1], span[3] + 1):
+                bucket: set[object] = self.cells[(cellX, cellY)]
+                bucket.discard(entity)
+                if not bucket:
+                    del self.cells[(cellX, cellY)]
+
+    def candidates(self, span: tuple[int]) -> set[object]:
+        """Return the entities of every cell in a span, without checking their hitboxes."""
+        found: set[object] = set()
+        for cellX in range(span[0], span[2] + 1):
+            for cellY in range(span[1], span[3] + 1):
+                bucket: set[object] | None = self.cells.get((cellX, cellY))
+                if bucket:
+                    found |= bucket
+
+        if PROFILER.enabled:
+            PROFILER.count("broadphaseCandidates", len(found))
+        return found
+
+    def queryRect(self, rect: pygame.Rect, kind: type | None = None) -> list[object]:
+        """
+        Get the entities whose hitbox overlaps a rect.
+
+        Args:
+            rect (pygame.Rect): The rect to check.
+            kind (type | None, optional): Only return entities of this class. Defaults to None.
+
+        Returns:
+            list[object]: The overlapping entities.
+        """
+        return [
+            entity for entity in self.candidates(self.span(rect))
+            if (kind is None or isinstance(entity, kind)) and self.rects[entity].colliderect(rect)
+        ]
+
+    def queryRadius(self, center: tuple[float], radius: float, kind: type | None = None) -> list[object]:
+        """
+        Get the entities whose hitbox has a point closer to a center than a radius.
+
+        Args:
+            center (tuple[float]): The center of the circle.
+            radius (float): The radius of the circle.
+            kind (type | None, optional): Only return entities of this class. Defaults to None.
+
+        Returns:
+            list[object]: The entities inside the circle.
+        """
+        bounds: pygame.Rect = pygame.Rect(center[0] - radius, center[1] - radius, radius * 2 + 1, radius * 2 + 1)
+        radiusSquared: float = radius * radius
+        found: list[object] = []
+        for entity in self.candidates(self.span(bounds)):
+            if kind is not None and not isinstance(entity, kind):
+                continue
+            # The point of the hitbox closest to the center
+            rect: pygame.Rect = self.rects[entity]
+            dx: float = center[0] - min(max(center[0], rect.left), rect.right)
+            dy: float = center[1] - min(max(center[1], rect.top), rect.bottom)
+            if dx * dx + dy * dy <= radiusSquared:
+                found.append(entity)
+        return found
+
+    def pairs(self, kind: type | None = None) -> list[tuple[object]]:
+        """
+        Get every pair of registered entities whose hitboxes overlap.
+
+        Args:
+            kind (type | None, optional): Only pair entities of this class. Defaults to None.
+
+        Returns:
+            list[tuple[object]]: The overlapping pairs, each one listed once.
+        """
+        found: list[tuple[object]] = []
+        seen: set[tuple[int]] = set()
+        for bucket in self.cells.values():
+            if len(bucket) < 2:
+                continue
+            entities: list[object] = [entity for entity in bucket if kind is None or isinstance(entity, kind)]
+            for index, first in enumerate(entities):
+                for second in entities[index + 1:]:
+                    key: tuple[int] = (id(first), id(second)) if id(first) < id(second) else (id(second), id(first))
+                    if key not in seen and self.rects[first].colliderect(self.rects[second]):
+                        seen.add(key)
+                        found.append((first, second))
+        return found
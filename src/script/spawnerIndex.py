@@ -0,0 +1,120 @@
+from src.script.chunk import Chunk, CHUNK_SIZE, blockId, chunkPosOf
+from src.script.tileEvents import TileChange
+
+class SpawnerIndex:
+    """
+    The tiles that spawn particles, grouped by chunk and particle species.
+
+    Only chunks in memory are indexed, they are scanned once when they are added,
+    then kept up to date tile by tile.
+
+    Attributes:
+        rules (dict[int, list[tuple[int | None, str]]]): Maps block ids to (variant, species) pairs, a variant of None matching every variant.
+        chunks (dict[tuple[int], dict[str, set[tuple[int]]]]): Positions of the spawners of each indexed chunk, by species.
+    """
+    def __init__(self, idPairSpawners: dict[str, list[tuple[str | int]]], anyVariantSpawners: dict[str, list[str]]) -> None:
+        """
+        Initialize a SpawnerIndex object.
+
+        Args:
+            idPairSpawners (dict[str, list[tuple[str | int]]]): Maps particle species to the (block, variant) pairs spawning them.
+            anyVariantSpawners (dict[str, list[str]]): Maps particle species to the blocks spawning them in any variant.
+        """
+        self.rules: dict[int, list[tuple[int | None, str]]] = {}
+        for species, pairs in idPairSpawners.items():
+            for block, variant in pairs:
+                self.rules.setdefault(blockId(block), []).append((variant, species))
+        for species, blocks in anyVariantSpawners.items():
+            for block in blocks:
+                self.rules.setdefault(blockId(block), []).append((None, species))
+
+        self.chunks: dict[tuple[int], dict[str, set[tuple[int]]]] = {}
+
+    def speciesOf(self, id: int, variant: int) -> list[str]:
+        """Return the particle species a tile spawns."""
+        return [species for ruleVariant, species in self.rules.get(id, ()) if ruleVariant is None or ruleVariant == variant]
+
+    def clear(self) -> None:
+        """Forget every indexed chunk."""
+        self.chunks.clear()
+
+    def addChunk(self, chunk: Chunk) -> None:
+        """
+        Index the spawners of a chunk that was brought into memory.
+
+        Args:
+            chunk (Chunk): The chunk to index.
+        """
+        spawners: dict[str, set[tuple[int]]] = {}
+        rules: dict[int, list[tuple[int | None, str]]] = self.rules
+        originX: int = chunk.pos[0] * CHUNK_SIZE
+        originY: int = chunk.pos[1] * CHUNK_SIZE
+        for index, id in enumerate(chunk.blocks):
+            if id in rules:
+                for species in self.speciesOf(id, chunk.variants[index]):
+                    spawners.setdefault(species, set()).add((originX + index % CHUNK_SIZE, originY + index // CHUNK_SIZE))
+        self.chunks[chunk.pos] = spawners
+
+    def removeChunk(self, chunkPos: tuple[int]) -> None:
+        """
+        Forget the spawners of a chunk that left memory.
+
+        Args:
+            chunkPos (tuple[int]): The position of the chunk in chunk coordinates.
+        """
+        self.chunks.pop(chunkPos, None)
+
+    def updateTile(self, pos: tuple[int], id: int, variant: int) -> None:
+        """
+        Update the index after a tile changed.
+
+        Args:
+            pos (tuple[int]): The position of the tile.
+            id (int): The new block id of the tile, 0 if it was removed.
+            variant (int): The new variant of the tile.
+        """
+        spawners: dict[str, set[tuple[int]]] | None = self.chunks.get(chunkPosOf(pos))
+        if spawners is None:
+            return
+
+        for positions in spawners.values():
+            positions.discard(pos)
+        for species in self.speciesOf(id, variant):
+            spawners.setdefault(species, set()).add(pos)
+
+    def onTileChanges(self, changes: list[TileChange]) -> None:
+        """Update the index after tiles changed, subscribed to the tile events of the tilemap."""
+        for change in changes:
+            if change.new is None:
+                self.updateTile(change.pos, 0, 0)
+            else:
+                self.updateTile(change.pos, blockId(change.new["block"]), change.new["variant"])
+
+    def inArea(self, left: int, top: int, right: int, bottom: int) -> list[tuple[str, tuple[int]]]:
+        """
+        Get the spawners inside an area of tiles.
+
+        Args:
+            left (int): The leftmost tile column of the area.
+            top (int): The topmost tile row of the area.
+            right (int): The rightmost tile column of the area.
+            bottom (int): The bottommost tile row of the area.
+
+        Returns:
+            list[tuple[str, tuple[int]]]: (species, position) pairs of the spawners in the area.
+        """
+        found: list[tuple[str, tuple[int]]] = []
+        for chunkX in range(left // CHUNK_SIZE, right // CHUNK_SIZE + 1):
+            for chunkY in range(top // CHUNK_SIZE, bottom // CHUNK_SIZE + 1):
+                spawners: dict[str, set[tuple[int]]] | None = self.chunks.get((chunkX, chunkY))
+                if not spawners:
+                    continue
+                for species, positions in spawners.items():
+                    for pos in positions:
+                        if left <= pos[0] <= right and top <= pos[1] <= bottom:
+                            found.append((species, pos))
+        return found
+
+    def count(self) -> int:
+        """Return the number of indexed spawners."""
+        return sum(len(positions) for spawners in self.chunks.values() for positions in spawners.values())
@@ -0,0 +1,63 @@
+import pygame
+
+from collections import OrderedDict
+
+from src.script.loader import STGS, loadSysFont, finalizeImage
+
+class TextCache:
+    """
+    A bounded cache of rendered text, evicting the least recently drawn text first.
+
+    The same strings, like the amounts of the items in the inventory, are drawn every frame,
+    rendering them once and blitting the result is much cheaper than rendering them again.
+
+    Attributes:
+        capacity (int): The maximum number of rendered texts kept.
+        entries (OrderedDict[tuple, pygame.Surface]): The rendered texts by font, text and color, least recently used first.
+        stats (dict[str, int]): Counters of hits and renders.
+    """
+    def __init__(self, capacity: int = STGS["textCacheSize"]) -> None:
+        """
+        Initialize a TextCache object.
+
+        Args:
+            capacity (int, optional): The maximum number of rendered texts kept. Defaults to the settings.
+        """
+        self.capacity: int = capacity
+        self.entries: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.stats: dict[str, int] = {"hits": 0, "renders": 0}
+
+    def clear(self) -> None:
+        """Drop every rendered text."""
+        self.entries.clear()
+
+    def render(self, text: str, color: list[int], fontName: str = "arial", fontSize: int = 16, bold: bool = False, italic: bool = False) -> pygame.Surface:
+        """
+        Get a text rendered with antialiasing, rendering it only if it is not cached.
+
+        Args:
+            text (str): The text.
+            color (list[int]): The color of the text.
+            fontName (str, optional): The name of the font. Defaults to "arial".
+            fontSize (int, optional): The size of the font. Defaults to 16.
+            bold (bool, optional): Whether the font is bold. Defaults to False.
+            italic (bool, optional): Whether the font is italic. Defaults to False.
+
+        Returns:
+            pygame.Surface: The rendered text, it is shared and must not be drawn on.
+        """
+        key: tuple = (fontName, fontSize, bold, italic, text, tuple(color))
+        rendered: pygame.Surface | None = self.entries.get(key)
+        if rendered is not None:
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return rendered
+
+        rendered = finalizeImage(loadSysFont(fontName, fontSize, bold, italic).render(text, True, color))
+        self.entries[key] = rendered
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last = False)
+        self.stats["renders"] += 1
+        return rendered
+
+TEXT_CACHE: TextCache = TextCache()
@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from src.script.chunk import Chunk
+
+@dataclass(slots = True)
+class TileChange:
+    """
+    A tile that changed since the last delivery.
+
+    Attributes:
+        pos (tuple[int]): The position of the tile.
+        old (dict[str, str | int] | None): The tile before the first change of the batch, None if there was none.
+        new (dict[str, str | int] | None): The tile after the last change of the batch, None if it was removed.
+    """
+    pos: tuple[int]
+    old: dict[str, str | int] | None
+    new: dict[str, str | int] | None
+
+class TileEvents:
+    """
+    Tells the structures derived from a tilemap what changed in it.
+
+    Tile changes are collected and delivered in batches by flush, several changes
+    of the same tile in a batch are merged into one. Listeners that must never be
+    stale, like collision data, can ask for every change as it happens instead.
+    Chunks entering and leaving memory are delivered at once, so listeners can
+    index a chunk before it is used.
+
+    Attributes:
+        tileListeners (list[Callable[[list[TileChange]], None]]): Called with every batch of tile changes.
+        immediateTileListeners (list[Callable[[list[TileChange]], None]]): Called with every single tile change.
+        chunkLoadListeners (list[Callable[[Chunk], None]]): Called with every chunk brought into memory.
+        chunkUnloadListeners (list[Callable[[tuple[int]], None]]): Called with the position of every chunk dropped from memory.
+        pending (dict[tuple[int], TileChange]): The changes waiting for the next flush, by position.
+    """
+    def __init__(self) -> None:
+        self.tileListeners: list[Callable[[list[TileChange]], None]] = []
+        self.immediateTileListeners: list[Callable[[list[TileChange]], None]] = []
+        self.chunkLoadListeners: list[Callable[[Chunk], None]] = []
+        self.chunkUnloadListeners: list[Callable[[tuple[int]], None]] = []
+        self.pending: dict[tuple[int], TileChange] = {}
+
+    def subscribe(
+        self,
+        onTiles: Callable[[list[TileChange]], None] | None = None,
+        onChunkLoad: Callable[[Chunk], None] | None = None,
+        onChunkUnload: Callable[[tuple[int]], None] | None = None,
+        immediate: bool = False
+    ) -> None:
+        """
+        Register the callbacks of a listener, any of them may be left out.
+
+        Args:
+            onTiles (Callable[[list[TileChange]], None] | None, optional): Called with every batch of tile changes. Defaults to None.
+            onChunkLoad (Callable[[Chunk], None] | None, optional): Called with every chunk brought into memory. Defaults to None.
+            onChunkUnload (Callable[[tuple[int]], None] | None, optional): Called with the position of every chunk dropped from memory. Defaults to None.
+            immediate (bool, optional): Flag indicating whether onTiles is called for every change as it happens, instead of in batches. Defaults to False.
+        """
+        if onTiles is not None:
+            (self.immediateTileListeners if immediate else self.tileListeners).append(onTiles)
+        if onChunkLoad is not None:
+            self.chunkLoadListeners.append(onChunkLoad)
+        if onChunkUnload is not None:
+            self.chunkUnloadListeners.append(onChunkUnload)
+
+    def unsubscribe(self, callback: Callable) -> None:
+        """Remove a callback registered with subscribe."""
+        for listeners in (self.tileListeners, self.immediateTileListeners, self.chunkLoadListeners, self.chunkUnloadListeners):
+            if callback in listeners:
+                listeners.remove(callback)
+
+    def tileChanged(self, pos: tuple[int], old: dict[str, str | int] | None, new: dict[str, str | int] | None) -> None:
+        """
+        Record a tile change for the next flush.
+
+        Args:
+            pos (tuple[int]): The position of the tile.
+            old (dict[str, str | int] | None): The tile before the change, None if there was none.
+            new (dict[str, str | int] | None): The tile after the change, None if it was removed.
+        """
+        for listener in self.immediateTileListeners:
+            listener([TileChange(pos, old, new)])
+
+        change: TileChange | None = self.pending.get(pos)
+        if change is None:
+            self.pending[pos] = TileChange(pos, old, new)
+        else:
+            change.new = new
+
+    def chunkLoaded(self, chunk: Chunk) -> None:
+        """Tell the listeners a chunk was brought into memory."""
+        for listener in self.chunkLoadListeners:
+            listener(chunk)
+
+    def chunkUnloaded(self, chunkPos: tuple[int]) -> None:
+        """Tell the listeners a chunk was dropped from memory."""
+        for listener in self.chunkUnloadListeners:
+            listener(chunkPos)
+
+    def flush(self) -> None:
+        """Deliver the tile changes recorded since the last flush."""
+        if not self.pending:
+            return
+        changes: list[TileChange] = list(self.pending.values())
+        self.pending = {}
+        for listener in self.tileListeners:
+            listener(changes)
+
+    def discard(self) -> None:
+        """Drop the tile changes waiting for delivery."""
+        self.pending = {}
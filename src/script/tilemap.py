@@ -1,11 +1,21 @@
 import pygame
 import json
+import os
 
 from src.script.log import *
 from src.script.loader import loadJson, getBit, NAME_SPACE, STGS
+from src.script.chunk import Chunk, CHUNK_SIZE, blockId, chunkPosOf, localIndexOf
+from src.script.region import RegionFile
+from src.script.editJournal import EditJournal
+from src.script.chunkSurfaceCache import ChunkSurfaceCache
+from src.script.spawnerIndex import SpawnerIndex
+from src.script.tileEvents import TileEvents
+from src.script.solidity import SolidityMap
+from src.script.profiler import PROFILER
 
 NEIGHBOR_OFFSETS: list[tuple[int]] = [(i, j) for j in range(-2, 3) for i in range(-2, 3)]
 PHYSICS_TILES: set[str] = set(NAME_SPACE["physicsTiles"])
+PHYSICS_IDS: set[int] = {blockId(block) for block in PHYSICS_TILES}
 
 class Tilemap:
     """
@@ -13,8 +23,18 @@ class Tilemap:
 
     Attributes:
         assets (dict[str, dict[int, pygame.Surface]]): A dictionary mapping block names to dictionaries containing variant numbers and corresponding pygame.Surface objects.
-        tileSize (int): The size of each tile in pixels.
-        tilemap (dict[tuple[int], dict[str, str | int]]): A dictionary representing the tilemap, where keys are tuple coordinates and values are dictionaries containing block and variant information.
+        mapName (str): The alias of the loaded map.
+        chunks (dict[tuple[int], Chunk]): The chunks in memory, keyed by chunk coordinates.
+        region (RegionFile | None): The map file chunks are read from on first access, None for maps loaded from JSON.
+        dirtyChunks (set[tuple[int]]): Positions of chunks changed since the last save.
+        streamer (ChunkStreamer | None): The streamer keeping the chunks around the camera in memory, if any.
+        saver (MapSaver | None): The saver writing the changed chunks in the background, if any.
+        journal (EditJournal | None): The log of the edits made since the last save, None for maps loaded from JSON.
+        surfaceCache (ChunkSurfaceCache): The baked surfaces of recently rendered chunks.
+        spawners (SpawnerIndex): The particle spawning tiles of the chunks in memory.
+        solidity (SolidityMap): Bitmaps of the solid tiles of the chunks in memory, used for collisions.
+        events (TileEvents): Tells the derived structures, like the surface cache and the spawner index, what changed.
+        version (int): Incremented on every edit, so renderers can tell when the map changed.
     """
     def __init__(self, assets: dict[str, dict[int, pygame.Surface]], mapName: str = "") -> None:
         """
@@ -22,13 +42,29 @@ class Tilemap:
 
         Args:
             assets (dict[str, dict[int, pygame.Surface]]): A dictionary mapping block names to dictionaries containing variant numbers and corresponding pygame.Surface objects.
-            tileSize (int, optional): The size of each tile in pixels. Defaults to 32.
+            mapName (str, optional): The alias of the map to load. Defaults to "".
         """
         self.assets: dict[str, dict[int, pygame.Surface]] = assets
         self.mapName: str = mapName
-        self.tilemap: dict[tuple[int], dict[str, str | int]] = {}
-
-        self.loadMap(alias = self.mapName)
+        self.chunks: dict[tuple[int], Chunk] = {}
+        self.region: RegionFile | None = None
+        self.dirtyChunks: set[tuple[int]] = set()
+        self.streamer: "ChunkStreamer | None" = None
+        self.saver: "MapSaver | None" = None
+        self.journal: EditJournal | None = None
+        self.surfaceCache: ChunkSurfaceCache = ChunkSurfaceCache(assets)
+        self.spawners: SpawnerIndex = SpawnerIndex(NAME_SPACE["idPairParticleSpawners"], NAME_SPACE["anyVariantParticleSpawners"])
+        self.solidity: SolidityMap = SolidityMap(PHYSICS_IDS)
+        self.version: int = 0
+
+        self.events: TileEvents = TileEvents()
+        self.events.subscribe(onTiles = self.surfaceCache.onTileChanges)
+        self.events.subscribe(onTiles = self.spawners.onTileChanges, onChunkLoad = self.spawners.addChunk, onChunkUnload = self.spawners.removeChunk)
+        # Collisions must see a broken tile in the same tick
+        self.events.subscribe(onTiles = self.solidity.onTileChanges, onChunkLoad = self.solidity.addChunk, onChunkUnload = self.solidity.removeChunk, immediate = True)
+
+        if self.mapName:
+            self.loadMap(alias = self.mapName)
 
     def extractAnyVariant(self, block: str, keep: bool = False) -> list[list[int] | dict[str, str | int]]:
         """
@@ -41,16 +77,14 @@ class Tilemap:
         Returns:
             list[list[int] | dict[str, str | int]]: A list of matched tiles, where each tile is represented as a list containing position coordinates and tile information.
         """
+        id: int = blockId(block)
         matches: list[list[int] | dict[str, str | int]] = []
-        for location in self.tilemap:
-            tile: dict[str, str | int] = self.tilemap[location]
-            if tile["block"] == block:
-                matches.append([list(location), tile.copy()])
-                matches[-1][0] = matches[-1][0]
-                matches[-1][0][0] *= STGS["tileSize"]
-                matches[-1][0][1] *= STGS["tileSize"]
-                if not keep:
-                    del self.tilemap[location]
+        for chunk in self.loadAllChunks():
+            for location, index in chunk.tiles():
+                if chunk.blocks[index] == id:
+                    matches.append([[location[0] * STGS["tileSize"], location[1] * STGS["tileSize"]], chunk.getTile(index)])
+                    if not keep:
+                        self.deleteTile(location)
         
         return matches
 
@@ -65,16 +99,14 @@ class Tilemap:
         Returns:
             list[list[int] | dict[str, str | int]]: A list of matched tiles, where each tile is represented as a list containing position coordinates and tile information.
         """
+        idPairs: set[tuple[int]] = {(blockId(pair[0]), pair[1]) for pair in id_pairs}
         matches: list[list[int] | dict[str, str | int]] = []
-        for loc in self.tilemap:
-            tile: dict[str, str | int] = self.tilemap[loc]
-            if (tile['block'], tile['variant']) in id_pairs:
-                matches.append([list(loc), tile.copy()])
-                matches[-1][0] = matches[-1][0]
-                matches[-1][0][0] *= STGS["tileSize"]
-                matches[-1][0][1] *= STGS["tileSize"]
-                if not keep:
-                    del self.tilemap[loc]
+        for chunk in self.loadAllChunks():
+            for loc, index in chunk.tiles():
+                if (chunk.blocks[index], chunk.variants[index]) in idPairs:
+                    matches.append([[loc[0] * STGS["tileSize"], loc[1] * STGS["tileSize"]], chunk.getTile(index)])
+                    if not keep:
+                        self.deleteTile(loc)
         
         return matches
 
@@ -86,7 +118,78 @@ class Tilemap:
             pos (tuple[int]): The position to insert the tile.
             tile (dict[str, str | int]): The tile information containing block and variant.
         """
-        self.tilemap[pos] = tile
+        self.setTile(pos, tile)
+
+    def getChunk(self, chunkPos: tuple[int], create: bool = False) -> Chunk | None:
+        """
+        Get the chunk at the specified chunk position.
+
+        Args:
+            chunkPos (tuple[int]): The position of the chunk in chunk coordinates.
+            create (bool, optional): Flag indicating whether to create the chunk if it does not exist. Defaults to False.
+
+        Returns:
+            Chunk | None: The chunk, or None if it does not exist and was not created.
+        """
+        chunk: Chunk | None = self.chunks.get(chunkPos)
+        if chunk is None:
+            # A chunk waiting to be saved is newer than the map file
+            if self.saver is not None:
+                chunk = self.saver.pendingChunk(chunkPos)
+            if chunk is None and self.streamer is not None:
+                chunk = self.streamer.fetch(chunkPos)
+            elif chunk is None and self.region is not None:
+                chunk = self.region.readChunk(chunkPos)
+
+            if chunk is None and create:
+                chunk = Chunk(chunkPos)
+            if chunk is not None:
+                self.addChunk(chunk)
+        return chunk
+
+    def addChunk(self, chunk: Chunk) -> None:
+        """
+        Bring a chunk into memory.
+
+        Args:
+            chunk (Chunk): The chunk to add.
+        """
+        self.chunks[chunk.pos] = chunk
+        self.events.chunkLoaded(chunk)
+
+    def removeChunk(self, chunkPos: tuple[int]) -> Chunk:
+        """
+        Drop a chunk from memory, it is not saved here.
+
+        Args:
+            chunkPos (tuple[int]): The position of the chunk in chunk coordinates.
+
+        Returns:
+            Chunk: The removed chunk.
+        """
+        chunk: Chunk = self.chunks.pop(chunkPos)
+        self.events.chunkUnloaded(chunkPos)
+        return chunk
+
+    def flushEvents(self) -> None:
+        """Deliver the tile changes made since the last flush to the derived structures."""
+        self.events.flush()
+
+    def loadAllChunks(self) -> list[Chunk]:
+        """
+        Load every chunk of the map file into memory.
+
+        Returns:
+            list[Chunk]: All the chunks of the tilemap.
+        """
+        if self.region is not None:
+            for chunkPos in list(self.region.index):
+                self.getChunk(chunkPos)
+        return list(self.chunks.values())
+
+    def tileCount(self) -> int:
+        """Return the number of tiles in the tilemap."""
+        return sum(chunk.count for chunk in self.loadAllChunks())
 
     def isTileAt(self, pos: tuple[int]) -> bool:
         """
@@ -98,7 +201,8 @@ class Tilemap:
         Returns:
             bool: True if there is a tile at the position, False otherwise.
         """
-        return (pos in self.tilemap)
+        chunk: Chunk | None = self.getChunk(chunkPosOf(pos))
+        return chunk is not None and chunk.blocks[localIndexOf(pos)] != 0
     
     def deleteTile(self, pos: tuple[int]) -> None:
         """
@@ -107,9 +211,73 @@ class Tilemap:
         Args:
             pos (tuple[int]): The position of the tile to delete.
         """
-        del self.tilemap[pos]
+        if not self.isTileAt(pos):
+            raise KeyError(pos)
+        # Empty chunks are kept, so the next save can drop them from the map file
+        chunk: Chunk = self.chunks[chunkPosOf(pos)]
+        old: dict[str, str | int] = chunk.getTile(localIndexOf(pos))
+        chunk.clearTile(localIndexOf(pos))
+        self.dirtyChunks.add(chunkPosOf(pos))
+        if self.journal is not None:
+            self.journal.record(pos, None)
+        self.events.tileChanged(pos, old, None)
+        self.version += 1
 
     def loadMap(self, alias: str = "map1") -> None:
+        """
+        Load a tilemap from its map file.
+
+        Only the header and the chunk index are read here, chunks are read on first access.
+        Edits left in the journal by a run that did not save are applied again.
+        Maps that have not been converted yet are loaded from their JSON file.
+
+        Args:
+            alias (str, optional): The alias of the tilemap to load. Defaults to "map1".
+        """
+        if self.saver is not None:
+            self.saver.commitJournal()
+            self.saver.flush()
+        if self.journal is not None:
+            self.journal.commit()
+            self.journal.close()
+        self.journal = None
+        if self.region is not None:
+            self.region.close()
+        self.region = None
+        self.chunks = {}
+        self.dirtyChunks = set()
+        self.events.discard()
+        self.surfaceCache.clear()
+        self.spawners.clear()
+        self.solidity.clear()
+
+        if not os.path.exists(f"src/map/{alias}/tilemap.bin"):
+            self.loadJson(alias)
+            return
+
+        try:
+            self.region = RegionFile(f"src/map/{alias}/tilemap.bin")
+
+            logSuccess(f"\'{alias}\' found and loaded as tilemap")
+            logMSG(f"\'{alias}\' currently has {len(self.region.index)} chunks")
+
+        except Exception as e:
+            logError(f"Failed to read \'{alias}/tilemap.bin\': {e}")
+            return
+
+        # The replayed edits are already in the journal, they only have to become dirty
+        journal: EditJournal = EditJournal(f"src/map/{alias}")
+        edits: list[tuple[tuple[int], dict[str, str | int] | None]] = journal.replay()
+        for pos, tile in edits:
+            if tile is not None:
+                self.setTile(pos, tile)
+            elif self.isTileAt(pos):
+                self.deleteTile(pos)
+        self.journal = journal
+        if edits:
+            logMSG(f"Replayed {len(edits)} unsaved edits of \'{alias}\'")
+
+    def loadJson(self, alias: str = "map1") -> None:
         """
         Load a tilemap from a JSON file.
 
@@ -120,16 +288,13 @@ class Tilemap:
             with open(f"src/map/{alias}/tilemap.json", mode = "r") as file:
                 strKeysTilemap: dict[str, dict[str, str | int]] = json.load(file)
         
-            tupleKeysTilemap: dict[tuple[int], dict[str, str | int]] = {}
             for strKey, value in strKeysTilemap.items():
                 keyParts: list[str] = strKey.split(";")
                 key: tuple[int] = (int(keyParts[0]), int(keyParts[1]))
-                tupleKeysTilemap[key] = value
-
-            self.tilemap = tupleKeysTilemap
+                self.setTile(key, value)
 
             logSuccess(f"\'{alias}\' found and loaded as tilemap")
-            logMSG(f"\'{alias}\' currently has {len(self.tilemap)} tiles")
+            logMSG(f"\'{alias}\' currently has {self.tileCount()} tiles in {len(self.chunks)} chunks")
         
         except FileNotFoundError as e:
             logError(f"File \'{alias}/tilemap.json\' not found.")
@@ -139,19 +304,59 @@ class Tilemap:
 
     def saveMap(self, alias: str = "map1") -> None:
         """
-        Save the current tilemap to a JSON file.
+        Save the current tilemap to its map file.
+
+        Saving to the loaded map only writes the chunks changed since the last save,
+        through the saver if there is one, waiting until they are written.
+
+        Args:
+            alias (str, optional): The alias of the tilemap to save. Defaults to "map1".
+        """
+        if self.region is not None and alias == self.mapName and self.saver is not None:
+            written: int = self.saver.save()
+            self.saver.flush()
+        elif self.region is not None and alias == self.mapName:
+            chunks: list[Chunk] = [self.chunks[chunkPos] for chunkPos in self.dirtyChunks]
+            self.region.writeChunks(chunks)
+            self.dirtyChunks = set()
+            if self.journal is not None:
+                self.journal.clear()
+            written: int = len(chunks)
+        else:
+            # Chunks waiting to be saved may be missing from the index of the map file
+            if self.saver is not None:
+                self.saver.flush()
+            chunks: list[Chunk] = self.loadAllChunks()
+            os.makedirs(f"src/map/{alias}", exist_ok = True)
+            RegionFile.write(f"src/map/{alias}/tilemap.bin", chunks)
+            if alias == self.mapName:
+                self.region = RegionFile(f"src/map/{alias}/tilemap.bin")
+                self.dirtyChunks = set()
+                if self.journal is None:
+                    self.journal = EditJournal(f"src/map/{alias}")
+                self.journal.clear()
+            written: int = len(chunks)
+
+        logSuccess(f"Tilemap saved to \'{alias}/tilemap.bin\' ({written} chunks written)")
+
+    def exportJson(self, alias: str = "map1") -> None:
+        """
+        Save the current tilemap to a JSON file, for debugging.
 
         Args:
             alias (str, optional): The alias of the tilemap to save. Defaults to "map1".
         """
-        strKeysTilemap: dict[str, dict[str, str | int]] = {f"{key[0]};{key[1]}": value for key, value in self.tilemap.items()}
+        strKeysTilemap: dict[str, dict[str, str | int]] = {}
+        for chunk in self.loadAllChunks():
+            for key, index in chunk.tiles():
+                strKeysTilemap[f"{key[0]};{key[1]}"] = chunk.getTile(index)
 
         with open(f"src/map/{alias}/tilemap.json", mode = "w") as file:
             json.dump(strKeysTilemap, file, indent = 4)
 
-        logSuccess(f"Tilemap saved to \'{alias}/tilemap.json\'")
+        logSuccess(f"Tilemap exported to \'{alias}/tilemap.json\'")
     
-    def tilesAround(self, pos: tuple[int]) -> list[dict[tuple[int], dict[str, str | int]]]:
+    def tilesAround(self, pos: tuple[int]) -> list[tuple[tuple[int], dict[str, str | int]]]:
         """
         Get tiles around the specified position.
 
@@ -159,17 +364,13 @@ class Tilemap:
             pos (tuple[int]): The position to check.
 
         Returns:
-            list[dict[tuple[int], dict[str, str | int]]]: A list of tiles around the specified position.
+            list[tuple[tuple[int], dict[str, str | int]]]: A list of (tile position, tile) pairs around the specified position.
         """
-        tiles: list[dict[tuple[int], dict[str, str | int]]] = []
         tileLocation: tuple[int] = (int(pos[0] // STGS["tileSize"]), int(pos[1] // STGS["tileSize"]))
-        for offset in NEIGHBOR_OFFSETS:
-            checkLocation: tuple[int] = (tileLocation[0] + offset[0], tileLocation[1] + offset[1])
-            if checkLocation in self.tilemap:
-                tiles.append((checkLocation, self.tilemap[checkLocation]))
-        return tiles
-    
-    def physicsRectsAround(self, pos: tuple[int]) -> list[dict[tuple[int], dict[str, str | int]]]:
+        checkLocations: list[tuple[int]] = [(tileLocation[0] + offset[0], tileLocation[1] + offset[1]) for offset in NEIGHBOR_OFFSETS]
+        return [(checkLocation, self.getTileAt(checkLocation)) for checkLocation in checkLocations if self.isTileAt(checkLocation)]
+
+    def physicsRectsAround(self, pos: tuple[int]) -> list[pygame.Rect]:
         """
         Get physics rectangles around the specified position.
 
@@ -177,42 +378,120 @@ class Tilemap:
             pos (tuple[int]): The position to check.
 
         Returns:
-            list[dict[tuple[int], dict[str, str | int]]]: A list of physics rectangles around the specified position.
+            list[pygame.Rect]: A list of physics rectangles around the specified position.
         """
-        rects: list[pygame.Rect] = []
-        for tile in self.tilesAround(pos):
-            if tile[1]["block"] in PHYSICS_TILES:
-                rects.append(pygame.Rect(tile[0][0] * STGS["tileSize"], tile[0][1] * STGS["tileSize"], STGS["tileSize"], STGS["tileSize"]))
+        tileLocation: tuple[int] = (int(pos[0] // STGS["tileSize"]), int(pos[1] // STGS["tileSize"]))
+        return self.solidTileRects(tileLocation[0] - 2, tileLocation[1] - 2, tileLocation[0] + 2, tileLocation[1] + 2)
+
+    def solidRectsIn(self, rect: pygame.Rect) -> list[pygame.Rect]:
+        """
+        Get the rects of the solid tiles a rect overlaps.
+
+        Args:
+            rect (pygame.Rect): The rect to check, usually the hitbox of something moving.
+
+        Returns:
+            list[pygame.Rect]: The rects of the overlapped solid tiles, row by row.
+        """
+        return self.solidTileRects(
+            rect.left // STGS["tileSize"], rect.top // STGS["tileSize"],
+            (rect.right - 1) // STGS["tileSize"], (rect.bottom - 1) // STGS["tileSize"])
+
+    def solidTileRects(self, left: int, top: int, right: int, bottom: int) -> list[pygame.Rect]:
+        """
+        Get the rects of the solid tiles inside an area of tiles.
+
+        Args:
+            left (int): The leftmost tile column of the area.
+            top (int): The topmost tile row of the area.
+            right (int): The rightmost tile column of the area.
+            bottom (int): The bottommost tile row of the area.
+
+        Returns:
+            list[pygame.Rect]: The rects of the solid tiles, row by row.
+        """
+        tileSize: int = STGS["tileSize"]
+        rects: list[pygame.Rect] = [
+            pygame.Rect(x * tileSize, y * tileSize, tileSize, tileSize) for x, y in self.solidCells(left, top, right, bottom)
+        ]
+        if PROFILER.enabled:
+            PROFILER.count("physicsRects", len(rects))
         return rects
 
+    def solidCells(self, left: int, top: int, right: int, bottom: int) -> list[tuple[int]]:
+        """
+        Get the positions of the solid tiles inside an area of tiles, loading its chunks if needed.
+
+        Args:
+            left (int): The leftmost tile column of the area.
+            top (int): The topmost tile row of the area.
+            right (int): The rightmost tile column of the area.
+            bottom (int): The bottommost tile row of the area.
+
+        Returns:
+            list[tuple[int]]: The positions of the solid tiles, row by row.
+        """
+        # Bitmaps are only kept for chunks in memory
+        for chunkX in range(left // CHUNK_SIZE, right // CHUNK_SIZE + 1):
+            for chunkY in range(top // CHUNK_SIZE, bottom // CHUNK_SIZE + 1):
+                if (chunkX, chunkY) not in self.chunks:
+                    self.getChunk((chunkX, chunkY))
+
+        if PROFILER.enabled:
+            PROFILER.count("solidityQueries")
+        return self.solidity.solidCells(left, top, right, bottom)
+
+    def visibleTiles(self, surface: pygame.Surface, offset: tuple[float] = (0, 0)) -> list[tuple[tuple[int], Chunk, int]]:
+        """
+        Get the tiles visible on the given surface with an optional offset.
+
+        Args:
+            surface (pygame.Surface): The surface representing the window.
+            offset (tuple[float], optional): The offset position. Defaults to (0, 0).
+
+        Returns:
+            list[tuple[tuple[int], Chunk, int]]: A list of (tile position, chunk, local index) triplets.
+        """
+        left: int = int(offset[0] // STGS["tileSize"] - 1)
+        top: int = int(offset[1] // STGS["tileSize"] - 1)
+        right: int = int((offset[0] + surface.get_width()) // STGS["tileSize"] + 1)
+        bottom: int = int((offset[1] + surface.get_height()) // STGS["tileSize"] + 1)
+
+        tiles: list[tuple[tuple[int], Chunk, int]] = []
+        for chunkX in range(left // CHUNK_SIZE, (right - 1) // CHUNK_SIZE + 1):
+            for chunkY in range(top // CHUNK_SIZE, (bottom - 1) // CHUNK_SIZE + 1):
+                chunk: Chunk | None = self.getChunk((chunkX, chunkY))
+                if chunk is None:
+                    continue
+                blocks = chunk.blocks
+                for x in range(max(left, chunkX * CHUNK_SIZE), min(right, (chunkX + 1) * CHUNK_SIZE)):
+                    for y in range(max(top, chunkY * CHUNK_SIZE), min(bottom, (chunkY + 1) * CHUNK_SIZE)):
+                        index: int = (y - chunkY * CHUNK_SIZE) * CHUNK_SIZE + (x - chunkX * CHUNK_SIZE)
+                        if blocks[index]:
+                            tiles.append(((x, y), chunk, index))
+        return tiles
+
     def render(self, surface: pygame.Surface, offset: tuple[float] = (0, 0)) -> None:
         """
         Render the tilemap on the given surface with an optional offset.
 
+        Every visible chunk is drawn from its cached surface, all of them with a single blits call.
+
         Args:
             surface (pygame.Surface): The surface to render the tilemap on.
             offset (tuple[float], optional): The offset to apply to the tilemap's position. Defaults to (0, 0).
         """
-        for x in range(offset[0] // STGS["tileSize"] - 1, (offset[0] + surface.get_width()) // STGS["tileSize"] + 1):
-            for y in range(offset[1] // STGS["tileSize"] - 1, (offset[1] + surface.get_height()) // STGS["tileSize"] + 1):
-                location: tuple[int] = (x, y)
-                if location in self.tilemap:
-                    tile: dict[str, str | int] = self.tilemap[location]
-                    mappedLocation: tuple[int] = (location[0] * STGS["tileSize"] - offset[0], location[1] * STGS["tileSize"] - offset[1])
-
-                    surface.blit(self.assets["tile"][tile["block"]][tile["variant"]], mappedLocation)
-
-                    if "durability" in tile:
-                        if tile["block"] in NAME_SPACE["durabilityOfTile"]:
-                            surface.blit(
-                                self.assets["tileBreakage"][int((len(self.assets["tileBreakage"]) - 1) * (1 - (tile["durability"] / NAME_SPACE["durabilityOfTile"][tile["block"]])))],
-                                mappedLocation
-                            )
-                        else:
-                            surface.blit(
-                                self.assets["tileBreakage"][int((len(self.assets["tileBreakage"]) - 1) * (1 - (tile["durability"] / NAME_SPACE["durabilityOfTile"]["_"])))],
-                                mappedLocation
-                            )
+        self.flushEvents()
+        chunkPixels: int = CHUNK_SIZE * STGS["tileSize"]
+        sequence: list[tuple[pygame.Surface, tuple[float]]] = []
+        for chunkX in range(int(offset[0] // chunkPixels), int((offset[0] + surface.get_width()) // chunkPixels) + 1):
+            for chunkY in range(int(offset[1] // chunkPixels), int((offset[1] + surface.get_height()) // chunkPixels) + 1):
+                chunk: Chunk | None = self.getChunk((chunkX, chunkY))
+                if chunk is not None and chunk.count:
+                    sequence.append((self.surfaceCache.get(chunk), (chunkX * chunkPixels - offset[0], chunkY * chunkPixels - offset[1])))
+        surface.blits(sequence, doreturn = False)
+        if PROFILER.enabled:
+            PROFILER.count("chunkBlits", len(sequence))
 
     def renderSeek(self, surface: pygame.Surface, offset: tuple[float] = (0, 0)) -> None:
         """
@@ -222,12 +501,9 @@ class Tilemap:
             surface (pygame.Surface): The surface to render the tilemap on.
             offset (tuple[float], optional): The offset to apply to the tilemap's position. Defaults to (0, 0).
         """
-        for x in range(offset[0] // STGS["tileSize"] - 1, (offset[0] + surface.get_width()) // STGS["tileSize"] + 1):
-            for y in range(offset[1] // STGS["tileSize"] - 1, (offset[1] + surface.get_height()) // STGS["tileSize"] + 1):
-                location: tuple[int] = (x, y)
-                if location in self.tilemap:
-                    tile: dict[str, str | int] = self.tilemap[location]
-                    surface.blit(self.assets["tile"][getBit(tile["block"])], (location[0] * STGS["tileSize"] - offset[0], location[1] * STGS["tileSize"] - offset[1]))
+        for location, chunk, index in self.visibleTiles(surface, offset):
+            tile: dict[str, str | int] = chunk.getTile(index)
+            surface.blit(self.assets["tile"][getBit(tile["block"])], (location[0] * STGS["tileSize"] - offset[0], location[1] * STGS["tileSize"] - offset[1]))
 
     def getRectsOnWindow(self, surface: pygame.Surface, offset: tuple[float] = (0, 0)) -> dict[tuple[int], dict[str, str | int]]:
         """
@@ -241,15 +517,35 @@ class Tilemap:
             list[pygame.Rect]: A list of pygame.Rect objects representing the tiles visible on the window.
         """
         rects: list[pygame.Rect] = []
-        for x in range(offset[0] // STGS["tileSize"] - 1, (offset[0] + surface.get_width()) // STGS["tileSize"] + 1):
-            for y in range(offset[1] // STGS["tileSize"] - 1, (offset[1] + surface.get_height()) // STGS["tileSize"] + 1):
-                location: tuple[int] = (x, y)
-                if location in self.tilemap:
-                    rects.append(pygame.Rect(
-                        x * STGS["tileSize"], y * STGS["tileSize"], STGS["tileSize"], STGS["tileSize"]
-                    ))
+        for location, chunk, index in self.visibleTiles(surface, offset):
+            rects.append(pygame.Rect(
+                location[0] * STGS["tileSize"], location[1] * STGS["tileSize"], STGS["tileSize"], STGS["tileSize"]
+            ))
         return rects
     
+    def visibleSpawners(self, surface: pygame.Surface, offset: tuple[float] = (0, 0)) -> list[tuple[str, tuple[int]]]:
+        """
+        Get the particle spawning tiles visible on the given surface with an optional offset.
+
+        Args:
+            surface (pygame.Surface): The surface representing the window.
+            offset (tuple[float], optional): The offset position. Defaults to (0, 0).
+
+        Returns:
+            list[tuple[str, tuple[int]]]: (particle species, tile position) pairs.
+        """
+        left: int = int(offset[0] // STGS["tileSize"] - 1)
+        top: int = int(offset[1] // STGS["tileSize"] - 1)
+        right: int = int((offset[0] + surface.get_width()) // STGS["tileSize"])
+        bottom: int = int((offset[1] + surface.get_height()) // STGS["tileSize"])
+
+        # Spawners are only indexed for chunks in memory
+        self.flushEvents()
+        for chunkX in range(left // CHUNK_SIZE, right // CHUNK_SIZE + 1):
+            for chunkY in range(top // CHUNK_SIZE, bottom // CHUNK_SIZE + 1):
+                self.getChunk((chunkX, chunkY))
+        return self.spawners.inArea(left, top, right, bottom)
+
     def getTileAt(self, pos: tuple[int]) -> dict[str, str | int]:
         """
         Get the tile at the specified position.
@@ -258,11 +554,14 @@ class Tilemap:
             pos (tuple[int]): The position to check.
 
         Returns:
-            dict[str, str | int]: The tile at the specified position. If there is no tile at that position, raises ValueError
+            dict[str, str | int]: A copy of the tile at the specified position. If there is no tile at that position, raises ValueError
         """
-        if pos in self.tilemap:
-            return self.tilemap[pos]
-        raise ValueError(f"No tile at {pos} in \'{self.alias}\'")
+        chunk: Chunk | None = self.getChunk(chunkPosOf(pos))
+        if chunk is not None:
+            tile: dict[str, str | int] | None = chunk.getTile(localIndexOf(pos))
+            if tile is not None:
+                return tile
+        raise ValueError(f"No tile at {pos} in \'{self.mapName}\'")
 
     def setTile(self, pos: tuple[int], tile: dict[str, str | int]) -> dict[str, str | int]:
         """
@@ -275,7 +574,27 @@ class Tilemap:
         Returns:
             None
         """
-        self.tilemap[pos] = tile
+        chunk: Chunk = self.getChunk(chunkPosOf(pos), create = True)
+        old: dict[str, str | int] | None = chunk.getTile(localIndexOf(pos))
+        chunk.setTile(localIndexOf(pos), tile)
+        self.dirtyChunks.add(chunkPosOf(pos))
+        new: dict[str, str | int] = chunk.getTile(localIndexOf(pos))
+        if self.journal is not None:
+            self.journal.record(pos, new)
+        self.events.tileChanged(pos, old, new)
+        self.version += 1
+
+    def setDurability(self, pos: tuple[int], durability: int) -> None:
+        """
+        Set the durability of the tile at the specified position.
+
+        Args:
+            pos (tuple[int]): The position of the tile.
+            durability (int): The new durability of the tile.
+        """
+        tile: dict[str, str | int] = self.getTileAt(pos)
+        tile["durability"] = durability
+        self.setTile(pos, tile)
     
     def breakTile(self, pos: tuple[int]) -> None:
         """